@@ -3,7 +3,7 @@
 # Metadata is inherited from Nautobot. If not including Nautobot in the environment, this should be added
 from importlib import metadata
 
-from django.db.models.signals import post_migrate
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from nautobot.apps import NautobotAppConfig
 
 __version__ = metadata.version(__name__)
@@ -24,10 +24,23 @@ class NautobotBGPModelsConfig(NautobotAppConfig):
             "AutonomousSystem": ["Active", "Available", "Planned"],
             "BGPRoutingInstance": ["Planned", "Active", "Decommissioned"],
             "Peering": ["Active", "Decommissioned", "Deprovisioning", "Offline", "Planned", "Provisioning"],
-        }
+        },
+        "instrumentation": False,
+        "server_timing_header": False,
+        "metrics_cache_ttl": 60,
+        "reporting_database": "default",
+        "api_cache_ttl": 0,
     }
+    middleware = ["nautobot_bgp_models.instrumentation.BGPInstrumentationMiddleware"]
     docs_view_name = "plugins:nautobot_bgp_models:docs"
-    searchable_models = ["autonomoussystem"]
+    searchable_models = [
+        "autonomoussystem",
+        "autonomoussystemrange",
+        "bgproutinginstance",
+        "peergrouptemplate",
+        "peergroup",
+        "peerendpoint",
+    ]
 
     def ready(self):
         """Callback invoked after the app is loaded."""
@@ -38,10 +51,13 @@ class NautobotBGPModelsConfig(NautobotAppConfig):
         from . import dolt_compat  # noqa pylint: disable=import-outside-toplevel, unused-import
 
         from .signals import (  # pylint: disable=import-outside-toplevel
+            invalidate_cached_api_responses,
             post_migrate_create_statuses,
         )
 
         post_migrate.connect(post_migrate_create_statuses, sender=self)
+        for signal in (post_save, post_delete, m2m_changed):
+            signal.connect(invalidate_cached_api_responses, dispatch_uid="nautobot_bgp_models_api_cache")
 
 
 config = NautobotBGPModelsConfig  # pylint:disable=invalid-name
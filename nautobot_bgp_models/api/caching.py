@@ -0,0 +1,74 @@
+"""Read-through cache of the REST API responses of the read-mostly BGP models.
+
+The list and detail responses are stored in the Nautobot cache, Redis by default, for `api_cache_ttl` seconds. The
+cache keys include the user, the full URL with its query parameters and the requested API version, and a version
+token of the model. The token is replaced whenever a record of the model, or of a model rendered in its responses
+such as the Device of the routing instance of an AddressFamily, is saved, deleted or has its many-to-many relations
+changed, so that all the cached responses of the model are discarded at once. The token is replaced once the
+transaction of the change commits, so that the responses cached meanwhile by concurrent requests, rendering the
+previous rows, are discarded too.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from nautobot.circuits.models import Provider
+from nautobot.dcim.models import Device
+from nautobot.extras.models import Role, Secret, Status, Tag
+from nautobot.ipam.models import VRF
+from nautobot.tenancy.models import Tenant
+
+from nautobot_bgp_models import models
+
+CACHE_KEY_PREFIX = "nautobot_bgp_models:api"
+
+# Model whose responses are cached: other models rendered in these responses, by their fields or display names.
+CACHED_MODELS = {
+    models.AutonomousSystem: [models.AutonomousSystemRange, Provider, Status, Tag],
+    models.AutonomousSystemRange: [Tenant, Tag],
+    models.PeerGroupTemplate: [models.AutonomousSystem, Role, Secret, Tag],
+    models.AddressFamily: [models.BGPRoutingInstance, Device, models.AutonomousSystem, VRF],
+}
+
+# Models whose changes invalidate cached responses.
+WATCHED_MODELS = {
+    *CACHED_MODELS,
+    *(dependency for dependencies in CACHED_MODELS.values() for dependency in dependencies),
+}
+
+
+def get_cache_ttl():
+    """Lifetime of the cached responses in seconds, 0 when the cache is disabled."""
+    return settings.PLUGINS_CONFIG.get("nautobot_bgp_models", {}).get("api_cache_ttl", 0)
+
+
+def _version_key(model):
+    return f"{CACHE_KEY_PREFIX}:version:{model._meta.label_lower}"
+
+
+def get_version(model):
+    """Current version token of the cached responses of `model`."""
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(*changed_models):
+    """Discard the cached responses rendering records of any of the `changed_models`, or all of them if none given."""
+    for model, dependencies in CACHED_MODELS.items():
+        if not changed_models or model in changed_models or any(dep in changed_models for dep in dependencies):
+            cache.set(_version_key(model), uuid.uuid4().hex, timeout=None)
+
+
+def get_response_key(request, model):
+    """Cache key of the response to `request`, listing or retrieving `model` records."""
+    accept = request.META.get("HTTP_ACCEPT", "")
+    # The superuser flag grants every permission without any ObjectPermission or group, and can change meanwhile
+    user = f"{request.user.pk}|{request.user.is_superuser}"
+    request_hash = hashlib.sha256(f"{user}|{accept}|{request.build_absolute_uri()}".encode()).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{model._meta.label_lower}:{get_version(model)}:{request_hash}"
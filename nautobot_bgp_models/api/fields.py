@@ -0,0 +1,75 @@
+"""REST API serializer fields for nautobot_bgp_models."""
+
+import uuid
+
+from django.urls import NoReverseMatch
+from nautobot.core.api.fields import NautobotHyperlinkedRelatedField
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+# Primary key substituted in the URL templates, valid for the `<uuid:pk>` path converter.
+TEMPLATE_PK = str(uuid.UUID(int=0))
+
+
+def get_url_template(context, key, reverse_template):
+    """Prefix and suffix surrounding the primary key in the URLs identified by `key`, cached in the `context`.
+
+    Args:
+        context (dict): context of the serializer, shared by all the fields of a response.
+        key (tuple): identifier of the URL pattern, such as the view name.
+        reverse_template (Callable): returns the URL of the `TEMPLATE_PK` object, or raises NoReverseMatch.
+
+    Returns:
+        (tuple[str, str]|None): the prefix and suffix, None if the URLs can't be built from a template.
+    """
+    templates = context.setdefault("url_templates", {})
+    if key not in templates:
+        try:
+            url = reverse_template()
+        except NoReverseMatch:
+            url = ""
+        templates[key] = tuple(url.split(TEMPLATE_PK)) if url.count(TEMPLATE_PK) == 1 else None
+    return templates[key]
+
+
+def get_templated_url(context, view_name, pk):
+    """URL of the object `pk` for the `view_name` detail view, from the template of the view cached in the `context`."""
+    request = context.get("request")
+    template = get_url_template(
+        context, (view_name, "pk", None), lambda: reverse(view_name, kwargs={"pk": TEMPLATE_PK}, request=request)
+    )
+    if template is None:
+        return reverse(view_name, kwargs={"pk": pk}, request=request)
+    return f"{template[0]}{pk}{template[1]}"
+
+
+class TemplatedURLFieldMixin:
+    """Build the hyperlinks of the objects from a URL template, reversed once per view name in each response.
+
+    Reversing a URL resolves the URL namespaces and patterns, while a template only needs a string concatenation.
+    Lookups on other fields than the primary key fall back to reversing the URL of every object.
+    """
+
+    def get_url(self, obj, view_name, request, format):  # pylint: disable=redefined-builtin
+        """Return the URL of `obj`, from the template of `view_name`."""
+        if self.lookup_field != "pk" or obj.pk in (None, ""):
+            return super().get_url(obj, view_name, request, format)
+
+        template = get_url_template(
+            self.context,
+            (view_name, self.lookup_url_kwarg, format),
+            lambda: self.reverse(
+                view_name, kwargs={self.lookup_url_kwarg: TEMPLATE_PK}, request=request, format=format
+            ),
+        )
+        if template is None:
+            return super().get_url(obj, view_name, request, format)
+        return f"{template[0]}{obj.pk}{template[1]}"
+
+
+class TemplatedHyperlinkedIdentityField(TemplatedURLFieldMixin, serializers.HyperlinkedIdentityField):
+    """HyperlinkedIdentityField building the `url` of the objects from a template."""
+
+
+class TemplatedHyperlinkedRelatedField(TemplatedURLFieldMixin, NautobotHyperlinkedRelatedField):
+    """NautobotHyperlinkedRelatedField building the `url` of the related objects from a template."""
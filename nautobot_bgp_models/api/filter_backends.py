@@ -3,9 +3,26 @@
 from nautobot.core.api.filter_backends import NautobotFilterBackend
 
 
-class IncludeInheritedFilterBackend(NautobotFilterBackend):
+class BGPFilterBackend(NautobotFilterBackend):
+    """Used by all the BGP views.
+
+    Recognizes that "cursor" is a pagination parameter (see BGPPagination), and that "fields" and "exclude_fields"
+    select the rendered fields (see SparseFieldsetsSerializerMixin).
+    """
+
+    non_filter_params = ("cursor", "fields", "exclude_fields")
+
+    def get_filterset_kwargs(self, request, queryset, view):
+        """Pop the parameters which are not valid filter fields."""
+        kwargs = super().get_filterset_kwargs(request, queryset, view)
+        for param in self.non_filter_params:
+            kwargs["data"].pop(param, None)
+        return kwargs
+
+
+class IncludeInheritedFilterBackend(BGPFilterBackend):
     """
-    Used by views that work with inheritance (PeerGroupViewSet, PeerEndpointViewSet).
+    Used by views that work with inheritance (see InheritableFieldsViewSetMixin).
 
     Recognizes that "include_inherited" is not a filterset parameter but rather a view parameter (see InheritableFieldsViewSetMixin)
     """
@@ -0,0 +1,64 @@
+"""REST API pagination for nautobot_bgp_models."""
+
+from nautobot.core.api.pagination import OptionalLimitOffsetPagination
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination ordered by primary key.
+
+    Each page is fetched with an indexed `pk > <last pk of the previous page>` predicate, instead of an OFFSET, so
+    that deep pages cost the same as the first one. As the primary key is unique and never changes, the records
+    created or deleted during a full sync don't shift the following pages: no record is skipped or returned twice.
+    """
+
+    ordering = ("pk",)
+    page_size_query_param = "limit"
+
+    def get_ordering(self, request, queryset, view):
+        """Always order by primary key, regardless of the `sort` query parameter."""
+        return self.ordering
+
+    def get_page_size(self, request):
+        """Page size from the `limit` query parameter, capped by MAX_PAGE_SIZE as for the offset pagination."""
+        return OptionalLimitOffsetPagination().get_limit(request)
+
+
+class BGPPagination(OptionalLimitOffsetPagination):
+    """Offset pagination, switching to keyset pagination when the `cursor` query parameter is given.
+
+    Request the first page with an empty `cursor` then follow the `next` links, which carry the encoded cursor.
+    Keyset pages don't include a `count` of the records.
+    """
+
+    cursor_query_param = "cursor"
+
+    def __init__(self):
+        """No keyset pagination until a request asks for it."""
+        self.keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate with a cursor if requested, otherwise with limit and offset."""
+        if self.cursor_query_param in request.query_params and "text/csv" not in request.accepted_media_type:
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Response of the pagination in use."""
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        """Document the `cursor` query parameter along with `limit` and `offset`."""
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Pagination cursor, empty for the first page, switching to keyset pagination.",
+                "schema": {"type": "string"},
+            },
+        ]
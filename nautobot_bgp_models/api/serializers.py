@@ -1,35 +1,161 @@
 """API serializers for nautobot_bgp_models."""
 
+from drf_spectacular.utils import extend_schema_field
 from nautobot.apps.api import (
     NautobotModelSerializer,
     TaggedModelSerializerMixin,
 )
+from nautobot.core.api.fields import NautobotHyperlinkedRelatedField
 from nautobot.core.settings_funcs import is_truthy
+from nautobot.core.utils.lookup import get_route_for_model
+from nautobot.core.utils.requests import normalize_querydict
 from rest_framework import serializers, validators
+from rest_framework.reverse import reverse
+
+from nautobot_bgp_models import helpers, models
+from nautobot_bgp_models.api.fields import (
+    TEMPLATE_PK,
+    TemplatedHyperlinkedIdentityField,
+    TemplatedHyperlinkedRelatedField,
+    get_templated_url,
+    get_url_template,
+)
+from nautobot_bgp_models.instrumentation import instrumented
+
+
+class InstrumentedSerializerMixin:
+    """Common mixin counting and timing the serialization of BGP records in the current request."""
+
+    @instrumented("serializer")
+    def to_representation(self, instance):
+        """Render the model instance to a Python dict."""
+        return super().to_representation(instance)
 
-from nautobot_bgp_models import models
+
+class TemplatedURLSerializerMixin:
+    """Common mixin building the hyperlinks of the serializer from URL templates, instead of reversing each URL."""
+
+    serializer_url_field = TemplatedHyperlinkedIdentityField
+    serializer_related_field = TemplatedHyperlinkedRelatedField
+
+    def build_property_field(self, field_name, model_class):
+        """Build the `tags` field with templated hyperlinks as well."""
+        field_class, field_kwargs = super().build_property_field(field_name, model_class)
+        if field_class is NautobotHyperlinkedRelatedField:
+            field_class = TemplatedHyperlinkedRelatedField
+        return field_class, field_kwargs
+
+    @extend_schema_field(serializers.URLField())
+    def get_notes_url(self, instance):
+        """URL of the notes of the object, from the template of its model."""
+        request = self.context.get("request")
+        template = get_url_template(
+            self.context,
+            ("notes", type(instance)),
+            lambda: reverse(get_route_for_model(instance, "notes", api=True), args=[TEMPLATE_PK], request=request),
+        )
+        if template is None:
+            return super().get_notes_url(instance)
+        return f"{template[0]}{instance.pk}{template[1]}"
+
+
+class SparseFieldsetsSerializerMixin:
+    """Common mixin trimming the fields of the serializer based on the `fields` and `exclude_fields` query parameters.
+
+    Applies to GET requests only. The `id` of the records is always rendered, while the unknown field names are
+    rejected.
+    """
+
+    @property
+    def fields(self):
+        """Serializer fields, restricted to the requested ones."""
+        if getattr(self, "_sparse_fields", None) is None:
+            fields = super().fields
+            request = self.context.get("request") if hasattr(self, "_context") else None
+            if request is None or request.method != "GET" or self.is_nested:
+                return fields
+
+            params = normalize_querydict(getattr(request, "query_params", getattr(request, "GET", None)))
+            only = _field_names(params.get("fields"))
+            exclude = _field_names(params.get("exclude_fields"))
+            unknown = sorted((only | exclude) - set(fields))
+            if unknown:
+                param = "fields" if unknown[0] in only else "exclude_fields"
+                raise serializers.ValidationError({param: [f"Unknown field(s): {', '.join(unknown)}"]})
+
+            if only:
+                fields = {name: field for name, field in fields.items() if name in only or name == "id"}
+            if exclude:
+                fields = {name: field for name, field in fields.items() if name not in exclude or name == "id"}
+            self._sparse_fields = fields
+
+        return self._sparse_fields
+
+
+def _field_names(value):
+    """Set of field names from a query parameter, given as a comma-separated list and/or repeated."""
+    if value is None:
+        return set()
+    if isinstance(value, str):
+        value = [value]
+    return {name.strip() for item in value for name in item.split(",") if name.strip()}
 
 
 class AutonomousSystemSerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
     NautobotModelSerializer,
     TaggedModelSerializerMixin,
 ):
     """REST API serializer for AutonomousSystem records."""
 
-    url = serializers.HyperlinkedIdentityField(view_name="plugins-api:nautobot_bgp_models-api:autonomoussystem-detail")
+    url = TemplatedHyperlinkedIdentityField(view_name="plugins-api:nautobot_bgp_models-api:autonomoussystem-detail")
+    autonomous_system_ranges = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = models.AutonomousSystem
         fields = "__all__"
 
+    def get_field_names(self, declared_fields, info):
+        """Add the Autonomous System Ranges containing the ASN, opt-in only as they take a query per record."""
+        fields = list(super().get_field_names(declared_fields, info))
+        self.extend_field_names(fields, "autonomous_system_ranges", opt_in_only=True)
+        return fields
+
+    @extend_schema_field(serializers.ListField(child=serializers.DictField()))
+    def get_autonomous_system_ranges(self, obj):
+        """Brief representation of the Autonomous System Ranges containing the ASN."""
+        asn_ranges = obj.autonomous_system_ranges
+        request = self.context.get("request")
+        if request is not None:
+            asn_ranges = asn_ranges.restrict(request.user, "view")
+        result = []
+        for asn_range in asn_ranges:
+            url = asn_range.get_absolute_url(api=True)
+            result.append(
+                {
+                    "id": asn_range.pk,
+                    "object_type": asn_range._meta.label_lower,
+                    "url": request.build_absolute_uri(url) if request is not None else url,
+                    "name": asn_range.name,
+                    "asn_min": asn_range.asn_min,
+                    "asn_max": asn_range.asn_max,
+                }
+            )
+        return result
+
 
 class AutonomousSystemRangeSerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
     NautobotModelSerializer,
     TaggedModelSerializerMixin,
 ):
     """REST API serializer for AutonomousSystemRange records."""
 
-    url = serializers.HyperlinkedIdentityField(
+    url = TemplatedHyperlinkedIdentityField(
         view_name="plugins-api:nautobot_bgp_models-api:autonomoussystemrange-detail"
     )
 
@@ -45,12 +171,13 @@ class InheritableFieldsSerializerMixin:
         """Render the model instance to a Python dict.
 
         If `include_inherited` is specified as a request parameter, include inherited field values as appropriate.
+        Only the rendered fields are resolved.
         """
         req = self.context["request"]
         if hasattr(req, "query_params") and is_truthy(req.query_params.get("include_inherited", False)):
-            inherited_fields = instance.get_fields(include_inherited=True)
-            for field, data in inherited_fields.items():
-                setattr(instance, field, data["value"])
+            for field in instance.property_inheritance:
+                if field in self.fields:
+                    setattr(instance, field, instance.get_inherited_field(field)[0])
         return super().to_representation(instance)
 
 
@@ -65,12 +192,22 @@ class ExtraAttributesSerializerMixin(serializers.Serializer):  # pylint: disable
         If `include_inherited` is specified as a request parameter, include object's extra_attributes_inherited.
         """
         req = self.context["request"]
-        if hasattr(req, "query_params") and is_truthy(req.query_params.get("include_inherited", False)):
+        if (
+            hasattr(req, "query_params")
+            and is_truthy(req.query_params.get("include_inherited", False))
+            and "extra_attributes" in self.fields
+        ):
             setattr(instance, "extra_attributes", instance.extra_attributes_inherited)
         return super().to_representation(instance)
 
 
-class PeerGroupTemplateSerializer(NautobotModelSerializer, ExtraAttributesSerializerMixin):
+class PeerGroupTemplateSerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
+    NautobotModelSerializer,
+    ExtraAttributesSerializerMixin,
+):
     """REST API serializer for PeerGroup records."""
 
     class Meta:
@@ -78,7 +215,66 @@ class PeerGroupTemplateSerializer(NautobotModelSerializer, ExtraAttributesSerial
         fields = "__all__"
 
 
+class PeerGroupTemplateInstantiateSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """Input serializer for the PeerGroupTemplate `instantiate` action."""
+
+    peergroup_templates = serializers.PrimaryKeyRelatedField(
+        queryset=models.PeerGroupTemplate.objects.all(),
+        many=True,
+        help_text="Peer Group Templates to instantiate.",
+    )
+    routing_instance_filter = serializers.DictField(
+        required=False,
+        default=dict,
+        help_text="BGP Routing Instance filter parameters selecting the instances to instantiate the templates on. "
+        "All Routing Instances are selected when empty.",
+    )
+    batch_size = serializers.IntegerField(required=False, default=1000, min_value=1)
+
+
+class ChangesSinceSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """Input serializer for the `changes-since` feed."""
+
+    since = serializers.DateTimeField(help_text="Watermark, usually the `watermark` returned by the previous request.")
+
+
+class ResolveSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """Input serializer for the `resolve` action of the models inheriting their values."""
+
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        min_length=1,
+        max_length=10000,
+        help_text="IDs of the records to resolve, up to 10000.",
+    )
+
+
+def get_resolved_representation(context, model, pk, values):
+    """Render the effective values of the `model` record `pk`, as resolved by `helpers.resolve_inherited()`.
+
+    The related objects are rendered as by the model serializers at depth 0, with their `id`, `object_type` and `url`.
+    """
+    data = {
+        "id": pk,
+        "object_type": model._meta.label_lower,
+        "url": get_templated_url(context, get_route_for_model(model, "detail", api=True), pk),
+    }
+    for name, value in values.items():
+        related_model = None if name == "extra_attributes" else model._meta.get_field(name).related_model
+        if related_model is not None and value is not None:
+            value = {
+                "id": value,
+                "object_type": related_model._meta.label_lower,
+                "url": get_templated_url(context, get_route_for_model(related_model, "detail", api=True), value),
+            }
+        data[name] = value
+    return data
+
+
 class PeerGroupSerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
     InheritableFieldsSerializerMixin,
     TaggedModelSerializerMixin,
     NautobotModelSerializer,
@@ -104,6 +300,9 @@ class PeerGroupSerializer(
 
 
 class PeerEndpointSerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
     InheritableFieldsSerializerMixin,
     TaggedModelSerializerMixin,
     NautobotModelSerializer,
@@ -136,6 +335,9 @@ class PeerEndpointSerializer(
 
 
 class BGPRoutingInstanceSerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
     NautobotModelSerializer,
     TaggedModelSerializerMixin,
     ExtraAttributesSerializerMixin,
@@ -147,15 +349,67 @@ class BGPRoutingInstanceSerializer(
         fields = "__all__"
 
 
-class PeeringSerializer(NautobotModelSerializer):
+class PeeringSerializer(
+    InstrumentedSerializerMixin, TemplatedURLSerializerMixin, SparseFieldsetsSerializerMixin, NautobotModelSerializer
+):
     """REST API serializer for Peering records."""
 
+    endpoints = serializers.SerializerMethodField(read_only=True)
+
     class Meta:
         model = models.Peering
         fields = "__all__"
 
-
-class AddressFamilySerializer(NautobotModelSerializer, ExtraAttributesSerializerMixin):
+    def get_field_names(self, declared_fields, info):
+        """Add the summaries of the Peer Endpoints, opt-in only."""
+        fields = list(super().get_field_names(declared_fields, info))
+        self.extend_field_names(fields, "endpoints", opt_in_only=True)
+        return fields
+
+    @extend_schema_field(serializers.ListField(child=serializers.DictField()))
+    def get_endpoints(self, obj):
+        """Summary of the Peer Endpoints of the Peering, with their effective local IP address and ASN."""
+        endpoints = getattr(obj, "included_endpoints", None)
+        if endpoints is None:
+            endpoints = get_endpoint_summaries(self.context.get("request")).filter(peering=obj)
+        return [
+            {
+                "id": endpoint.pk,
+                "object_type": endpoint._meta.label_lower,
+                "url": get_templated_url(
+                    self.context, "plugins-api:nautobot_bgp_models-api:peerendpoint-detail", endpoint.pk
+                ),
+                "device": endpoint.device_name,
+                "peer_group": endpoint.peer_group_name,
+                "local_ip": (
+                    f"{endpoint.local_ip_host}/{endpoint.local_ip_mask_length}" if endpoint.local_ip_host else None
+                ),
+                "autonomous_system": endpoint.asn,
+            }
+            for endpoint in endpoints
+        ]
+
+    @extend_schema_field(serializers.CharField)
+    def get_display(self, instance):
+        """String representation of the Peering, built from the prefetched endpoint summaries when available."""
+        return helpers.format_peering(instance)
+
+
+def get_endpoint_summaries(request):
+    """Peer Endpoints visible to the user of the `request`, or all of them without a request, annotated as summaries."""
+    endpoints = models.PeerEndpoint.objects.only("pk", "peering", "routing_instance").order_by("pk")
+    if request is not None:
+        endpoints = endpoints.restrict(request.user, "view")
+    return helpers.annotate_endpoint_summary(endpoints)
+
+
+class AddressFamilySerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
+    NautobotModelSerializer,
+    ExtraAttributesSerializerMixin,
+):
     """REST API serializer for AddressFamily records."""
 
     class Meta:
@@ -163,10 +417,16 @@ class AddressFamilySerializer(NautobotModelSerializer, ExtraAttributesSerializer
         fields = "__all__"
 
 
-class PeerGroupAddressFamilySerializer(NautobotModelSerializer, ExtraAttributesSerializerMixin):
+class PeerGroupAddressFamilySerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
+    NautobotModelSerializer,
+    ExtraAttributesSerializerMixin,
+):
     """REST API serializer for PeerGroupAddressFamily records."""
 
-    url = serializers.HyperlinkedIdentityField(
+    url = TemplatedHyperlinkedIdentityField(
         view_name="plugins-api:nautobot_bgp_models-api:peergroupaddressfamily-detail"
     )
 
@@ -175,10 +435,17 @@ class PeerGroupAddressFamilySerializer(NautobotModelSerializer, ExtraAttributesS
         fields = "__all__"
 
 
-class PeerEndpointAddressFamilySerializer(NautobotModelSerializer, ExtraAttributesSerializerMixin):
+class PeerEndpointAddressFamilySerializer(
+    InstrumentedSerializerMixin,
+    TemplatedURLSerializerMixin,
+    SparseFieldsetsSerializerMixin,
+    InheritableFieldsSerializerMixin,
+    NautobotModelSerializer,
+    ExtraAttributesSerializerMixin,
+):
     """REST API serializer for PeerEndpointAddressFamily records."""
 
-    url = serializers.HyperlinkedIdentityField(
+    url = TemplatedHyperlinkedIdentityField(
         view_name="plugins-api:nautobot_bgp_models-api:peerendpointaddressfamily-detail"
     )
 
@@ -1,5 +1,6 @@
 """REST API URL registration for nautobot_bgp_models."""
 
+from django.urls import path
 from nautobot.apps.api import OrderedDefaultRouter
 
 from . import views
@@ -19,4 +20,7 @@ router.register("peer-endpoint-address-families", views.PeerEndpointAddressFamil
 router.register("routing-instances", views.BGPRoutingInstanceViewSet)
 
 app_name = "nautobot_bgp_models-api"
-urlpatterns = router.urls
+urlpatterns = [
+    path("changes-since/", views.ChangesSinceView.as_view(), name="changes-since"),
+    *router.urls,
+]
@@ -1,33 +1,334 @@
 """REST API viewsets for nautobot_bgp_models."""
 
+import uuid
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import QueryDict
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from nautobot.apps.api import NautobotModelViewSet
+from nautobot.core.api.authentication import TokenPermissions
+from nautobot.core.api.filter_backends import NautobotOrderingFilter
+from nautobot.core.api.views import NautobotAPIVersionMixin
+from nautobot.core.settings_funcs import is_truthy
+from nautobot.core.utils.data import is_uuid
+from rest_framework import serializers as drf_serializers
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from nautobot_bgp_models import filters, models
-from nautobot_bgp_models.api.filter_backends import IncludeInheritedFilterBackend
+from nautobot_bgp_models import filters, helpers, models
+from nautobot_bgp_models.api import caching
+from nautobot_bgp_models.api.filter_backends import BGPFilterBackend, IncludeInheritedFilterBackend
+from nautobot_bgp_models.api.pagination import BGPPagination
 
 from . import serializers
 
+sparse_fieldsets = [
+    OpenApiParameter(
+        name="fields",
+        required=False,
+        location=OpenApiParameter.QUERY,
+        description="Comma-separated names of the fields to render, along with the id",
+        type=OpenApiTypes.STR,
+    ),
+    OpenApiParameter(
+        name="exclude_fields",
+        required=False,
+        location=OpenApiParameter.QUERY,
+        description="Comma-separated names of the fields not to render",
+        type=OpenApiTypes.STR,
+    ),
+]
+
+# Serializer fields rendered from the primary key and the model class only.
+PK_ONLY_FIELDS = ("id", "object_type", "url", "notes_url")
+
+
+def sparse_fieldset_columns(model, fields):
+    """Names of the model fields to load for rendering the serializer `fields`, None if they can't be determined.
+
+    Any serializer field computed from the whole record, such as `display`, requires the full record.
+    """
+    columns = {"pk"}
+    for name, field in fields.items():
+        if field.write_only or name in PK_ONLY_FIELDS:
+            continue
+        if field.source == "*" or "." in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if model_field.many_to_many or model_field.one_to_many:
+            continue  # prefetched
+        if not model_field.concrete:
+            return None
+        columns.add(model_field.name)
+    return columns
+
+
+class BGPModelViewSet(NautobotModelViewSet):
+    """Common base of the BGP model viewsets.
+
+    Supports the keyset pagination with the `cursor` query parameter, and the sparse fieldsets with the `fields` and
+    `exclude_fields` query parameters.
+    """
+
+    pagination_class = BGPPagination
+    filter_backends = [BGPFilterBackend, NautobotOrderingFilter]
+
+    def get_queryset(self):
+        """As NautobotModelViewSet, but only loading the columns rendered in a sparse fieldset.
+
+        The queryset is already limited to the related objects of the rendered fields. The inherited values are
+        resolved through other fields of the records, which are then loaded in full.
+        """
+        queryset = super().get_queryset()
+        request = self.request
+        if request is None or request.method != "GET" or getattr(self, "swagger_fake_view", False):
+            return queryset
+        params = request.query_params
+        if not ("fields" in params or "exclude_fields" in params) or is_truthy(params.get("include_inherited", False)):
+            return queryset
+
+        columns = sparse_fieldset_columns(queryset.model, self.get_serializer().fields)
+        if columns is not None:
+            queryset = queryset.only(*columns)
+        return queryset
+
+    @extend_schema(parameters=sparse_fieldsets)
+    def list(self, request, *args, **kwargs):
+        """List all objects of this type."""
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(parameters=sparse_fieldsets)
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a specific object instance."""
+        return super().retrieve(request, *args, **kwargs)
+
 
-class BGPRoutingInstanceViewSet(NautobotModelViewSet):
+class CachedResponseViewSetMixin:
+    """Serve the list and detail JSON responses from the cache, when `api_cache_ttl` is set in the app settings."""
+
+    def _cached_response(self, render, request, *args, **kwargs):
+        """Return the cached response to `request`, else the response of `render`, cached if successful."""
+        ttl = caching.get_cache_ttl()
+        if not ttl or request.accepted_renderer.format != "json":
+            return render(request, *args, **kwargs)
+
+        key = caching.get_response_key(request, self.queryset.model)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = render(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=ttl)
+        return response
+
+    @extend_schema(parameters=sparse_fieldsets)
+    def list(self, request, *args, **kwargs):
+        """List all objects of this type."""
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    @extend_schema(parameters=sparse_fieldsets)
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a specific object instance."""
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
+
+
+class UpsertViewSetMixin:
+    """Common mixin for ViewSets supporting the bulk creation or update of records, matched by their `upsert_keys`.
+
+    The given records are compared with the existing ones in a single query, then only the new records and the records
+    with changed values are validated and saved, through the serializer as for individual POST and PATCH requests.
+    """
+
+    upsert_keys = ()
+
+    class UpsertPermissions(TokenPermissions):
+        """As TokenPermissions, but enforcing the view, add and change permissions for the upsert."""
+
+        perms_map = {
+            "POST": [
+                "%(app_label)s.view_%(model_name)s",
+                "%(app_label)s.add_%(model_name)s",
+                "%(app_label)s.change_%(model_name)s",
+            ],
+        }
+
+    def restrict_queryset(self, request, *args, **kwargs):
+        """Apply "view" permissions on the POST /upsert/ endpoint, otherwise as NautobotModelViewSet."""
+        if request.user.is_authenticated and self.action == "upsert":
+            self.queryset = self.queryset.restrict(request.user, "view")
+        else:
+            super().restrict_queryset(request, *args, **kwargs)
+
+    @staticmethod
+    def _related_pk(field, value, cache):
+        """Primary key, as a string, of the related object given as `value` for the related `field`.
+
+        The objects given as a primary key are not looked up, any other reference is resolved once per request.
+        """
+        if value is None:
+            return None
+        if isinstance(value, dict) and "id" in value:
+            value = value["id"]
+        if is_uuid(value):
+            return str(uuid.UUID(str(value)))
+        cache_key = (field.queryset.model, repr(value))
+        if cache_key not in cache:
+            cache[cache_key] = str(field.to_internal_value(value).pk)
+        return cache[cache_key]
+
+    def _upsert_key(self, fields, item, cache):
+        """Values of the `upsert_keys` in the given `item`, comparable to `_instance_key()`."""
+        key = []
+        for name in self.upsert_keys:
+            field = fields[name]
+            value = item.get(name)
+            try:
+                if isinstance(field, drf_serializers.RelatedField):
+                    key.append(self._related_pk(field, value, cache))
+                else:
+                    key.append(None if value is None else field.to_internal_value(value))
+            except drf_serializers.ValidationError as err:
+                raise drf_serializers.ValidationError({name: err.detail})
+        return tuple(key)
+
+    def _instance_key(self, instance):
+        key = []
+        for name in self.upsert_keys:
+            value = getattr(instance, instance._meta.get_field(name).attname)
+            key.append(str(value) if isinstance(value, uuid.UUID) else value)
+        return tuple(key)
+
+    def _has_changes(self, fields, instance, item, cache):
+        """Whether any value given in `item` differs from the `instance` one."""
+        for name, value in item.items():
+            field = fields.get(name)
+            if field is None or field.read_only:
+                continue
+            try:
+                if isinstance(field, drf_serializers.ManyRelatedField):
+                    current = {str(obj.pk) for obj in getattr(instance, field.source).all()}
+                    changed = current != {self._related_pk(field.child_relation, v, cache) for v in value or []}
+                elif isinstance(field, drf_serializers.RelatedField):
+                    current = getattr(instance, instance._meta.get_field(field.source).attname)
+                    changed = (str(current) if current else None) != self._related_pk(field, value, cache)
+                elif field.source == "_custom_field_data":
+                    changed = any(instance._custom_field_data.get(key) != v for key, v in (value or {}).items())
+                elif field.source == "*" or "." in field.source:
+                    changed = True
+                else:
+                    new_value = None if value is None else field.to_internal_value(value)
+                    changed = getattr(instance, field.source) != new_value
+            except drf_serializers.ValidationError:
+                changed = True  # reported by the serializer validation
+            if changed:
+                return True
+        return False
+
+    @extend_schema(
+        request={"application/json": {"type": "array", "items": {"type": "object"}}},
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["post"], url_path="upsert", permission_classes=[UpsertPermissions])
+    def upsert(self, request):
+        """Create or update the given records, matched to the existing ones by their `upsert_keys`.
+
+        The records omitted from the request are left untouched, as are the omitted fields of the existing records.
+        """
+        items = request.data
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise ValidationError({"non_field_errors": ["Expected a list of objects."]})
+
+        fields = self.get_serializer().fields
+        cache = {}
+        errors = [{} for _ in items]
+        keys = []
+        seen = {}
+        for index, item in enumerate(items):
+            try:
+                key = self._upsert_key(fields, item, cache)
+            except drf_serializers.ValidationError as err:
+                errors[index] = err.detail
+                key = None
+            if key is not None and key in seen:
+                errors[index] = {"non_field_errors": [f"Duplicate of the object at index {seen[key]}."]}
+            seen.setdefault(key, index)
+            keys.append(key)
+        if any(errors):
+            raise ValidationError(errors)
+
+        queryset = self.queryset.filter(**{f"{self.upsert_keys[0]}__in": {key[0] for key in keys}})
+        many_fields = {
+            field.source
+            for name, field in fields.items()
+            if isinstance(field, drf_serializers.ManyRelatedField) and any(name in item for item in items)
+        }
+        existing = {self._instance_key(instance): instance for instance in queryset.prefetch_related(*many_fields)}
+
+        to_create, to_update, unchanged = [], [], []
+        for index, (item, key) in enumerate(zip(items, keys)):
+            instance = existing.get(key)
+            if instance is None:
+                serializer = self.get_serializer(data=item)
+                to_create.append(serializer)
+            elif self._has_changes(fields, instance, item, cache):
+                serializer = self.get_serializer(instance, data=item, partial=True)
+                to_update.append(serializer)
+            else:
+                unchanged.append(instance.pk)
+                continue
+            if not serializer.is_valid():
+                errors[index] = serializer.errors
+        if any(errors):
+            raise ValidationError(errors)
+
+        model = self.queryset.model
+        with transaction.atomic():
+            updatable = model.objects.restrict(request.user, "change")
+            if updatable.filter(pk__in=[s.instance.pk for s in to_update]).count() != len(to_update):
+                raise PermissionDenied()
+            for serializer in [*to_create, *to_update]:
+                serializer.save()
+            created = [serializer.instance.pk for serializer in to_create]
+            updated = [serializer.instance.pk for serializer in to_update]
+            # Enforce object-level permissions on the saved records
+            for permitted, pks in ((model.objects.restrict(request.user, "add"), created), (updatable, updated)):
+                if permitted.filter(pk__in=pks).count() != len(pks):
+                    raise PermissionDenied()
+
+        return Response({"created": created, "updated": updated, "unchanged": unchanged})
+
+
+class BGPRoutingInstanceViewSet(UpsertViewSetMixin, BGPModelViewSet):
     """REST API viewset for BGPRoutingInstance records."""
 
     queryset = models.BGPRoutingInstance.objects.all()
     serializer_class = serializers.BGPRoutingInstanceSerializer
     filterset_class = filters.BGPRoutingInstanceFilterSet
+    upsert_keys = ("device", "autonomous_system")
 
 
-class AutonomousSystemViewSet(NautobotModelViewSet):
+class AutonomousSystemViewSet(UpsertViewSetMixin, CachedResponseViewSetMixin, BGPModelViewSet):
     """REST API viewset for AutonomousSystem records."""
 
     queryset = models.AutonomousSystem.objects.all()
     serializer_class = serializers.AutonomousSystemSerializer
     filterset_class = filters.AutonomousSystemFilterSet
+    upsert_keys = ("asn",)
 
 
-class AutonomousSystemRangeViewSet(NautobotModelViewSet):
+class AutonomousSystemRangeViewSet(CachedResponseViewSetMixin, BGPModelViewSet):
     """REST API viewset for AutonomousSystemRange records."""
 
     queryset = models.AutonomousSystemRange.objects.all()
@@ -47,35 +348,127 @@ include_inherited = OpenApiParameter(
 class InheritableFieldsViewSetMixin:
     """Common mixin for ViewSets that support an additional `include_inherited` query parameter."""
 
-    @extend_schema(parameters=[include_inherited])
+    @extend_schema(parameters=[include_inherited, *sparse_fieldsets])
     def list(self, request):
         """List all objects of this type."""
         return super().list(request)
 
-    @extend_schema(parameters=[include_inherited])
+    @extend_schema(parameters=[include_inherited, *sparse_fieldsets])
     def retrieve(self, request, pk=None):
         """Retrieve a specific object instance."""
         return super().retrieve(request, pk=pk)
 
 
-class PeerGroupViewSet(InheritableFieldsViewSetMixin, NautobotModelViewSet):
+class ResolveViewSetMixin:
+    """Common mixin for ViewSets resolving the effective values of a list of records with bulk queries."""
+
+    class ResolvePermissions(TokenPermissions):
+        """As TokenPermissions, but only enforcing the view permission for the resolution."""
+
+        perms_map = {
+            "POST": ["%(app_label)s.view_%(model_name)s"],
+        }
+
+    def restrict_queryset(self, request, *args, **kwargs):
+        """Apply "view" permissions on the POST /resolve/ endpoint, otherwise as NautobotModelViewSet."""
+        if request.user.is_authenticated and self.action == "resolve":
+            self.queryset = self.queryset.restrict(request.user, "view")
+        else:
+            super().restrict_queryset(request, *args, **kwargs)
+
+    @extend_schema(request=serializers.ResolveSerializer, responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["post"], url_path="resolve", permission_classes=[ResolvePermissions])
+    def resolve(self, request):
+        """Inherited values and merged extra attributes of the records with the given IDs, in the same order.
+
+        The IDs of the records which don't exist or aren't viewable by the user are listed as `missing`.
+        """
+        serializer = serializers.ResolveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+
+        model = self.queryset.model
+        resolved = helpers.resolve_inherited(self.queryset.filter(pk__in=ids))
+        context = {"request": request}
+        return Response(
+            {
+                "results": [
+                    serializers.get_resolved_representation(context, model, pk, resolved[pk])
+                    for pk in ids
+                    if pk in resolved
+                ],
+                "missing": [pk for pk in ids if pk not in resolved],
+            }
+        )
+
+
+class PeerGroupViewSet(UpsertViewSetMixin, ResolveViewSetMixin, InheritableFieldsViewSetMixin, BGPModelViewSet):
     """REST API viewset for PeerGroup records."""
 
     queryset = models.PeerGroup.objects.all()
     serializer_class = serializers.PeerGroupSerializer
     filter_backends = [IncludeInheritedFilterBackend, OrderingFilter]
     filterset_class = filters.PeerGroupFilterSet
+    upsert_keys = ("routing_instance", "name", "vrf")
 
 
-class PeerGroupTemplateViewSet(InheritableFieldsViewSetMixin, NautobotModelViewSet):
+class PeerGroupTemplateViewSet(InheritableFieldsViewSetMixin, CachedResponseViewSetMixin, BGPModelViewSet):
     """REST API viewset for PeerGroupTemplate records."""
 
     queryset = models.PeerGroupTemplate.objects.all()
     serializer_class = serializers.PeerGroupTemplateSerializer
+    filter_backends = [IncludeInheritedFilterBackend, OrderingFilter]
     filterset_class = filters.PeerGroupTemplateFilterSet
 
-
-class PeerEndpointViewSet(InheritableFieldsViewSetMixin, NautobotModelViewSet):
+    class InstantiatePermissions(TokenPermissions):
+        """As TokenPermissions, but enforcing view_peergrouptemplate and add_peergroup permissions."""
+
+        perms_map = {
+            "POST": ["%(app_label)s.view_%(model_name)s", "%(app_label)s.add_peergroup"],
+        }
+
+    def restrict_queryset(self, request, *args, **kwargs):
+        """Apply "view" permissions on the POST /instantiate/ endpoint, otherwise as NautobotModelViewSet."""
+        if request.user.is_authenticated and self.action == "instantiate":
+            self.queryset = self.queryset.restrict(request.user, "view")
+        else:
+            super().restrict_queryset(request, *args, **kwargs)
+
+    @extend_schema(
+        request=serializers.PeerGroupTemplateInstantiateSerializer,
+        responses={201: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["post"], url_path="instantiate", permission_classes=[InstantiatePermissions])
+    def instantiate(self, request):
+        """Create a Peer Group from each given template on every BGP Routing Instance matching the filter."""
+        serializer = serializers.PeerGroupTemplateInstantiateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        templates = self.queryset.filter(pk__in=[template.pk for template in data["peergroup_templates"]])
+
+        filter_params = QueryDict(mutable=True)
+        for key, value in data["routing_instance_filter"].items():
+            filter_params.setlist(key, value if isinstance(value, list) else [value])
+        filterset = filters.BGPRoutingInstanceFilterSet(
+            filter_params,
+            queryset=models.BGPRoutingInstance.objects.restrict(request.user, "view"),
+        )
+        if not filterset.is_valid():
+            raise ValidationError({"routing_instance_filter": filterset.errors})
+
+        with transaction.atomic():
+            created = helpers.instantiate_peer_group_templates(templates, filterset.qs, batch_size=data["batch_size"])
+            # Enforce object-level permissions on the created PeerGroups
+            created_ids = [peer_group.pk for peer_group in created]
+            permitted = models.PeerGroup.objects.restrict(request.user, "add").filter(pk__in=created_ids).count()
+            if permitted != len(created_ids):
+                raise PermissionDenied()
+
+        return Response({"created": len(created_ids), "peer_groups": created_ids}, status=status.HTTP_201_CREATED)
+
+
+class PeerEndpointViewSet(ResolveViewSetMixin, InheritableFieldsViewSetMixin, BGPModelViewSet):
     """REST API viewset for PeerEndpoint records."""
 
     queryset = models.PeerEndpoint.objects.all()
@@ -84,33 +477,86 @@ class PeerEndpointViewSet(InheritableFieldsViewSetMixin, NautobotModelViewSet):
     filterset_class = filters.PeerEndpointFilterSet
 
 
-class PeeringViewSet(NautobotModelViewSet):
+class PeeringViewSet(BGPModelViewSet):
     """REST API viewset for Peering records."""
 
     queryset = models.Peering.objects.all()
     serializer_class = serializers.PeeringSerializer
     filterset_class = filters.PeeringFilterSet
 
-
-class AddressFamilyViewSet(InheritableFieldsViewSetMixin, NautobotModelViewSet):
+    def get_queryset(self):
+        """Prefetch the summaries of the Peer Endpoints displayed or included, in a single query per page each."""
+        queryset = super().get_queryset()
+        if self.request is None or getattr(self, "swagger_fake_view", False):
+            return queryset
+        fields = self.get_serializer().fields
+        if "display" in fields:
+            # As `str()`, the display of a Peering names both endpoints, regardless of the permissions on them.
+            queryset = queryset.prefetch_related(helpers.prefetch_displayed_endpoints())
+        if "endpoints" in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "endpoints",
+                    queryset=serializers.get_endpoint_summaries(self.request),
+                    to_attr="included_endpoints",
+                )
+            )
+        return queryset
+
+
+class AddressFamilyViewSet(
+    UpsertViewSetMixin, InheritableFieldsViewSetMixin, CachedResponseViewSetMixin, BGPModelViewSet
+):
     """REST API viewset for AddressFamily records."""
 
     queryset = models.AddressFamily.objects.all()
     serializer_class = serializers.AddressFamilySerializer
+    filter_backends = [IncludeInheritedFilterBackend, OrderingFilter]
     filterset_class = filters.AddressFamilyFilterSet
+    upsert_keys = ("routing_instance", "vrf", "afi_safi")
 
 
-class PeerGroupAddressFamilyViewSet(InheritableFieldsViewSetMixin, NautobotModelViewSet):
+class PeerGroupAddressFamilyViewSet(UpsertViewSetMixin, InheritableFieldsViewSetMixin, BGPModelViewSet):
     """REST API viewset for PeerGroupAddressFamily records."""
 
     queryset = models.PeerGroupAddressFamily.objects.all()
     serializer_class = serializers.PeerGroupAddressFamilySerializer
+    filter_backends = [IncludeInheritedFilterBackend, OrderingFilter]
     filterset_class = filters.PeerGroupAddressFamilyFilterSet
+    upsert_keys = ("peer_group", "afi_safi")
 
 
-class PeerEndpointAddressFamilyViewSet(InheritableFieldsViewSetMixin, NautobotModelViewSet):
+class PeerEndpointAddressFamilyViewSet(
+    UpsertViewSetMixin, ResolveViewSetMixin, InheritableFieldsViewSetMixin, BGPModelViewSet
+):
     """REST API viewset for PeerEndpointAddressFamily records."""
 
     queryset = models.PeerEndpointAddressFamily.objects.all()
     serializer_class = serializers.PeerEndpointAddressFamilySerializer
+    filter_backends = [IncludeInheritedFilterBackend, OrderingFilter]
     filterset_class = filters.PeerEndpointAddressFamilyFilterSet
+    upsert_keys = ("peer_endpoint", "afi_safi")
+
+
+class ChangesSinceView(NautobotAPIVersionMixin, APIView):
+    """BGP records changed since a watermark, directly or through the inheritance of their values."""
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="since",
+                required=True,
+                location=OpenApiParameter.QUERY,
+                description="Watermark, usually the `watermark` returned by the previous request",
+                type=OpenApiTypes.DATETIME,
+            )
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        """IDs of the BGP records modified, deleted or inheriting modified values since the `since` watermark."""
+        serializer = serializers.ChangesSinceSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response(helpers.get_changes_since(serializer.validated_data["since"], request.user))
@@ -0,0 +1,258 @@
+"""Fleet-wide integrity audit of BGP models.
+
+Every check expresses one of the rules of `PeerEndpoint.clean()`, `PeerGroup.clean()` or `Peering.validate_peers()`
+as a single set-based query, so that the audit cost does not grow with one query per object.
+"""
+
+import csv
+import io
+import json
+
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Subquery, When
+from django.utils import timezone
+from nautobot.dcim.constants import MODULE_RECURSION_DEPTH_LIMIT
+from nautobot.dcim.models import Interface
+from nautobot.ipam.models import IPAddress, IPAddressToInterface, VRFPrefixAssignment
+
+from nautobot_bgp_models import helpers, models
+
+REPORT_FIELDS = ["check", "model", "id", "device", "message"]
+
+
+def _is_distinct_from(lookup, other_lookup):
+    """Q object matching rows where `lookup` and `other_lookup` differ, NULL values included."""
+    return (
+        Q(**{f"{lookup}__isnull": False, f"{other_lookup}__isnull": False}) & ~Q(**{lookup: F(other_lookup)})
+        | Q(**{f"{lookup}__isnull": True, f"{other_lookup}__isnull": False})
+        | Q(**{f"{lookup}__isnull": False, f"{other_lookup}__isnull": True})
+    )
+
+
+def _interface_device_lookups():
+    """Lookups from IPAddressToInterface to the Device of the Interface, directly or through nested Modules."""
+    lookups = ["interface__device"]
+    for level in range(MODULE_RECURSION_DEPTH_LIMIT):
+        lookups.append(
+            f"interface__module__{'parent_module_bay__parent_module__' * level}parent_module_bay__parent_device"
+        )
+    return lookups
+
+
+def _endpoints_missing_asn():
+    """PeerEndpoints without an autonomous system at any inheritance level."""
+    return models.PeerEndpoint.objects.alias(
+        asn=helpers.inherited_field_expression(models.PeerEndpoint, "autonomous_system")
+    ).filter(asn__isnull=True)
+
+
+def _endpoints_missing_ip():
+    """PeerEndpoints without an effective local IP address."""
+    return helpers.alias_local_ip(models.PeerEndpoint.objects.all()).filter(local_ip__isnull=True)
+
+
+def _endpoints_ip_not_on_device():
+    """PeerEndpoints whose effective local IP address is not on an Interface of the routing instance's Device.
+
+    Like `Device.vc_interfaces`, the non management-only Interfaces of the other Virtual Chassis members are
+    accepted when the Device is the Virtual Chassis master.
+    """
+    on_device = Q()
+    on_chassis = Q()
+    for lookup in _interface_device_lookups():
+        on_device |= Q(**{lookup: OuterRef("routing_instance__device")})
+        on_chassis |= Q(**{f"{lookup}__virtual_chassis": OuterRef("master_of_chassis")})
+    on_chassis &= Q(interface__mgmt_only=False)
+
+    return (
+        helpers.alias_local_ip(models.PeerEndpoint.objects.filter(routing_instance__isnull=False))
+        .alias(
+            master_of_chassis=Case(
+                When(
+                    routing_instance__device__virtual_chassis__master=F("routing_instance__device"),
+                    then=F("routing_instance__device__virtual_chassis"),
+                )
+            )
+        )
+        .filter(local_ip__isnull=False)
+        .exclude(Exists(IPAddressToInterface.objects.filter(on_device | on_chassis, ip_address=OuterRef("local_ip"))))
+    )
+
+
+def _endpoints_vrf_mismatch():
+    """PeerEndpoints whose effective local IP address and source Interface are both outside of the Peer Group VRF."""
+    return (
+        helpers.alias_local_ip(models.PeerEndpoint.objects.filter(peer_group__vrf__isnull=False))
+        .alias(
+            local_ip_parent=Subquery(IPAddress.objects.filter(pk=OuterRef("local_ip")).values("parent")[:1]),
+            local_ip_interface_vrf=Subquery(
+                Interface.objects.filter(pk=OuterRef("local_ip_interface")).values("vrf")[:1]
+            ),
+        )
+        .filter(local_ip__isnull=False)
+        .exclude(
+            Exists(
+                VRFPrefixAssignment.objects.filter(prefix=OuterRef("local_ip_parent"), vrf=OuterRef("peer_group__vrf"))
+            )
+        )
+        .filter(_is_distinct_from("local_ip_interface_vrf", "peer_group__vrf"))
+    )
+
+
+def _peer_groups_interface_vrf_mismatch():
+    """PeerGroups whose VRF differs from the VRF of their source Interface."""
+    return models.PeerGroup.objects.filter(source_interface__isnull=False).filter(
+        _is_distinct_from("vrf", "source_interface__vrf")
+    )
+
+
+def _peer_groups_ip_not_on_device():
+    """PeerGroups whose source IP address is not on an Interface of the routing instance's Device."""
+    return models.PeerGroup.objects.filter(source_ip__isnull=False).exclude(
+        Exists(
+            IPAddressToInterface.objects.filter(
+                ip_address=OuterRef("source_ip"), interface__device=OuterRef("routing_instance__device")
+            )
+        )
+    )
+
+
+def _peer_groups_ip_vrf_mismatch():
+    """PeerGroups whose VRF is not one of the VRFs of the parent Prefix of their source IP address."""
+    return models.PeerGroup.objects.filter(vrf__isnull=False, source_ip__isnull=False).exclude(
+        Exists(VRFPrefixAssignment.objects.filter(prefix=OuterRef("source_ip__parent"), vrf=OuterRef("vrf")))
+    )
+
+
+def _peerings_same_routing_instance():
+    """Peerings with more than one PeerEndpoint on the same routing instance."""
+    duplicates = (
+        models.PeerEndpoint.objects.filter(routing_instance__isnull=False)
+        .order_by()
+        .values("peering", "routing_instance")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values("peering")
+    )
+    return models.Peering.objects.filter(pk__in=duplicates)
+
+
+def _peerings_same_ip():
+    """Peerings with more than one PeerEndpoint using the same effective local IP address."""
+    duplicates = (
+        helpers.alias_local_ip(models.PeerEndpoint.objects.all())
+        .filter(local_ip__isnull=False)
+        .order_by()
+        .annotate(ip=F("local_ip"))
+        .values("peering", "ip")
+        .annotate(count=Count("pk"))
+        .filter(count__gt=1)
+        .values("peering")
+    )
+    return models.Peering.objects.filter(pk__in=duplicates)
+
+
+# Check name: (function returning the offending objects, lookup of the Device name or None, report message)
+CHECKS = {
+    "endpoint_missing_asn": (
+        _endpoints_missing_asn,
+        "routing_instance__device__name",
+        "ASN not found at any inheritance level.",
+    ),
+    "endpoint_missing_ip": (
+        _endpoints_missing_ip,
+        "routing_instance__device__name",
+        "Endpoint IP not found at any inheritance level.",
+    ),
+    "endpoint_ip_not_on_device": (
+        _endpoints_ip_not_on_device,
+        "routing_instance__device__name",
+        "Peer IP not associated with Routing Instance.",
+    ),
+    "endpoint_vrf_mismatch": (
+        _endpoints_vrf_mismatch,
+        "routing_instance__device__name",
+        "VRF mismatch between the endpoint IP or source interface and its Peer Group.",
+    ),
+    "peer_group_interface_vrf_mismatch": (
+        _peer_groups_interface_vrf_mismatch,
+        "routing_instance__device__name",
+        "VRF mismatch between PeerGroup VRF and source interface VRF.",
+    ),
+    "peer_group_ip_not_on_device": (
+        _peer_groups_ip_not_on_device,
+        "routing_instance__device__name",
+        "Group IP not associated with Routing Instance.",
+    ),
+    "peer_group_ip_vrf_mismatch": (
+        _peer_groups_ip_vrf_mismatch,
+        "routing_instance__device__name",
+        "VRF mismatch between PeerGroup VRF and source IP VRF.",
+    ),
+    "peering_same_routing_instance": (
+        _peerings_same_routing_instance,
+        None,
+        "Peering between same routing instance not allowed.",
+    ),
+    "peering_same_ip": (
+        _peerings_same_ip,
+        None,
+        "Peering between same IPs not allowed.",
+    ),
+}
+
+
+def run_audit(checks=None, using=None):
+    """Run the integrity checks over all BGP objects.
+
+    Each check runs exactly one query, independently of the number of objects.
+
+    Args:
+        checks (Iterable[str]): names of the `CHECKS` to run, all of them when not given.
+        using (str): alias of the database to read from, the default database when not given.
+
+    Returns:
+        (list[dict]): one finding per offending object, with the keys listed in `REPORT_FIELDS`.
+    """
+    findings = []
+    for check in checks or CHECKS:
+        get_queryset, device_lookup, message = CHECKS[check]
+        queryset = get_queryset().using(using).order_by("pk")
+        model = f"{queryset.model._meta.app_label}.{queryset.model._meta.model_name}"
+        if device_lookup:
+            rows = queryset.values_list("pk", device_lookup)
+        else:
+            rows = ((pk, None) for pk in queryset.values_list("pk", flat=True))
+        findings.extend(
+            {"check": check, "model": model, "id": str(pk), "device": device or "", "message": message}
+            for pk, device in rows
+        )
+    return findings
+
+
+def render_report(findings, output_format="json"):
+    """Serialize the findings of `run_audit()` as JSON or CSV.
+
+    Args:
+        findings (list[dict]): result of `run_audit()`.
+        output_format (str): either "json" or "csv".
+
+    Returns:
+        (str): the report. The JSON report includes the generation time and the number of findings per check.
+    """
+    if output_format == "csv":
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(findings)
+        return output.getvalue()
+
+    if output_format != "json":
+        raise ValueError(f"Unsupported report format {output_format!r}")
+
+    summary = {}
+    for finding in findings:
+        summary[finding["check"]] = summary.get(finding["check"], 0) + 1
+    return json.dumps(
+        {"generated": timezone.now().isoformat(), "summary": summary, "findings": findings},
+        indent=2,
+    )
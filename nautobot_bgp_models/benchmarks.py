@@ -0,0 +1,221 @@
+"""Benchmarks of the BGP Models app hot paths, with SQL query count and wall time budgets.
+
+The scenarios run against the data present in the database, typically generated with
+`nautobot-server generate_bgp_test_data --scale`, and are executed in a transaction that is rolled back.
+"""
+
+import functools
+import statistics
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.test import Client
+from django.urls import reverse
+from nautobot.dcim.models import Device
+from rest_framework.test import APIClient
+
+from nautobot_bgp_models import models
+
+
+class BenchmarkContext:
+    """Clients and objects shared by the benchmark scenarios."""
+
+    def __init__(self, user, page_size):
+        """Log the API and UI clients in as `user`."""
+        self.page_size = page_size
+        self.api_client = APIClient(HTTP_ACCEPT="application/json")
+        self.api_client.force_authenticate(user)
+        self.ui_client = Client()
+        self.ui_client.force_login(user)
+
+    @property
+    def asn_range(self):
+        """The widest AutonomousSystemRange."""
+        return models.AutonomousSystemRange.objects.order_by(F("asn_min") - F("asn_max")).first()
+
+    @functools.cached_property
+    def bgp_device(self):
+        """The Device with the most BGP sessions."""
+        devices = Device.objects.annotate(session_count=Count("bgp_routing_instances__endpoints"))
+        return devices.order_by("-session_count").first()
+
+    @functools.cached_property
+    def peer_group(self):
+        """The PeerGroup with the most Peer Endpoints."""
+        return models.PeerGroup.objects.annotate(endpoint_count=Count("endpoints")).order_by("-endpoint_count").first()
+
+    @functools.cached_property
+    def peering(self):
+        """The first Peering with both of its endpoints."""
+        return models.Peering.objects.annotate(endpoint_count=Count("endpoints")).filter(endpoint_count=2).first()
+
+    @staticmethod
+    def get(client, url, **params):
+        """GET `url`, raising an error on failure."""
+        response = client.get(url, params)
+        if response.status_code != 200:  # noqa: PLR2004
+            raise RuntimeError(f"GET {url} returned HTTP {response.status_code}: {response.content[:500]}")
+        return response
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries, unlike `connection.queries` unbounded and DEBUG-independent."""
+
+    def __init__(self):
+        """Start counting from zero."""
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count and execute one query."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _api_list(endpoint, include_inherited):
+    """Scenario listing one page of `endpoint` with the REST API."""
+
+    def scenario(context):
+        params = {"limit": context.page_size}
+        if include_inherited:
+            params["include_inherited"] = "true"
+        context.get(context.api_client, f"/api/plugins/bgp/{endpoint}/", **params)
+
+    return scenario
+
+
+def _peering_list(context):
+    context.get(context.ui_client, reverse("plugins:nautobot_bgp_models:peering_list"), per_page=context.page_size)
+
+
+def _asn_range_detail(context):
+    asn_range = context.asn_range
+    context.get(context.ui_client, reverse("plugins:nautobot_bgp_models:autonomoussystemrange", args=[asn_range.pk]))
+
+
+def _peering_detail(context):
+    context.get(context.ui_client, reverse("plugins:nautobot_bgp_models:peering", args=[context.peering.pk]))
+
+
+def _device_bgp_panel(context):
+    url = reverse("plugins:nautobot_bgp_models:device_bgp_panel", args=[context.bgp_device.pk])
+    context.get(context.ui_client, url, per_page=context.page_size)
+
+
+def _peer_group_peerings_panel(context):
+    url = reverse("plugins:nautobot_bgp_models:peergroup_peerings_panel", args=[context.peer_group.pk])
+    context.get(context.ui_client, url, per_page=context.page_size)
+
+
+def _next_available_asn(context):
+    context.asn_range.get_next_available_asn()
+
+
+def _extra_attributes_inherited(context):
+    for endpoint in models.PeerEndpoint.objects.all()[: context.page_size]:
+        endpoint.extra_attributes_inherited  # pylint: disable=pointless-statement
+
+
+def _peer_endpoint_validation(context):
+    for endpoint in models.PeerEndpoint.objects.all()[: context.page_size]:
+        endpoint.full_clean()
+
+
+# Scenario name: (function taking a BenchmarkContext, model that must have data to run the scenario,
+#                 fixed SQL queries budget, SQL queries budget per listed or processed object, wall time budget)
+# The query budgets are the counts measured on `generate_bgp_test_data --scale` data with a margin of one query, the
+# scenarios that prefetch their objects have no per object budget. The wall time budgets are in seconds for the default
+# page size of 50 and grow in proportion with larger pages.
+SCENARIOS = {
+    "api_list_autonomous-systems": (_api_list("autonomous-systems", False), None, 5, 0, 0.5),
+    "api_list_autonomous-system-ranges": (_api_list("autonomous-system-ranges", False), None, 5, 0, 0.5),
+    "api_list_routing-instances": (_api_list("routing-instances", False), None, 5, 1, 1.0),
+    "api_list_peer-group-templates": (_api_list("peer-group-templates", False), None, 4, 0, 0.5),
+    "api_list_peer-group-templates_inherited": (_api_list("peer-group-templates", True), None, 4, 0, 0.5),
+    "api_list_peer-groups": (_api_list("peer-groups", False), None, 5, 3, 2.0),
+    "api_list_peer-groups_inherited": (_api_list("peer-groups", True), None, 5, 5, 2.0),
+    "api_list_peer-endpoints": (_api_list("peer-endpoints", False), None, 5, 6, 2.0),
+    "api_list_peer-endpoints_inherited": (_api_list("peer-endpoints", True), None, 5, 7, 2.0),
+    "api_list_peerings": (_api_list("peerings", False), None, 5, 0, 1.0),
+    "api_list_address-families": (_api_list("address-families", False), None, 4, 3, 1.0),
+    "api_list_address-families_inherited": (_api_list("address-families", True), None, 4, 3, 1.0),
+    "api_list_peer-group-address-families": (_api_list("peer-group-address-families", False), None, 4, 4, 2.0),
+    "api_list_peer-group-address-families_inherited": (
+        _api_list("peer-group-address-families", True),
+        None,
+        4,
+        5,
+        2.0,
+    ),
+    "api_list_peer-endpoint-address-families": (_api_list("peer-endpoint-address-families", False), None, 4, 8, 2.0),
+    "api_list_peer-endpoint-address-families_inherited": (
+        _api_list("peer-endpoint-address-families", True),
+        None,
+        4,
+        17,
+        3.0,
+    ),
+    "ui_peering_list": (_peering_list, None, 12, 44, 6.0),
+    "ui_asn_range_detail": (_asn_range_detail, models.AutonomousSystemRange, 58, 0, 1.0),
+    "ui_peering_detail": (_peering_detail, models.Peering, 49, 0, 1.0),
+    "ui_device_bgp_panel": (_device_bgp_panel, models.BGPRoutingInstance, 11, 0, 1.0),
+    "ui_peer_group_peerings_panel": (_peer_group_peerings_panel, models.PeerGroup, 9, 0, 1.0),
+    "next_available_asn": (_next_available_asn, models.AutonomousSystemRange, 3, 0, 0.5),
+    "extra_attributes_inherited": (_extra_attributes_inherited, models.PeerEndpoint, 2, 3, 0.5),
+    "peer_endpoint_validation": (_peer_endpoint_validation, models.PeerEndpoint, 2, 13, 2.5),
+}
+
+
+def run_benchmarks(scenarios=None, repeat=3, page_size=50, time_factor=1.0):
+    """Run the benchmark scenarios and compare them with their budgets.
+
+    Every scenario runs `repeat` times. The query count of the last run and the median wall time are reported.
+
+    Args:
+        scenarios (Iterable[str]): names of the `SCENARIOS` to run, all of them when not given.
+        repeat (int): number of runs of each scenario.
+        page_size (int): number of objects listed or processed by each scenario.
+        time_factor (float): multiplier applied to the wall time budgets, None to ignore them. The budgets are also
+            scaled by the page size when it is larger than 50.
+
+    Returns:
+        (list[dict]): one result per scenario, with the keys `scenario`, `queries`, `max_queries`, `seconds`,
+            `max_seconds` and `passed`. Skipped scenarios, without data to run on, have no `passed` key.
+    """
+    results = []
+    with transaction.atomic():
+        user = get_user_model().objects.create(
+            username=f"bgp-benchmark-{uuid.uuid4()}", is_superuser=True, is_staff=True
+        )
+        context = BenchmarkContext(user, page_size)
+
+        for name in scenarios or SCENARIOS:
+            scenario, required_model, fixed_queries, queries_per_object, max_seconds = SCENARIOS[name]
+            max_queries = fixed_queries + queries_per_object * page_size
+            if time_factor is not None:
+                max_seconds = max_seconds * time_factor * max(page_size, 50) / 50
+            else:
+                max_seconds = None
+            result = {"scenario": name, "max_queries": max_queries, "max_seconds": max_seconds}
+            results.append(result)
+            if required_model is not None and not required_model.objects.exists():
+                continue
+
+            timings = []
+            for _ in range(repeat):
+                counter = QueryCounter()
+                with connection.execute_wrapper(counter):
+                    start = time.perf_counter()
+                    scenario(context)
+                    timings.append(time.perf_counter() - start)
+            result["queries"] = counter.count
+            result["seconds"] = statistics.median(timings)
+            result["passed"] = result["queries"] <= max_queries and (
+                max_seconds is None or result["seconds"] <= max_seconds
+            )
+
+        transaction.set_rollback(True)
+
+    return results
@@ -0,0 +1,196 @@
+"""Columnar (Parquet or Arrow) export of the BGP sessions, for analytics.
+
+Each row is a Peering joined with the effective values of its two Peer Endpoints. The rows are built in batches from
+`values()` querysets, without instantiating any model, then written with pyarrow, which is an optional dependency.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F, TextField
+from django.db.models.functions import Cast
+from nautobot.extras.models import Role
+from nautobot.ipam.models import IPAddress
+
+from nautobot_bgp_models import helpers, models
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    PYARROW_AVAILABLE = False
+else:
+    PYARROW_AVAILABLE = True
+
+EXPORT_FORMATS = ("parquet", "arrow")
+
+ENDPOINT_COLUMNS = {
+    "endpoint_id": "string",
+    "device": "string",
+    "local_ip": "string",
+    "asn": "int64",
+    "peer_group": "string",
+    "role": "string",
+    "address_families": "list<string>",
+}
+
+# Column name: type. Endpoint "A" and "Z" are the first and second endpoints of the Peering by primary key.
+SESSION_COLUMNS = {
+    "peering_id": "string",
+    "status": "string",
+    **{f"{side}_{name}": column_type for side in ("a", "z") for name, column_type in ENDPOINT_COLUMNS.items()},
+}
+
+
+def _uuid(expression, using=None):
+    """Select a UUID `expression` as text on PostgreSQL, sparing the parsing of millions of UUID objects."""
+    if isinstance(expression, str):
+        expression = F(expression)
+    if connections[using or DEFAULT_DB_ALIAS].vendor == "postgresql":
+        return Cast(expression, TextField())
+    return expression
+
+
+def _endpoints_in_range(peerings_after, last_peering, prefix=""):
+    """Filter on the endpoints of the Peerings in the (peerings_after, last_peering] primary key range."""
+    lookups = {f"{prefix}peering__lte": last_peering}
+    if peerings_after is not None:
+        lookups[f"{prefix}peering__gt"] = peerings_after
+    return lookups
+
+
+def _endpoint_values(peerings_after, last_peering, using=None):
+    """Effective values of the endpoints of the Peerings in the range, ordered by Peering then primary key."""
+    endpoints = models.PeerEndpoint.objects.using(using).filter(**_endpoints_in_range(peerings_after, last_peering))
+    return (
+        helpers.alias_local_ip(endpoints)
+        .order_by("peering", "pk")
+        .values_list(
+            _uuid("pk", using),
+            _uuid("peering", using),
+            "routing_instance__device__name",
+            _uuid("local_ip", using),
+            _uuid(helpers.inherited_field_expression(models.PeerEndpoint, "autonomous_system"), using),
+            _uuid("peer_group", using),
+            "peer_group__name",
+            _uuid(helpers.inherited_field_expression(models.PeerEndpoint, "role"), using),
+        )
+    )
+
+
+def _address_families(peerings_after, last_peering, using=None):
+    """AFI-SAFIs of the endpoints of the Peerings in the range and of their Peer Groups."""
+    in_range = _endpoints_in_range(peerings_after, last_peering, prefix="peer_endpoint__")
+    by_endpoint = {}
+    for endpoint, afi_safi in (
+        models.PeerEndpointAddressFamily.objects.using(using)
+        .filter(**in_range)
+        .order_by()
+        .values_list(_uuid("peer_endpoint", using), "afi_safi")
+    ):
+        by_endpoint.setdefault(endpoint, set()).add(afi_safi)
+
+    peer_groups = (
+        models.PeerEndpoint.objects.using(using)
+        .filter(**_endpoints_in_range(peerings_after, last_peering))
+        .values("peer_group")
+    )
+    by_peer_group = {}
+    for peer_group, afi_safi in (
+        models.PeerGroupAddressFamily.objects.using(using)
+        .filter(peer_group__in=peer_groups)
+        .order_by()
+        .values_list(_uuid("peer_group", using), "afi_safi")
+    ):
+        by_peer_group.setdefault(peer_group, set()).add(afi_safi)
+    return by_endpoint, by_peer_group
+
+
+def iter_session_batches(batch_size=50000, using=None):
+    """Yield the BGP sessions by batches of up to `batch_size` Peerings, as {column name: [values]} dicts.
+
+    Each batch costs a constant number of queries, paginated by Peering primary key, run on the `using` database.
+    """
+    asns = dict(models.AutonomousSystem.objects.using(using).values_list(_uuid("pk", using), "asn"))
+    roles = dict(Role.objects.using(using).values_list(_uuid("pk", using), "name"))
+    last_peering = None
+    while True:
+        peerings = models.Peering.objects.using(using).order_by("pk")
+        if last_peering is not None:
+            peerings = peerings.filter(pk__gt=last_peering)
+        peerings = list(peerings.values_list("pk", _uuid("pk", using), "status__name")[:batch_size])
+        if not peerings:
+            return
+        batch_after, last_peering = last_peering, peerings[-1][0]
+
+        endpoint_values = list(_endpoint_values(batch_after, last_peering, using))
+        addresses = {
+            pk: f"{host}/{mask_length}"
+            for pk, host, mask_length in IPAddress.objects.using(using)
+            .filter(pk__in={local_ip for _, _, _, local_ip, *_ in endpoint_values if local_ip})
+            .values_list(_uuid("pk", using), "host", "mask_length")
+        }
+        endpoint_afs, peer_group_afs = _address_families(batch_after, last_peering, using)
+
+        # Peering: [values of the ENDPOINT_COLUMNS of each endpoint]
+        endpoints = {}
+        for pk, peering, device, local_ip, asn, peer_group, peer_group_name, role in endpoint_values:
+            endpoints.setdefault(peering, []).append(
+                (
+                    str(pk),
+                    device,
+                    addresses.get(local_ip),
+                    asns.get(asn),
+                    peer_group_name,
+                    roles.get(role),
+                    sorted(endpoint_afs.get(pk, set()) | peer_group_afs.get(peer_group, set())),
+                )
+            )
+
+        columns = {name: [] for name in SESSION_COLUMNS}
+        side_columns = [[columns[f"{side}_{name}"] for name in ENDPOINT_COLUMNS] for side in ("a", "z")]
+        no_endpoint = (None,) * len(ENDPOINT_COLUMNS)
+        for _, peering, status in peerings:
+            columns["peering_id"].append(str(peering))
+            columns["status"].append(status)
+            peering_endpoints = endpoints.get(peering, [])
+            for index, side in enumerate(side_columns):
+                values = peering_endpoints[index] if index < len(peering_endpoints) else no_endpoint
+                for column, value in zip(side, values):
+                    column.append(value)
+        yield columns
+
+
+def _arrow_schema():
+    types = {"string": pyarrow.string(), "int64": pyarrow.int64(), "list<string>": pyarrow.list_(pyarrow.string())}
+    return pyarrow.schema([(name, types[column_type]) for name, column_type in SESSION_COLUMNS.items()])
+
+
+def export_sessions(output, output_format="parquet", batch_size=50000, using=None):
+    """Write the BGP sessions to the `output` path or file object, as a Parquet file or an Arrow IPC file.
+
+    Args:
+        output (str|file): destination of the export.
+        output_format (str): "parquet" or "arrow".
+        batch_size (int): number of Peerings per batch, bounding the memory in use.
+        using (str): alias of the database to read from, the default database when not given.
+
+    Returns:
+        (int): number of exported sessions.
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImproperlyConfigured("The pyarrow package is required to export the BGP sessions.")
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {output_format}, expected one of {', '.join(EXPORT_FORMATS)}.")
+
+    schema = _arrow_schema()
+    if output_format == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(output, schema)
+    else:
+        writer = pyarrow.ipc.new_file(output, schema)
+    count = 0
+    with writer:
+        for columns in iter_session_batches(batch_size, using):
+            writer.write_table(pyarrow.Table.from_pydict(columns, schema=schema))
+            count += len(columns["peering_id"])
+    return count
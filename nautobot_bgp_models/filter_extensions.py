@@ -4,6 +4,10 @@ from django import forms
 from django.db.models import Q
 from nautobot.apps.filters import FilterExtension, MultiValueCharFilter
 from nautobot.dcim.constants import MODULE_RECURSION_DEPTH_LIMIT
+from nautobot.dcim.models import Module
+from nautobot.ipam.models import IPAddressToInterface
+
+from nautobot_bgp_models.models import BGPRoutingInstance
 
 
 def _q_routing_instance_ids_via_parent_device(value, prefix=""):
@@ -11,7 +15,11 @@ def _q_routing_instance_ids_via_parent_device(value, prefix=""):
     Build a Q that matches when the interface's parent device has any of the given routing instance IDs.
 
     Mirrors Interface.parent (device or module chain to device). Prefix is "" for Interface
-    queryset, "interfaces__" for IPAddress queryset.
+    queryset, "interfaces__" for IPAddress queryset, "interface__" for IPAddressToInterface queryset.
+
+    The Devices of the routing instances and the Modules installed in them, level by level down the module bays,
+    are resolved first with small indexed queries. The resulting Q only compares the interface's `device` and
+    `module` columns to these primary keys, instead of joining the interface table with every module nesting level.
     """
     if not value:
         return Q(pk__in=[])
@@ -19,21 +27,27 @@ def _q_routing_instance_ids_via_parent_device(value, prefix=""):
         value = [value]
     value = [str(v).strip() for v in value if v is not None and str(v).strip()]
 
-    suffix = "bgp_routing_instances__id__in"
-    query = Q(**{f"{prefix}device__{suffix}": value})
-    recursion_depth = MODULE_RECURSION_DEPTH_LIMIT - 1
-    for level in range(recursion_depth):
-        recursive_part = "module__parent_module_bay__" + "parent_module__parent_module_bay__" * level
-        query = query | Q(**{f"{prefix}{recursive_part}parent_device__{suffix}": value})
-    return query
+    device_ids = set(BGPRoutingInstance.objects.filter(id__in=value).values_list("device_id", flat=True))
+    module_ids = set()
+    level_ids = set(Module.objects.filter(parent_module_bay__parent_device__in=device_ids).values_list("pk", flat=True))
+    for _ in range(MODULE_RECURSION_DEPTH_LIMIT - 2):
+        if not level_ids:
+            break
+        module_ids |= level_ids
+        level_ids = set(
+            Module.objects.filter(parent_module_bay__parent_module__in=level_ids).values_list("pk", flat=True)
+        )
+    module_ids |= level_ids
+
+    return Q(**{f"{prefix}device__in": device_ids}) | Q(**{f"{prefix}module__in": module_ids})
 
 
 def _filter_ips_by_routing_instance(queryset, name, value):  # pylint: disable=unused-argument
     """Filter IPAddress queryset by routing instance UUID(s) via interface's parent device."""
     if not value:
         return queryset
-    q = _q_routing_instance_ids_via_parent_device(value, "interfaces__")
-    return queryset.filter(q).distinct()
+    q = _q_routing_instance_ids_via_parent_device(value, "interface__")
+    return queryset.filter(pk__in=IPAddressToInterface.objects.filter(q).values("ip_address"))
 
 
 def _filter_interfaces_by_routing_instance(queryset, name, value):  # pylint: disable=unused-argument
@@ -1,7 +1,10 @@
 # pylint: disable=unsupported-binary-operation
 """FilterSet definitions for nautobot_bgp_models."""
 
+import uuid
+
 import django_filters
+import netaddr
 from django.db.models import Q
 from nautobot.apps.filters import (
     NaturalKeyOrPKMultipleChoiceFilter,
@@ -16,15 +19,66 @@ from nautobot.extras.models import Role
 from nautobot.ipam.models import VRF
 from nautobot.tenancy.models import Tenant
 
-from . import choices, models
+from . import choices, helpers, models
+
+
+class BGPSearchFilter(SearchFilter):
+    """Search filter whose predicates can all use database indexes.
+
+    The primary key is only matched, exactly, when the search value is a UUID, rather than with the SearchFilter default
+    text match on `id` that prevents the use of any index for the whole search. Search values that are IP addresses
+    match the host of the IPAddress foreign keys listed in `ip_fields`.
+    """
+
+    default_filter_predicates = {"id": {"lookup_expr": "exact", "preprocessor": uuid.UUID}}
+
+    def __init__(self, *args, ip_fields=(), **kwargs):
+        """Declare the IPAddress fields in addition to the `filter_predicates` of the SearchFilter."""
+        self.ip_fields = ip_fields
+        super().__init__(*args, **kwargs)
+
+    def generate_query(self, value, **kwargs):
+        """Return the SearchFilter query, or-ed with the IP addresses matching `value`."""
+        query = super().generate_query(value, **kwargs)
+        if self.ip_fields and value.strip():
+            try:
+                host = str(netaddr.IPAddress(value.strip().split("/")[0]))
+            except (netaddr.AddrFormatError, ValueError):
+                return query
+            for field in self.ip_fields:
+                query |= Q(**{f"{field}__host": host})
+        return query
+
+
+class ASNSearchFilter(BGPSearchFilter):
+    """Search filter also matching the ASN values designated by the search string, see `helpers.parse_asn_search()`.
+
+    The ASNs are matched with range predicates on `asn_min_field` and `asn_max_field`, which can use their indexes,
+    rather than with a text match on the integer columns. Objects match when their `asn_min_field`-`asn_max_field`
+    range overlaps any of the searched ranges. With `asn_prefixes`, asplain digits also match the ASNs starting
+    with them.
+    """
+
+    def __init__(self, *args, asn_min_field="asn", asn_max_field="asn", asn_prefixes=True, **kwargs):
+        """Declare the ASN fields in addition to the `filter_predicates` of the SearchFilter."""
+        self.asn_min_field = asn_min_field
+        self.asn_max_field = asn_max_field
+        self.asn_prefixes = asn_prefixes
+        super().__init__(*args, **kwargs)
+
+    def generate_query(self, value, **kwargs):
+        """Return the SearchFilter query, or-ed with the ASN ranges matching `value`."""
+        query = super().generate_query(value, **kwargs)
+        for low, high in helpers.parse_asn_search(value, prefixes=self.asn_prefixes):
+            query |= Q(**{f"{self.asn_min_field}__lte": high, f"{self.asn_max_field}__gte": low})
+        return query
 
 
 class AutonomousSystemFilterSet(NautobotFilterSet, StatusModelFilterSetMixin):
     """Filtering of AutonomousSystem records."""
 
-    q = SearchFilter(
+    q = ASNSearchFilter(
         filter_predicates={
-            "asn": "icontains",
             "description": "icontains",
         },
     )
@@ -46,25 +100,29 @@ class AutonomousSystemFilterSet(NautobotFilterSet, StatusModelFilterSetMixin):
         fields = "__all__"
 
     def filter_present_in_asn_range(self, queryset, name, value):  # pylint: disable=unused-argument
-        """Filter Autonomous Systems that are present in any of the given ASN Ranges."""
+        """Filter Autonomous Systems that are present in any of the given ASN Ranges.
+
+        The ranges are merged first, so that nested ranges don't add redundant scans of the ASN index.
+        """
         if not value:
             return queryset
         q_obj = Q()
-        for asn_range in value:
-            q_obj |= Q(asn__gte=asn_range.asn_min, asn__lte=asn_range.asn_max)
+        for asn_min, asn_max in helpers.merge_asn_ranges(value):
+            q_obj |= Q(asn__gte=asn_min, asn__lte=asn_max)
         return queryset.filter(q_obj)
 
 
 class AutonomousSystemRangeFilterSet(NautobotFilterSet):
     """Filtering of AutonomousSystemRange records."""
 
-    q = SearchFilter(
+    q = ASNSearchFilter(
         filter_predicates={
             "name": "icontains",
-            "asn_max": "icontains",
-            "asn_min": "icontains",
             "description": "icontains",
         },
+        asn_min_field="asn_min",
+        asn_max_field="asn_max",
+        asn_prefixes=False,
     )
 
     tenant = NaturalKeyOrPKMultipleChoiceFilter(
@@ -81,10 +139,12 @@ class AutonomousSystemRangeFilterSet(NautobotFilterSet):
 class BGPRoutingInstanceFilterSet(NautobotFilterSet, StatusModelFilterSetMixin):
     """Filtering of BGPRoutingInstance records."""
 
-    q = SearchFilter(
+    q = BGPSearchFilter(
         filter_predicates={
             "device__name": "icontains",
+            "description": "icontains",
         },
+        ip_fields=["router_id"],
     )
 
     autonomous_system = django_filters.ModelMultipleChoiceFilter(
@@ -114,11 +174,12 @@ class BGPRoutingInstanceFilterSet(NautobotFilterSet, StatusModelFilterSetMixin):
 class PeerGroupFilterSet(NautobotFilterSet, RoleModelFilterSetMixin):
     """Filtering of PeerGroup records."""
 
-    q = SearchFilter(
+    q = BGPSearchFilter(
         filter_predicates={
             "name": "icontains",
             "description": "icontains",
         },
+        ip_fields=["source_ip"],
     )
 
     autonomous_system = django_filters.ModelMultipleChoiceFilter(
@@ -158,7 +219,7 @@ class PeerGroupFilterSet(NautobotFilterSet, RoleModelFilterSetMixin):
 class PeerGroupTemplateFilterSet(NautobotFilterSet, RoleModelFilterSetMixin):
     """Filtering of PeerGroupTemplate records."""
 
-    q = SearchFilter(
+    q = BGPSearchFilter(
         filter_predicates={
             "name": "icontains",
             "description": "icontains",
@@ -180,11 +241,12 @@ class PeerGroupTemplateFilterSet(NautobotFilterSet, RoleModelFilterSetMixin):
 class PeerEndpointFilterSet(NautobotFilterSet, RoleModelFilterSetMixin):
     """Filtering of PeerEndpoint records."""
 
-    q = SearchFilter(
+    q = BGPSearchFilter(
         filter_predicates={
             "routing_instance__device__name": "icontains",
             "description": "icontains",
         },
+        ip_fields=["source_ip"],
     )
 
     # TODO: Remove this filter. Deprecated in favor of below NaturalKeyOrPKMultipleChoiceFilter `device`
@@ -226,7 +288,7 @@ class PeeringFilterSet(StatusModelFilterSetMixin, NautobotFilterSet):
     # TODO(mzb): Add in-memory filtering for Provider, ASN, IP Address, ...
     #  this requires to consider inheritance methods.
 
-    q = SearchFilter(
+    q = BGPSearchFilter(
         filter_predicates={
             "endpoints__routing_instance__device__name": "icontains",
         },
@@ -269,7 +331,7 @@ class PeeringFilterSet(StatusModelFilterSetMixin, NautobotFilterSet):
 class AddressFamilyFilterSet(NautobotFilterSet):
     """Filtering of AddressFamily records."""
 
-    q = SearchFilter(
+    q = BGPSearchFilter(
         filter_predicates={
             "routing_instance__device__name": "icontains",
         },
@@ -298,7 +360,7 @@ class AddressFamilyFilterSet(NautobotFilterSet):
 class PeerGroupAddressFamilyFilterSet(NautobotFilterSet):
     """Filtering of PeerGroupAddressFamily records."""
 
-    q = SearchFilter(
+    q = BGPSearchFilter(
         filter_predicates={
             "afi_safi": "icontains",
             "peer_group__name": "icontains",
@@ -322,7 +384,7 @@ class PeerGroupAddressFamilyFilterSet(NautobotFilterSet):
 class PeerEndpointAddressFamilyFilterSet(NautobotFilterSet):
     """Filtering of PeerEndpointAddressFamily records."""
 
-    q = SearchFilter(
+    q = BGPSearchFilter(
         filter_predicates={
             "afi_safi": "icontains",
             "peer_endpoint__routing_instance__device__name": "icontains",
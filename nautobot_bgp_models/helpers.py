@@ -1,5 +1,37 @@
 """BGP helper functions."""
 
+from collections import OrderedDict
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import (
+    BooleanField,
+    Case,
+    CharField,
+    Count,
+    Exists,
+    F,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    TextField,
+    UUIDField,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
+from nautobot.apps.utils import deepmerge
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.models import ObjectChange
+from nautobot.ipam.constants import BGP_ASN_MAX, BGP_ASN_MIN
+from nautobot.ipam.models import VRF, IPAddress, IPAddressToInterface
+from netutils.asn import asn_to_int
+
+from nautobot_bgp_models import models
+
 
 def add_available_asns(instance, asns):
     """Create fake records for all gaps between used Autonomous Systems."""
@@ -28,3 +60,551 @@ def add_available_asns(instance, asns):
         new_list.append({"asn": last_asn + 1, "available": instance.asn_max - last_asn})
 
     return new_list
+
+
+def _is_digits(value):
+    """Whether `value` only has ASCII digits, unlike `str.isdigit()` which also accepts digits such as "²"."""
+    return value.isascii() and value.isdigit()
+
+
+def _parse_asn(value):
+    """Convert an asplain or asdot ASN to an integer, raising ValueError if it is not a valid 32-bit ASN."""
+    high, dot, low = value.partition(".")
+    if not _is_digits(high) or (dot and not _is_digits(low)) or (dot and max(int(high), int(low)) > 0xFFFF):
+        raise ValueError(value)
+    asn = asn_to_int(value)
+    if not BGP_ASN_MIN <= asn <= BGP_ASN_MAX:
+        raise ValueError(value)
+    return asn
+
+
+def parse_asn_search(value, prefixes=True):
+    """Parse a search string into the ASN ranges it designates, so that it can be matched with indexed predicates.
+
+    Supported values, optionally prefixed with "AS":
+
+    - an asdot ASN, "65000.10", matching this ASN only,
+    - a range of asplain or asdot ASNs, "64512-65534",
+    - asplain digits, "6500", matching the ASNs starting with these digits: 6500, 65000-65009, 650000-650099, etc.
+
+    Args:
+        value (str): the search string.
+        prefixes (bool): whether asplain digits match the ASNs starting with them, or only this exact ASN.
+
+    Returns:
+        (list[tuple[int, int]]): inclusive (lowest, highest) ASN ranges, empty if `value` is not an ASN search.
+    """
+    value = value.strip()
+    if value[:2].upper() == "AS":
+        value = value[2:].strip()
+
+    try:
+        if "-" in value:
+            low, high = (_parse_asn(part.strip()) for part in value.split("-", 1))
+            return [(low, high)] if low <= high else []
+        if "." in value:
+            asn = _parse_asn(value)
+            return [(asn, asn)]
+    except ValueError:
+        return []
+
+    if not _is_digits(value) or value.startswith("0"):
+        return []
+    if not prefixes:
+        return [(int(value), int(value))] if BGP_ASN_MIN <= int(value) <= BGP_ASN_MAX else []
+    ranges = []
+    low, high = int(value), int(value)
+    while low <= BGP_ASN_MAX:
+        ranges.append((max(low, BGP_ASN_MIN), min(high, BGP_ASN_MAX)))
+        low, high = low * 10, high * 10 + 9
+    return ranges
+
+
+def merge_asn_ranges(asn_ranges):
+    """Merge ASN ranges into the sorted, disjoint ranges covering the same ASNs.
+
+    Args:
+        asn_ranges (iterable): AutonomousSystemRange records or (asn_min, asn_max) tuples.
+
+    Returns:
+        (list[tuple[int, int]]): inclusive (asn_min, asn_max) ranges, nested, overlapping and adjacent ranges merged.
+    """
+    bounds = sorted(
+        (asn_range.asn_min, asn_range.asn_max) if isinstance(asn_range, models.AutonomousSystemRange) else asn_range
+        for asn_range in asn_ranges
+    )
+    merged = []
+    for asn_min, asn_max in bounds:
+        if merged and asn_min <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], asn_max))
+        else:
+            merged.append((asn_min, asn_max))
+    return merged
+
+
+def _resolve_field(model, lookup):
+    """Return the model field at the end of a `__`-separated `lookup`, raising FieldDoesNotExist if invalid."""
+    *relations, field_name = lookup.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+        if model is None:
+            raise FieldDoesNotExist(lookup)
+    return model._meta.get_field(field_name)
+
+
+def inherited_field_expression(model, field_name):
+    """Build a database expression computing `InheritanceMixin.get_inherited_field()` for every row at once.
+
+    The expression follows `model.property_inheritance[field_name]` with a COALESCE, mapping the values that
+    `get_inherited_field()` treats as unset (empty strings and False) to NULL so that they fall through to the next
+    inheritance level the same way. Inheritance paths that do not resolve to a database field are skipped.
+
+    Args:
+        model (Model): model class using `InheritanceMixin`.
+        field_name (str): name of the inheritable field.
+
+    Returns:
+        (Expression): expression usable in `annotate()`, `alias()` or `filter()` on a `model` queryset.
+    """
+    lookups = [field_name]
+    lookups.extend(
+        f"{path_element}.{field_name}".replace(".", "__")
+        for path_element in model.property_inheritance.get(field_name, [])
+    )
+
+    expressions = []
+    for lookup in lookups:
+        try:
+            field = _resolve_field(model, lookup)
+        except FieldDoesNotExist:
+            continue
+        if isinstance(field, BooleanField):
+            expressions.append(NullIf(F(lookup), Value(False)))
+        elif isinstance(field, (CharField, TextField)):
+            expressions.append(NullIf(F(lookup), Value("")))
+        else:
+            expressions.append(F(lookup))
+
+    if len(expressions) == 1:
+        return expressions[0]
+    return Coalesce(*expressions)
+
+
+def alias_local_ip(queryset, name="local_ip"):
+    """Add the effective local IP address of each PeerEndpoint of `queryset` as the `name` alias.
+
+    This is the set-based equivalent of `PeerEndpoint.get_local_ip_address()`: the inherited `source_ip`, else the
+    only IP address of the inherited `source_interface`, else NULL.
+
+    Args:
+        queryset (QuerySet[PeerEndpoint]): endpoints to annotate.
+        name (str): name of the alias holding the IPAddress primary key.
+
+    Returns:
+        (QuerySet[PeerEndpoint]): `queryset` with the `name`, `{name}_interface` and `{name}_interface_ip_count`
+            aliases.
+    """
+    interface_alias = f"{name}_interface"
+    count_alias = f"{name}_interface_ip_count"
+    interface_ips = IPAddressToInterface.objects.filter(interface=OuterRef(interface_alias)).order_by()
+    return (
+        queryset.alias(**{interface_alias: inherited_field_expression(models.PeerEndpoint, "source_interface")})
+        .alias(**{count_alias: Subquery(interface_ips.values("interface").annotate(count=Count("pk")).values("count"))})
+        .alias(
+            **{
+                name: Coalesce(
+                    inherited_field_expression(models.PeerEndpoint, "source_ip"),
+                    Case(When(**{count_alias: 1}, then=Subquery(interface_ips.values("ip_address")[:1]))),
+                    output_field=UUIDField(),
+                )
+            }
+        )
+    )
+
+
+def annotate_endpoint_summary(queryset):
+    """Annotate the PeerEndpoints of `queryset` with the values summarizing their side of a session, in one query.
+
+    Args:
+        queryset (QuerySet[PeerEndpoint]): endpoints to annotate.
+
+    Returns:
+        (QuerySet[PeerEndpoint]): `queryset` with the `device_name`, `peer_group_name`, `local_ip_host`,
+            `local_ip_mask_length` and `asn` annotations, the latter three being the effective values.
+    """
+    local_ip = IPAddress.objects.filter(pk=OuterRef("local_ip")).order_by()
+    asn = models.AutonomousSystem.objects.filter(pk=OuterRef("effective_autonomous_system")).order_by()
+    return (
+        alias_local_ip(queryset)
+        .alias(effective_autonomous_system=inherited_field_expression(models.PeerEndpoint, "autonomous_system"))
+        .annotate(
+            device_name=F("routing_instance__device__name"),
+            peer_group_name=F("peer_group__name"),
+            local_ip_host=Subquery(local_ip.values("host")[:1]),
+            local_ip_mask_length=Subquery(local_ip.values("mask_length")[:1]),
+            asn=Subquery(asn.values("asn")[:1]),
+        )
+    )
+
+
+def prefetch_displayed_endpoints(lookup="endpoints"):
+    """Prefetch the summaries of the PeerEndpoints of the Peerings reached through `lookup`, for `format_peering()`.
+
+    Args:
+        lookup (str): lookup of the Peerings' `endpoints`, e.g. "peering__endpoints" from PeerEndpoints.
+
+    Returns:
+        (Prefetch): prefetch of all the endpoints, regardless of permissions as for `str()`, as `displayed_endpoints`.
+    """
+    endpoints = models.PeerEndpoint.objects.only("pk", "peering", "routing_instance").order_by("pk")
+    return Prefetch(lookup, queryset=annotate_endpoint_summary(endpoints), to_attr="displayed_endpoints")
+
+
+def format_endpoint_summary(endpoint):
+    """String representation of a PeerEndpoint annotated by `annotate_endpoint_summary()`, as `str()` gives it."""
+    if endpoint is None:
+        return "None"
+    local_ip = f"{endpoint.local_ip_host}/{endpoint.local_ip_mask_length}" if endpoint.local_ip_host else None
+    asn = f"AS {endpoint.asn}" if endpoint.asn is not None else None
+    if endpoint.device_name:
+        return f"{endpoint.device_name} {local_ip} ({asn})"
+    return f"{local_ip} ({asn})"
+
+
+def format_peering(peering):
+    """String representation of a Peering, from its `displayed_endpoints` when prefetched, else from `str()`."""
+    endpoints = getattr(peering, "displayed_endpoints", None)
+    # Devices without a name are displayed from their type or virtual chassis, left to `str()`.
+    if endpoints is None or any(
+        endpoint.routing_instance_id and endpoint.device_name is None for endpoint in endpoints
+    ):
+        return str(peering)
+    sides = [*endpoints[:2], None, None][:2]
+    return " ↔︎ ".join(format_endpoint_summary(endpoint) for endpoint in sides)
+
+
+def _first_set(*values):
+    """First of the `values` that `get_inherited_field()` treats as set, or None."""
+    return next((value for value in values if value), None)
+
+
+def _merge_extra_attributes(*layers):
+    """Deep-merge the extra attributes `layers`, from the lowest to the highest precedence."""
+    data = OrderedDict()
+    for extra_attributes in layers:
+        if extra_attributes:
+            data = deepmerge(data, extra_attributes)
+    return data
+
+
+def _resolve_peer_endpoint_address_families(queryset):
+    """Inherited values of the PeerEndpointAddressFamilies of `queryset`, from their parents looked up in bulk."""
+    fields = list(models.PeerEndpointAddressFamily.property_inheritance)
+    rows = list(
+        queryset.values_list(
+            "pk",
+            "afi_safi",
+            "peer_endpoint",
+            "peer_endpoint__peer_group",
+            "peer_endpoint__routing_instance",
+            *fields,
+            "extra_attributes",
+        )
+    )
+
+    # parent_peer_group_address_family: the address family of the Peer Group of the endpoint
+    peer_group_afs = {
+        (peer_group, afi_safi): values
+        for peer_group, afi_safi, *values in models.PeerGroupAddressFamily.objects.filter(
+            peer_group__in={row[3] for row in rows if row[3]}
+        ).values_list("peer_group", "afi_safi", *fields, "extra_attributes")
+    }
+
+    # parent_address_family: the address family of the Routing Instance of the endpoint, in the first VRF of the
+    # parent Prefix of the effective local IP address of the endpoint
+    local_ips = dict(
+        alias_local_ip(models.PeerEndpoint.objects.filter(pk__in={row[2] for row in rows if row[4]})).values_list(
+            "pk", F("local_ip")
+        )
+    )
+    prefixes = dict(
+        IPAddress.objects.filter(pk__in={ip for ip in local_ips.values() if ip}).values_list("pk", "parent")
+    )
+    prefix_vrfs = {}
+    for prefix, vrf in VRF.objects.filter(prefixes__in={prefix for prefix in prefixes.values() if prefix}).values_list(
+        "prefixes", "pk"
+    ):
+        prefix_vrfs.setdefault(prefix, vrf)
+    address_families = {
+        (routing_instance, vrf, afi_safi): extra_attributes
+        for routing_instance, vrf, afi_safi, extra_attributes in models.AddressFamily.objects.filter(
+            routing_instance__in={row[4] for row in rows if row[4]}
+        ).values_list("routing_instance", "vrf", "afi_safi", "extra_attributes")
+    }
+
+    resolved = {}
+    no_parent = (None,) * (len(fields) + 1)
+    for pk, afi_safi, peer_endpoint, peer_group, routing_instance, *values in rows:
+        *local_values, extra_attributes = values
+        *parent_values, parent_extra_attributes = peer_group_afs.get((peer_group, afi_safi), no_parent)
+        prefix = prefixes.get(local_ips.get(peer_endpoint))
+        address_family_extra_attributes = (
+            address_families.get((routing_instance, prefix_vrfs.get(prefix), afi_safi)) if prefix else None
+        )
+        resolved[pk] = {
+            **{
+                field: _first_set(local_value, parent_value)
+                for field, local_value, parent_value in zip(fields, local_values, parent_values)
+            },
+            "extra_attributes": _merge_extra_attributes(
+                parent_extra_attributes, address_family_extra_attributes, extra_attributes
+            ),
+        }
+    return resolved
+
+
+def resolve_inherited(queryset):
+    """Resolve the inherited values and extra attributes of the records of `queryset` in bulk.
+
+    This is the set-based equivalent of `get_inherited_field()`, for each field of the `property_inheritance` of the
+    model, and of `extra_attributes_inherited`. It costs a single query for PeerGroups and PeerEndpoints, and a few for
+    PeerEndpointAddressFamilies, whose parents are looked up by AFI-SAFI.
+
+    Args:
+        queryset (QuerySet): PeerGroups, PeerEndpoints or PeerEndpointAddressFamilies to resolve.
+
+    Returns:
+        (dict): {primary key: {field name: effective value}}, including the merged `extra_attributes`. The related
+            objects are given by primary key.
+    """
+    model = queryset.model
+    if model is models.PeerEndpointAddressFamily:
+        return _resolve_peer_endpoint_address_families(queryset)
+
+    fields = list(model.property_inheritance)
+    paths = [f"{path}.extra_attributes".replace(".", "__") for path in model.extra_attributes_inheritance]
+    rows = queryset.values_list(
+        "pk",
+        *(inherited_field_expression(model, field) for field in fields),
+        *paths,
+        "extra_attributes",
+    )
+    return {
+        pk: {
+            **dict(zip(fields, values[: len(fields)])),
+            "extra_attributes": _merge_extra_attributes(*values[len(fields) :]),
+        }
+        for pk, *values in rows
+    }
+
+
+def instantiate_peer_group_templates(peergroup_templates, routing_instances, batch_size=1000):
+    """Create a global-VRF PeerGroup from each PeerGroupTemplate on each BGPRoutingInstance.
+
+    (name, routing_instance, vrf=None) combinations that already exist are skipped. Missing combinations are
+    found with a single NOT EXISTS query over `routing_instances` and the new PeerGroups are written with one
+    `bulk_create()` per batch of `batch_size` objects.
+
+    Note that `bulk_create()` bypasses `save()`, so no change log entries are recorded for the new PeerGroups.
+
+    Args:
+        peergroup_templates (Iterable[PeerGroupTemplate]): templates to instantiate.
+        routing_instances (QuerySet[BGPRoutingInstance]): routing instances to instantiate the templates on.
+        batch_size (int): maximum number of PeerGroups per `bulk_create()` call.
+
+    Returns:
+        (list[PeerGroup]): the newly created PeerGroups.
+    """
+    peergroup_templates = list(peergroup_templates)
+    if not peergroup_templates:
+        return []
+
+    # One boolean per template telling whether a PeerGroup with the template's name already exists.
+    exists_annotations = {
+        f"has_template_{index}": Exists(
+            models.PeerGroup.objects.filter(routing_instance=OuterRef("pk"), name=template.name, vrf__isnull=True)
+        )
+        for index, template in enumerate(peergroup_templates)
+    }
+    missing_filter = Q()
+    for annotation in exists_annotations:
+        missing_filter |= Q(**{annotation: False})
+
+    rows = (
+        routing_instances.order_by()
+        .annotate(**exists_annotations)
+        .filter(missing_filter)
+        .values_list("pk", *exists_annotations)
+    )
+
+    created = []
+    batch = []
+    with transaction.atomic():
+        for routing_instance_id, *template_exists in rows:
+            for template, exists in zip(peergroup_templates, template_exists):
+                if exists:
+                    continue
+                batch.append(
+                    models.PeerGroup(
+                        name=template.name,
+                        peergroup_template=template,
+                        routing_instance_id=routing_instance_id,
+                    )
+                )
+                if len(batch) >= batch_size:
+                    created.extend(models.PeerGroup.objects.bulk_create(batch))
+                    batch = []
+        if batch:
+            created.extend(models.PeerGroup.objects.bulk_create(batch))
+
+    return created
+
+
+def get_peer_inconsistencies():
+    """Find PeerEndpoint `peer` pointers that do not match the endpoints of their Peering.
+
+    All checks are expressed as set-based queries, independently of the number of Peerings.
+
+    Returns:
+        (dict): with the following keys:
+            `invalid_peerings`: `{peering_pk: endpoint_count}` for Peerings without exactly two endpoints.
+            `foreign_peers`: `{endpoint_pk: peer_pk}` for endpoints pointing at themselves or at an endpoint of
+                another Peering.
+            `mismatched_peers`: `{endpoint_pk: expected_peer_pk}` for endpoints of two-endpoint Peerings whose `peer`
+                is missing or is not the other endpoint of the Peering.
+    """
+    peerings = models.Peering.objects.annotate(endpoint_count=Count("endpoints"))
+    invalid_peerings = dict(peerings.exclude(endpoint_count=2).values_list("pk", "endpoint_count"))
+
+    foreign_peers = dict(
+        models.PeerEndpoint.objects.filter(peer__isnull=False)
+        .filter(~Q(peer__peering=F("peering")) | Q(peer=F("pk")))
+        .values_list("pk", "peer")
+    )
+
+    other_endpoint = models.PeerEndpoint.objects.filter(peering=OuterRef("peering")).exclude(pk=OuterRef("pk"))
+    mismatched_peers = dict(
+        models.PeerEndpoint.objects.filter(peering__in=peerings.filter(endpoint_count=2).values("pk"))
+        .annotate(expected_peer=Subquery(other_endpoint.values("pk")[:1]))
+        .filter(Q(peer__isnull=True) | ~Q(peer=F("expected_peer")))
+        .values_list("pk", "expected_peer")
+    )
+
+    return {
+        "invalid_peerings": invalid_peerings,
+        "foreign_peers": foreign_peers,
+        "mismatched_peers": mismatched_peers,
+    }
+
+
+def repair_peer_pointers(inconsistencies=None, batch_size=1000):
+    """Fix the PeerEndpoint `peer` pointers reported by `get_peer_inconsistencies()` with bulk updates.
+
+    Endpoints of two-endpoint Peerings are pointed at each other. Pointers to endpoints of another Peering that
+    cannot be fixed that way (Peerings with one or more than two endpoints) are cleared.
+
+    Args:
+        inconsistencies (dict): result of `get_peer_inconsistencies()`, computed when not given.
+        batch_size (int): maximum number of endpoints per UPDATE query.
+
+    Returns:
+        (int): number of updated PeerEndpoints.
+    """
+    if inconsistencies is None:
+        inconsistencies = get_peer_inconsistencies()
+
+    new_peers = {pk: None for pk in inconsistencies["foreign_peers"]}
+    new_peers.update(inconsistencies["mismatched_peers"])
+
+    now = timezone.now()
+    endpoints = [models.PeerEndpoint(pk=pk, peer_id=peer_id, last_updated=now) for pk, peer_id in new_peers.items()]
+    with transaction.atomic():
+        models.PeerEndpoint.objects.bulk_update(endpoints, ["peer", "last_updated"], batch_size=batch_size)
+
+    return len(endpoints)
+
+
+CHANGE_FEED_MODELS = (
+    models.AutonomousSystem,
+    models.AutonomousSystemRange,
+    models.BGPRoutingInstance,
+    models.PeerGroupTemplate,
+    models.PeerGroup,
+    models.PeerEndpoint,
+    models.Peering,
+    models.AddressFamily,
+    models.PeerGroupAddressFamily,
+    models.PeerEndpointAddressFamily,
+)
+
+
+def get_changes_since(since, user):
+    """BGP records changed since the `since` watermark, directly or through the inheritance of their values.
+
+    The directly modified records are found by their `last_updated` timestamp and the deleted records in the change
+    log, with indexed queries. The Peer Groups and Peer Endpoints whose effective values may have changed are those
+    inheriting from a modified Peer Group Template, BGP Routing Instance or Peer Group, looked up by foreign key.
+
+    Args:
+        since (datetime): watermark, usually the `watermark` returned by the previous call.
+        user (User): user whose "view" permissions restrict the returned records.
+
+    Returns:
+        (dict): {"watermark": time of the computation, to pass to the next call,
+            "modified": {object type: [pk]}, "deleted": {object type: [pk]}, "inherited": {object type: [pk]}}.
+    """
+    watermark = timezone.now()
+
+    modified = {
+        model: set(model.objects.restrict(user, "view").filter(last_updated__gte=since).values_list("pk", flat=True))
+        for model in CHANGE_FEED_MODELS
+    }
+    # The ancestors are looked up regardless of the permissions, as they change the values of permitted descendants.
+    templates = set(models.PeerGroupTemplate.objects.filter(last_updated__gte=since).values_list("pk", flat=True))
+    routing_instances = set(
+        models.BGPRoutingInstance.objects.filter(last_updated__gte=since).values_list("pk", flat=True)
+    )
+    peer_groups = set(models.PeerGroup.objects.filter(last_updated__gte=since).values_list("pk", flat=True))
+    inheriting_peer_groups = set(
+        models.PeerGroup.objects.filter(
+            Q(peergroup_template__in=templates) | Q(routing_instance__in=routing_instances)
+        ).values_list("pk", flat=True)
+    )
+
+    inherited = {
+        models.PeerGroup: set(
+            models.PeerGroup.objects.restrict(user, "view")
+            .filter(pk__in=inheriting_peer_groups - modified[models.PeerGroup])
+            .values_list("pk", flat=True)
+        ),
+        models.PeerEndpoint: set(
+            models.PeerEndpoint.objects.restrict(user, "view")
+            .filter(Q(peer_group__in=peer_groups | inheriting_peer_groups) | Q(routing_instance__in=routing_instances))
+            .exclude(pk__in=modified[models.PeerEndpoint])
+            .values_list("pk", flat=True)
+        ),
+    }
+
+    content_types = ContentType.objects.get_for_models(*CHANGE_FEED_MODELS)
+    models_by_content_type = {content_type.pk: model for model, content_type in content_types.items()}
+    deleted = {model: set() for model in CHANGE_FEED_MODELS}
+    for content_type_id, pk in (
+        ObjectChange.objects.restrict(user, "view")
+        .filter(
+            time__gte=since,
+            action=ObjectChangeActionChoices.ACTION_DELETE,
+            changed_object_type__in=content_types.values(),
+        )
+        .values_list("changed_object_type", "changed_object_id")
+    ):
+        deleted[models_by_content_type[content_type_id]].add(pk)
+
+    def by_object_type(pks_by_model):
+        return {model._meta.label_lower: sorted(pks, key=str) for model, pks in pks_by_model.items()}
+
+    return {
+        "watermark": watermark,
+        "modified": by_object_type(modified),
+        "deleted": by_object_type(deleted),
+        "inherited": by_object_type(inherited),
+    }
@@ -0,0 +1,188 @@
+"""Per-request instrumentation of the BGP Models app hot paths.
+
+The operations decorated with `instrumented()` are counted and timed for the duration of each request processed by
+`BGPInstrumentationMiddleware`, together with the SQL queries of the requests routed to this app's views. The totals are
+exported as Prometheus histograms through the Nautobot `/metrics` endpoint and optionally returned in a `Server-Timing`
+response header.
+"""
+
+import functools
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from prometheus_client import Histogram
+
+# Operation name: description used in the Server-Timing header.
+OPERATIONS = {
+    "inheritance": "Inherited field resolutions",
+    "extra_attributes": "Extra attributes merges",
+    "serializer": "REST API serializations",
+    "asn_allocation": "ASN allocations",
+}
+
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+REQUEST_OPERATIONS = Histogram(
+    "nautobot_bgp_models_request_operations",
+    "Number of BGP operations per request.",
+    ["view", "operation"],
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_OPERATION_SECONDS = Histogram(
+    "nautobot_bgp_models_request_operation_seconds",
+    "Time spent in BGP operations per request.",
+    ["view", "operation"],
+)
+REQUEST_QUERIES = Histogram(
+    "nautobot_bgp_models_request_queries",
+    "Number of SQL queries per BGP request.",
+    ["view"],
+    buckets=COUNT_BUCKETS,
+)
+REQUEST_QUERY_SECONDS = Histogram(
+    "nautobot_bgp_models_request_query_seconds",
+    "Time spent in SQL queries per BGP request.",
+    ["view"],
+)
+
+_request_metrics = ContextVar("nautobot_bgp_models_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Counts and cumulated durations of the BGP operations and SQL queries of one request."""
+
+    def __init__(self):
+        """Start from zero."""
+        self.counts = dict.fromkeys(OPERATIONS, 0)
+        self.seconds = dict.fromkeys(OPERATIONS, 0.0)
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.counting_queries = False
+        self.active = set()
+        self.stack = None
+
+    def count_queries(self):
+        """Count and time the SQL queries from now on, until the end of the collection."""
+        if not self.counting_queries:
+            for connection in connections.all():
+                self.stack.enter_context(connection.execute_wrapper(self))
+            self.counting_queries = True
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper counting and timing the queries."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_seconds += time.perf_counter() - start
+            self.queries += 1
+
+    def server_timing(self):
+        """Value of the Server-Timing header, durations in milliseconds."""
+        entries = [
+            f'bgp-{operation.replace("_", "-")};dur={self.seconds[operation] * 1000:.3f};'
+            f'desc="{description}: {self.counts[operation]}"'
+            for operation, description in OPERATIONS.items()
+            if self.counts[operation]
+        ]
+        if self.counting_queries:
+            entries.append(f'db;dur={self.query_seconds * 1000:.3f};desc="SQL queries: {self.queries}"')
+        return ", ".join(entries)
+
+    def export(self, view):
+        """Observe the request totals in the Prometheus histograms."""
+        for operation in OPERATIONS:
+            REQUEST_OPERATIONS.labels(view, operation).observe(self.counts[operation])
+            REQUEST_OPERATION_SECONDS.labels(view, operation).observe(self.seconds[operation])
+        if self.counting_queries:
+            REQUEST_QUERIES.labels(view).observe(self.queries)
+            REQUEST_QUERY_SECONDS.labels(view).observe(self.query_seconds)
+
+
+@contextmanager
+def collect_request_metrics(count_queries=True):
+    """Context manager measuring the BGP operations of the enclosed code in a new RequestMetrics.
+
+    The SQL queries are measured too with `count_queries`, or from the call of `RequestMetrics.count_queries()` on.
+    """
+    metrics = RequestMetrics()
+    token = _request_metrics.set(metrics)
+    try:
+        with ExitStack() as metrics.stack:
+            if count_queries:
+                metrics.count_queries()
+            yield metrics
+    finally:
+        _request_metrics.reset(token)
+
+
+def instrumented(operation):
+    """Decorator counting and timing the calls of a function as `operation` in the current request.
+
+    Nested calls of the same operation, such as `to_representation()` going through several serializer mixins,
+    are measured once. Outside of an instrumented request, the function is called directly.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _request_metrics.get()
+            if metrics is None or operation in metrics.active:
+                return func(*args, **kwargs)
+            metrics.active.add(operation)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.seconds[operation] += time.perf_counter() - start
+                metrics.counts[operation] += 1
+                metrics.active.discard(operation)
+
+        return wrapper
+
+    return decorator
+
+
+def _is_bgp_view(request):
+    """Whether the request was routed to a view of this app."""
+    resolver_match = getattr(request, "resolver_match", None)
+    return resolver_match is not None and any(
+        namespace.startswith("nautobot_bgp_models") for namespace in resolver_match.namespaces
+    )
+
+
+class BGPInstrumentationMiddleware:
+    """Measure the BGP operations and SQL queries of each request.
+
+    The metrics are exported for the requests to this app's views and for any other request running BGP operations.
+    The database execute wrapper counting the SQL queries is only installed once the request is routed to a view of this
+    app, the SQL queries of the other requests are not measured.
+    """
+
+    def __init__(self, get_response):
+        """Middleware initialization."""
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Process the request within a new RequestMetrics context."""
+        app_settings = settings.PLUGINS_CONFIG.get("nautobot_bgp_models", {})
+        if not app_settings.get("instrumentation", False):
+            return self.get_response(request)
+
+        with collect_request_metrics(count_queries=False) as metrics:
+            response = self.get_response(request)
+
+        if _is_bgp_view(request) or any(metrics.counts.values()):
+            metrics.export(request.resolver_match.view_name if request.resolver_match else "")
+            if app_settings.get("server_timing_header", False):
+                response["Server-Timing"] = metrics.server_timing()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        """Count the SQL queries of the requests routed to this app's views."""
+        metrics = _request_metrics.get()
+        if metrics is not None and _is_bgp_view(request):
+            metrics.count_queries()
@@ -0,0 +1,245 @@
+"""Jobs for nautobot_bgp_models."""
+
+import io
+
+from nautobot.apps.jobs import ChoiceVar, DryRunVar, IntegerVar, Job, MultiChoiceVar, MultiObjectVar, register_jobs
+from nautobot.dcim.models import Device, Location
+from nautobot.extras.models import Role, Status
+
+from nautobot_bgp_models import audit, export, helpers, models, reports
+
+name = "BGP Models"  # pylint: disable=invalid-name
+
+
+class InstantiatePeerGroupTemplates(Job):
+    """Create Peer Groups from Peer Group Templates on many BGP Routing Instances at once."""
+
+    peergroup_templates = MultiObjectVar(
+        model=models.PeerGroupTemplate,
+        label="Peer Group Templates",
+        description="Templates to instantiate as Peer Groups.",
+    )
+    routing_instances = MultiObjectVar(
+        model=models.BGPRoutingInstance,
+        required=False,
+        label="BGP Routing Instances",
+    )
+    devices = MultiObjectVar(model=Device, required=False)
+    device_roles = MultiObjectVar(
+        model=Role,
+        required=False,
+        query_params={"content_types": "dcim.device"},
+    )
+    locations = MultiObjectVar(model=Location, required=False)
+    autonomous_systems = MultiObjectVar(model=models.AutonomousSystem, required=False)
+    statuses = MultiObjectVar(
+        model=Status,
+        required=False,
+        query_params={"content_types": "nautobot_bgp_models.bgproutinginstance"},
+    )
+    batch_size = IntegerVar(default=1000, min_value=1, description="Number of Peer Groups created per query.")
+
+    class Meta:
+        name = "Instantiate Peer Group Templates"
+        description = (
+            "Create a Peer Group from each selected template on every BGP Routing Instance matching the filters. "
+            "All Routing Instances are selected when no filter is given. Existing Peer Groups are left untouched."
+        )
+        has_sensitive_variables = False
+
+    def run(  # pylint: disable=arguments-differ, too-many-arguments
+        self,
+        *,
+        peergroup_templates,
+        routing_instances=None,
+        devices=None,
+        device_roles=None,
+        locations=None,
+        autonomous_systems=None,
+        statuses=None,
+        batch_size=1000,
+    ):
+        """Instantiate the templates on the filtered routing instances."""
+        queryset = models.BGPRoutingInstance.objects.restrict(self.user, "view")
+        if routing_instances:
+            queryset = queryset.filter(pk__in=routing_instances)
+        if devices:
+            queryset = queryset.filter(device__in=devices)
+        if device_roles:
+            queryset = queryset.filter(device__role__in=device_roles)
+        if locations:
+            queryset = queryset.filter(device__location__in=locations)
+        if autonomous_systems:
+            queryset = queryset.filter(autonomous_system__in=autonomous_systems)
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+
+        created = helpers.instantiate_peer_group_templates(peergroup_templates, queryset, batch_size=batch_size)
+        self.logger.info("Created %d Peer Groups from %d templates.", len(created), len(peergroup_templates))
+        return {"created": len(created)}
+
+
+class RepairPeerEndpointPeers(Job):
+    """Find and fix inconsistent reciprocal `peer` pointers between BGP Peer Endpoints."""
+
+    dryrun = DryRunVar(description="Only report the inconsistencies, do not fix them.")
+    batch_size = IntegerVar(default=1000, min_value=1, description="Number of Peer Endpoints updated per query.")
+
+    class Meta:
+        name = "Repair Peer Endpoint Peers"
+        description = (
+            "Report Peerings without exactly two Peer Endpoints and Peer Endpoints whose peer is missing, "
+            "asymmetric or part of another Peering, then point the endpoints of each Peering at each other."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, dryrun=False, batch_size=1000):  # pylint: disable=arguments-differ
+        """Report and repair the peer pointers."""
+        inconsistencies = helpers.get_peer_inconsistencies()
+
+        for peering_pk, endpoint_count in inconsistencies["invalid_peerings"].items():
+            self.logger.warning("Peering %s has %d Peer Endpoint(s), expected 2.", peering_pk, endpoint_count)
+        self.logger.info(
+            "Found %d Peer Endpoint(s) pointing outside of their Peering and %d with a missing or mismatched peer.",
+            len(inconsistencies["foreign_peers"]),
+            len(inconsistencies["mismatched_peers"]),
+        )
+
+        updated = 0
+        if not dryrun:
+            updated = helpers.repair_peer_pointers(inconsistencies, batch_size=batch_size)
+            self.logger.info("Updated %d Peer Endpoint(s).", updated)
+
+        return {
+            "invalid_peerings": len(inconsistencies["invalid_peerings"]),
+            "foreign_peers": len(inconsistencies["foreign_peers"]),
+            "mismatched_peers": len(inconsistencies["mismatched_peers"]),
+            "updated": updated,
+        }
+
+
+class AuditBGPModels(Job):
+    """Check all BGP objects against the validation rules of the models and report the offending objects."""
+
+    checks = MultiChoiceVar(
+        choices=[(check, check.replace("_", " ").capitalize()) for check in audit.CHECKS],
+        required=False,
+        description="Checks to run, all of them when none is selected.",
+    )
+    output_format = ChoiceVar(choices=[("json", "JSON"), ("csv", "CSV")], default="json", label="Report format")
+
+    class Meta:
+        name = "Audit BGP Models"
+        description = (
+            "Report Peer Endpoints without ASN or local IP, local IPs not on the routing instance's device, "
+            "VRF mismatches between Peer Groups, source IPs and source interfaces, and Peerings between the "
+            "same routing instance or IP. The report is attached to the Job Result as a JSON or CSV file."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, checks=None, output_format="json"):  # pylint: disable=arguments-differ
+        """Run the audit and store the report."""
+        findings = audit.run_audit(checks, using=reports.get_reporting_database())
+
+        summary = {check: 0 for check in checks or audit.CHECKS}
+        for finding in findings:
+            summary[finding["check"]] += 1
+        for check, count in summary.items():
+            if count:
+                self.logger.warning("%s: %d object(s) failed the check.", check, count)
+
+        self.create_file(f"bgp-audit.{output_format}", audit.render_report(findings, output_format))
+        return summary
+
+
+class ExportBGPSessions(Job):
+    """Export the BGP sessions with the effective values of both endpoints to a Parquet or Arrow file."""
+
+    output_format = ChoiceVar(
+        choices=[(output_format, output_format.capitalize()) for output_format in export.EXPORT_FORMATS],
+        default="parquet",
+        label="File format",
+    )
+    batch_size = IntegerVar(default=50000, min_value=1, description="Number of Peerings loaded per batch.")
+
+    class Meta:
+        name = "Export BGP Sessions"
+        description = (
+            "Export every Peering with the status and the effective device, local IP, ASN, Peer Group, role and "
+            "address families of both of its endpoints. The file is attached to the Job Result. "
+            "Requires the pyarrow package, installed with the export extra."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, output_format="parquet", batch_size=50000):  # pylint: disable=arguments-differ
+        """Export the sessions and store the file."""
+        output = io.BytesIO()
+        count = export.export_sessions(
+            output, output_format, batch_size=batch_size, using=reports.get_reporting_database()
+        )
+        self.logger.info("Exported %d BGP sessions.", count)
+        self.create_file(f"bgp-sessions.{output_format}", output.getvalue())
+        return {"sessions": count}
+
+
+class ExportResolvedPeerEndpoints(Job):
+    """Export the effective configuration of every BGP Peer Endpoint, with the inherited values resolved."""
+
+    output_format = ChoiceVar(choices=[("json", "JSON"), ("csv", "CSV")], default="json", label="Report format")
+    batch_size = IntegerVar(default=10000, min_value=1, description="Number of Peer Endpoints loaded per batch.")
+
+    class Meta:
+        name = "Export Resolved Peer Endpoints"
+        description = (
+            "Export the ASN, description, enabled state, local IP, source interface, role and address families "
+            "of every Peer Endpoint, as inherited from its Peer Group, Peer Group Template and routing instance. "
+            "The report is attached to the Job Result as a JSON or CSV file."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, output_format="json", batch_size=10000):  # pylint: disable=arguments-differ
+        """Resolve the endpoints and store the report."""
+        rows = list(reports.iter_resolved_peer_endpoints(batch_size, using=reports.get_reporting_database()))
+        self.logger.info("Resolved %d Peer Endpoints.", len(rows))
+        self.create_file(
+            f"bgp-peer-endpoints.{output_format}",
+            reports.render_report(rows, reports.RESOLVED_CONFIG_FIELDS, output_format),
+        )
+        return {"peer_endpoints": len(rows)}
+
+
+class ASNRangeUtilization(Job):
+    """Report the number and ratio of the ASNs in use in each Autonomous System Range."""
+
+    output_format = ChoiceVar(choices=[("json", "JSON"), ("csv", "CSV")], default="json", label="Report format")
+
+    class Meta:
+        name = "ASN Range Utilization"
+        description = (
+            "Report the size of each Autonomous System Range and the number and ratio of its ASNs used by "
+            "Autonomous Systems. The report is attached to the Job Result as a JSON or CSV file."
+        )
+        has_sensitive_variables = False
+
+    def run(self, *, output_format="json"):  # pylint: disable=arguments-differ
+        """Compute the utilization and store the report."""
+        rows = reports.range_utilization(using=reports.get_reporting_database())
+        for row in rows:
+            if row["used"] == row["size"]:
+                self.logger.warning("Autonomous System Range %s is full.", row["name"])
+        self.create_file(
+            f"bgp-asn-range-utilization.{output_format}",
+            reports.render_report(rows, reports.RANGE_UTILIZATION_FIELDS, output_format),
+        )
+        return {"ranges": len(rows), "full": sum(1 for row in rows if row["used"] == row["size"])}
+
+
+jobs = [
+    InstantiatePeerGroupTemplates,
+    RepairPeerEndpointPeers,
+    AuditBGPModels,
+    ExportBGPSessions,
+    ExportResolvedPeerEndpoints,
+    ASNRangeUtilization,
+]
+register_jobs(*jobs)
@@ -0,0 +1,43 @@
+"""Check all BGP objects against the validation rules of the BGP Models app."""
+
+from django.core.management.base import BaseCommand
+
+from nautobot_bgp_models import audit, reports
+
+
+class Command(BaseCommand):
+    """Check all BGP objects against the validation rules of the models and print a JSON or CSV report."""
+
+    help = __doc__
+
+    def add_arguments(self, parser):  # noqa: D102
+        parser.add_argument(
+            "--format",
+            choices=["json", "csv"],
+            default="json",
+            help="Format of the report. Defaults to JSON.",
+        )
+        parser.add_argument(
+            "--check",
+            action="append",
+            choices=list(audit.CHECKS),
+            dest="checks",
+            help="Check to run, can be repeated. Defaults to all checks.",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write the report to. Defaults to standard output.",
+        )
+        parser.add_argument(
+            "--database",
+            help="Alias of the database to read from. Defaults to the reporting_database setting of the app.",
+        )
+
+    def handle(self, *args, **options):  # noqa: D102
+        findings = audit.run_audit(options["checks"], using=options["database"] or reports.get_reporting_database())
+        report = audit.render_report(findings, options["format"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.write(report)
+        else:
+            self.stdout.write(report)
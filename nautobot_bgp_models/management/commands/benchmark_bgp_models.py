@@ -0,0 +1,78 @@
+"""Benchmark the hot paths of the BGP Models app against the data in the database."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nautobot_bgp_models import benchmarks
+
+
+class Command(BaseCommand):
+    """Measure SQL queries and wall time of the BGP Models app hot paths and fail when a budget is exceeded."""
+
+    help = __doc__
+
+    def add_arguments(self, parser):  # noqa: D102
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=list(benchmarks.SCENARIOS),
+            dest="scenarios",
+            help="Scenario to run, can be repeated. Defaults to all scenarios.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of runs of each scenario, the median wall time is reported. Defaults to 3.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=50,
+            help="Number of objects listed or processed by each scenario. Defaults to 50.",
+        )
+        parser.add_argument(
+            "--time-factor",
+            type=float,
+            default=1.0,
+            help="Multiplier applied to the wall time budgets, to adapt them to slower or faster hardware.",
+        )
+        parser.add_argument(
+            "--no-time-budgets",
+            action="store_true",
+            help="Only enforce the SQL query budgets.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["text", "json"],
+            default="text",
+            help="Format of the results. Defaults to text.",
+        )
+
+    def handle(self, *args, **options):  # noqa: D102
+        results = benchmarks.run_benchmarks(
+            scenarios=options["scenarios"],
+            repeat=options["repeat"],
+            page_size=options["page_size"],
+            time_factor=None if options["no_time_budgets"] else options["time_factor"],
+        )
+
+        if options["format"] == "json":
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            for result in results:
+                if "passed" not in result:
+                    self.stdout.write(f"{result['scenario']:<50} skipped, no data")
+                    continue
+                line = (
+                    f"{result['scenario']:<50} {result['queries']:>6} / {result['max_queries']:<6} queries "
+                    f"{result['seconds']:>8.3f}s"
+                )
+                if result["max_seconds"] is not None:
+                    line += f" / {result['max_seconds']:.3f}s"
+                self.stdout.write(self.style.SUCCESS(line) if result["passed"] else self.style.ERROR(line))
+
+        failed = [result["scenario"] for result in results if result.get("passed") is False]
+        if failed:
+            raise CommandError(f"Budget exceeded by {len(failed)} scenario(s): {', '.join(failed)}")
@@ -0,0 +1,43 @@
+"""Export the BGP sessions to a Parquet or Arrow file, for analytics."""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from nautobot_bgp_models import export, reports
+
+
+class Command(BaseCommand):
+    """Export every Peering joined with the effective values of its two Peer Endpoints to a columnar file."""
+
+    help = __doc__
+
+    def add_arguments(self, parser):  # noqa: D102
+        parser.add_argument("output", help="File to write the export to.")
+        parser.add_argument(
+            "--format",
+            choices=export.EXPORT_FORMATS,
+            default="parquet",
+            help="Format of the export, Parquet or Arrow IPC. Defaults to Parquet.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50000,
+            help="Number of Peerings loaded per batch, bounding the memory in use. Defaults to 50000.",
+        )
+        parser.add_argument(
+            "--database",
+            help="Alias of the database to read from. Defaults to the reporting_database setting of the app.",
+        )
+
+    def handle(self, *args, **options):  # noqa: D102
+        try:
+            count = export.export_sessions(
+                options["output"],
+                options["format"],
+                batch_size=options["batch_size"],
+                using=options["database"] or reports.get_reporting_database(),
+            )
+        except ImproperlyConfigured as err:
+            raise CommandError(f"{err} Install it with `pip install 'nautobot-bgp-models[export]'`.") from err
+        self.stdout.write(f"Exported {count} BGP sessions to {options['output']}.")
@@ -3,14 +3,15 @@
 import random
 from itertools import product
 
+import factory.random
 from django.contrib.contenttypes.models import ContentType
-from django.core.management.base import BaseCommand
-from django.db import DEFAULT_DB_ALIAS
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
 from nautobot.circuits.models import Provider
 from nautobot.core.factory import get_random_instances
-from nautobot.dcim.models import Device, Interface
+from nautobot.dcim.models import Device, DeviceType, Interface, Location, LocationType, Manufacturer
 from nautobot.extras.models import Role, Secret, Status
-from nautobot.ipam.models import VRF, IPAddress
+from nautobot.ipam.models import VRF, IPAddress, IPAddressToInterface, Namespace, Prefix
 from nautobot.tenancy.models import Tenant
 
 from nautobot_bgp_models.choices import AFISAFIChoices
@@ -27,6 +28,9 @@ from nautobot_bgp_models.models import (
     Peering,
 )
 
+# Scale mode ASNs are allocated from the 32-bit private use range.
+SCALE_ASN_MIN = 4200000000
+
 
 class Command(BaseCommand):
     """Populate the database with various data as a baseline for testing (automated or manual)."""
@@ -44,6 +48,57 @@ class Command(BaseCommand):
             action="store_true",
             help="Flush any existing bgp models data from the database before generating new data.",
         )
+        parser.add_argument(
+            "--seed",
+            help="String to use as a random generator seed for reproducible results.",
+        )
+        parser.add_argument(
+            "--scale",
+            action="store_true",
+            help="Generate a large, fully consistent dataset on dedicated devices instead of 8 objects of each model. "
+            "The size of the dataset is controlled by the --devices, --instances-per-device, --peer-groups, "
+            "--endpoints and --address-families options.",
+        )
+        parser.add_argument(
+            "--devices",
+            type=int,
+            default=100,
+            help="Scale mode: number of devices to create. Defaults to 100.",
+        )
+        parser.add_argument(
+            "--instances-per-device",
+            type=int,
+            default=1,
+            help="Scale mode: number of BGP Routing Instances per device, each in its own ASN. Defaults to 1.",
+        )
+        parser.add_argument(
+            "--peer-groups",
+            type=int,
+            default=10,
+            help="Scale mode: number of Peer Group Templates, instantiated as Peer Groups on every Routing Instance. "
+            "Defaults to 10.",
+        )
+        parser.add_argument(
+            "--endpoints",
+            type=int,
+            default=2000,
+            help="Scale mode: number of Peer Endpoints, two per Peering. Defaults to 2000.",
+        )
+        parser.add_argument(
+            "--address-families",
+            type=int,
+            default=2,
+            choices=range(len(AFISAFIChoices.values()) + 1),
+            metavar=f"{{0-{len(AFISAFIChoices.values())}}}",
+            help="Scale mode: number of AFI-SAFIs configured on every Routing Instance, Peer Group and Peer Endpoint. "
+            "Defaults to 2.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Scale mode: number of objects created per query. Defaults to 1000.",
+        )
 
     def _generate_static_data(self, db):
         providers = get_random_instances(
@@ -120,8 +175,9 @@ class Command(BaseCommand):
         message = "Creating 8 AutonomousSystemRanges..."
         self.stdout.write(message)
         for i in range(1, 9):
-            asn_min = random.randint(64512, 65533)  # noqa: S311
-            asn_max = random.randint(asn_min, 65534)  # noqa: S311
+            # One slice of the private ASNs per range, as ranges may not partially overlap.
+            asn_min = 64512 + (i - 1) * 127
+            asn_max = random.randint(asn_min + 1, asn_min + 126)  # noqa: S311
             tenant = random.choice([*tenants, None])  # noqa: S311
             autonomous_system_ranges.append(
                 AutonomousSystemRange.objects.using(db).create(
@@ -296,6 +352,240 @@ class Command(BaseCommand):
                 )
             )
 
+    def _bulk_create(self, db, model, objects, batch_size):
+        """Create `objects` with `bulk_create()`, reporting progress."""
+        self.stdout.write(f"Creating {len(objects)} {model._meta.verbose_name_plural}...")
+        return model.objects.using(db).bulk_create(objects, batch_size=batch_size)
+
+    def _generate_scale_data(self, db, options):  # pylint: disable=too-many-locals
+        """Generate a consistent dataset of configurable size with bulk inserts.
+
+        Templates are instantiated as Peer Groups on every Routing Instance and the Peer Endpoints inherit their ASN
+        and local IP (the device loopback) through the Peer Group, so that the inheritance code paths are exercised.
+        Each Peering connects Routing Instances of two different devices.
+        """
+        rng = random.Random(options["seed"])  # noqa: S311
+        batch_size = options["batch_size"]
+        if options["devices"] < 2 and options["endpoints"]:  # noqa: PLR2004
+            raise CommandError("At least two devices are required to create Peer Endpoints.")
+        if options["instances_per_device"] < 1:
+            raise CommandError("At least one Routing Instance per device is required.")
+
+        status = Status.objects.using(db).get(name="Active")
+        status.content_types.add(
+            *ContentType.objects.db_manager(db)
+            .get_for_models(
+                Location, Device, Interface, IPAddress, Prefix, AutonomousSystem, BGPRoutingInstance, Peering
+            )
+            .values()
+        )
+        manufacturer, _ = Manufacturer.objects.using(db).get_or_create(name="BGP Scale")
+        device_type, _ = DeviceType.objects.using(db).get_or_create(manufacturer=manufacturer, model="BGP Scale Router")
+        location_type, _ = LocationType.objects.using(db).get_or_create(name="BGP Scale")
+        location_type.content_types.add(ContentType.objects.db_manager(db).get_for_model(Device))
+        location, _ = Location.objects.using(db).get_or_create(
+            name="BGP Scale", location_type=location_type, defaults={"status": status}
+        )
+        device_role, _ = Role.objects.using(db).get_or_create(name="BGP Scale Router")
+        device_role.content_types.add(ContentType.objects.db_manager(db).get_for_model(Device))
+        peering_roles = [
+            Role.objects.using(db).get_or_create(name=name)[0] for name in ("BGP Scale eBGP", "BGP Scale iBGP")
+        ]
+        for role in peering_roles:
+            role.content_types.add(
+                *ContentType.objects.db_manager(db).get_for_models(PeerGroupTemplate, PeerGroup, PeerEndpoint).values()
+            )
+        namespace = Namespace.objects.using(db).get(name="Global")
+        prefix, _ = Prefix.objects.using(db).get_or_create(
+            prefix="10.0.0.0/8", namespace=namespace, defaults={"status": status}
+        )
+
+        if BGPRoutingInstance.objects.using(db).filter(device__location=location).exists():
+            raise CommandError("BGP scale data already exists, use --flush to replace it.")
+
+        # Devices, each with a loopback interface and IP, reused across runs.
+        names = [f"bgp-scale-{i:06d}" for i in range(options["devices"])]
+        device_indexes = {name: index for index, name in enumerate(names)}
+        existing = set(
+            Device.objects.using(db).filter(location=location, name__in=names).values_list("name", flat=True)
+        )
+        self._bulk_create(
+            db,
+            Device,
+            [
+                Device(name=name, device_type=device_type, role=device_role, location=location, status=status)
+                for name in names
+                if name not in existing
+            ],
+            batch_size,
+        )
+        devices = list(Device.objects.using(db).filter(location=location, name__in=names).order_by("name"))
+        with_loopback = set(
+            Interface.objects.using(db).filter(device__in=devices, name="Loopback0").values_list("device", flat=True)
+        )
+        loopbacks = self._bulk_create(
+            db,
+            Interface,
+            [
+                Interface(device=device, name="Loopback0", type="virtual", status=status)
+                for device in devices
+                if device.pk not in with_loopback
+            ],
+            batch_size,
+        )
+        ip_addresses = self._bulk_create(
+            db,
+            IPAddress,
+            [
+                IPAddress(
+                    address=f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}/32",
+                    parent=prefix,
+                    status=status,
+                )
+                for index in (device_indexes[loopback.device.name] + 1 for loopback in loopbacks)
+            ],
+            batch_size,
+        )
+        self._bulk_create(
+            db,
+            IPAddressToInterface,
+            [
+                IPAddressToInterface(ip_address=ip_address, interface=loopback)
+                for ip_address, loopback in zip(ip_addresses, loopbacks)
+            ],
+            batch_size,
+        )
+        loopbacks = dict(
+            Interface.objects.using(db).filter(device__in=devices, name="Loopback0").values_list("device", "pk")
+        )
+
+        # One ASN per Routing Instance of a device, shared by all devices (iBGP), plus external ASNs for templates.
+        asns = range(SCALE_ASN_MIN, SCALE_ASN_MIN + options["instances_per_device"] + options["peer_groups"])
+        existing = set(AutonomousSystem.objects.using(db).filter(asn__in=asns).values_list("asn", flat=True))
+        self._bulk_create(
+            db,
+            AutonomousSystem,
+            [
+                AutonomousSystem(asn=asn, description=f"BGP scale ASN {asn}", status=status)
+                for asn in asns
+                if asn not in existing
+            ],
+            batch_size,
+        )
+        asn_pks = dict(AutonomousSystem.objects.using(db).filter(asn__in=asns).values_list("asn", "pk"))
+        AutonomousSystemRange.objects.using(db).get_or_create(
+            name="BGP Scale", defaults={"asn_min": SCALE_ASN_MIN, "asn_max": SCALE_ASN_MIN + 65535}
+        )
+        routing_instances = self._bulk_create(
+            db,
+            BGPRoutingInstance,
+            [
+                BGPRoutingInstance(
+                    device=device,
+                    autonomous_system_id=asn_pks[SCALE_ASN_MIN + index],
+                    router_id=None,
+                    status=status,
+                    description=f"{device.name} instance {index}",
+                )
+                for device in devices
+                for index in range(options["instances_per_device"])
+            ],
+            batch_size,
+        )
+        afi_safis = AFISAFIChoices.values()[: options["address_families"]]
+        self._bulk_create(
+            db,
+            AddressFamily,
+            [
+                AddressFamily(routing_instance=routing_instance, afi_safi=afi_safi)
+                for routing_instance in routing_instances
+                for afi_safi in afi_safis
+            ],
+            batch_size,
+        )
+
+        # Templates carry the role and half of them an external ASN, Peer Groups only override the source interface.
+        templates = self._bulk_create(
+            db,
+            PeerGroupTemplate,
+            [
+                PeerGroupTemplate(
+                    name=f"bgp-scale-template-{index:03d}",
+                    description=f"BGP scale template {index}",
+                    role=peering_roles[index % 2],
+                    autonomous_system_id=(
+                        asn_pks[SCALE_ASN_MIN + options["instances_per_device"] + index] if index % 2 == 0 else None
+                    ),
+                )
+                for index in range(options["peer_groups"])
+            ],
+            batch_size,
+        )
+        peer_groups = self._bulk_create(
+            db,
+            PeerGroup,
+            [
+                PeerGroup(
+                    name=template.name,
+                    peergroup_template=template,
+                    routing_instance=routing_instance,
+                    source_interface_id=loopbacks[routing_instance.device_id],
+                )
+                for routing_instance in routing_instances
+                for template in templates
+            ],
+            batch_size,
+        )
+        self._bulk_create(
+            db,
+            PeerGroupAddressFamily,
+            [
+                PeerGroupAddressFamily(peer_group=peer_group, afi_safi=afi_safi)
+                for peer_group in peer_groups
+                for afi_safi in afi_safis
+            ],
+            batch_size,
+        )
+        peer_groups_by_instance = {}
+        for peer_group in peer_groups:
+            peer_groups_by_instance.setdefault(peer_group.routing_instance_id, []).append(peer_group)
+        instances_by_device = {}
+        for routing_instance in routing_instances:
+            instances_by_device.setdefault(routing_instance.device_id, []).append(routing_instance)
+
+        # Peerings between two devices, each endpoint in a random Peer Group of a random Routing Instance.
+        peerings = self._bulk_create(
+            db, Peering, [Peering(status=status) for _ in range(options["endpoints"] // 2)], batch_size
+        )
+        endpoints = []
+        for peering in peerings:
+            for device in rng.sample(devices, 2):
+                routing_instance = rng.choice(instances_by_device[device.pk])
+                peer_group = rng.choice(peer_groups_by_instance[routing_instance.pk]) if templates else None
+                endpoints.append(
+                    PeerEndpoint(
+                        peering=peering,
+                        routing_instance=routing_instance,
+                        peer_group=peer_group,
+                        source_interface_id=None if peer_group else loopbacks[device.pk],
+                    )
+                )
+        endpoints = self._bulk_create(db, PeerEndpoint, endpoints, batch_size)
+        for endpoint_a, endpoint_z in zip(endpoints[::2], endpoints[1::2]):
+            endpoint_a.peer = endpoint_z
+            endpoint_z.peer = endpoint_a
+        PeerEndpoint.objects.using(db).bulk_update(endpoints, ["peer"], batch_size=batch_size)
+        self._bulk_create(
+            db,
+            PeerEndpointAddressFamily,
+            [
+                PeerEndpointAddressFamily(peer_endpoint=endpoint, afi_safi=afi_safi)
+                for endpoint in endpoints
+                for afi_safi in afi_safis
+            ],
+            batch_size,
+        )
+
     def handle(self, *args, **options):
         """Entry point to the management command."""
         if options["flush"]:
@@ -311,6 +601,14 @@ class Command(BaseCommand):
             AutonomousSystemRange.objects.using(options["database"]).all().delete()
             Peering.objects.using(options["database"]).all().delete()
 
-        self._generate_static_data(db=options["database"])
+        if options["seed"]:
+            random.seed(options["seed"])
+            factory.random.reseed_random(options["seed"])
+
+        if options["scale"]:
+            with transaction.atomic(using=options["database"]):
+                self._generate_scale_data(db=options["database"], options=options)
+        else:
+            self._generate_static_data(db=options["database"])
 
         self.stdout.write(self.style.SUCCESS(f"Database {options['database']} populated with app data successfully!"))
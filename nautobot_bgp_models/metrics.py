@@ -0,0 +1,148 @@
+"""Prometheus inventory metrics of the BGP Models app, exported by the Nautobot `/metrics` endpoint.
+
+The gauges are computed with a few GROUP BY queries and cached, shared by all the Nautobot processes, for
+`metrics_cache_ttl` seconds. Once expired, the cached gauges keep being served while a background thread computes
+fresh ones, so that the scrape latency does not depend on the size of the dataset.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count
+from prometheus_client.core import GaugeMetricFamily
+
+from nautobot_bgp_models import helpers, models, reports
+
+CACHE_KEY = "nautobot_bgp_models:metrics:inventory"
+REFRESH_LOCK_KEY = f"{CACHE_KEY}:refresh"
+REFRESH_LOCK_TIMEOUT = 600
+
+# Metric name: (description, label names)
+INVENTORY_METRICS = {
+    "nautobot_bgp_models_peerings": ("Number of BGP Peerings per status.", ["status"]),
+    "nautobot_bgp_models_routing_instances": ("Number of BGP Routing Instances per status.", ["status"]),
+    "nautobot_bgp_models_peer_endpoints_per_device_role": (
+        "Number of BGP Peer Endpoints per device role and Peering status.",
+        ["device_role", "status"],
+    ),
+    "nautobot_bgp_models_peer_endpoints_per_autonomous_system": (
+        "Number of BGP Peer Endpoints per inherited autonomous system and Peering status.",
+        ["autonomous_system", "status"],
+    ),
+    "nautobot_bgp_models_asn_range_size": ("Number of ASNs in each Autonomous System Range.", ["range"]),
+    "nautobot_bgp_models_asn_range_used": ("Number of Autonomous Systems in each Autonomous System Range.", ["range"]),
+    "nautobot_bgp_models_asn_range_utilization": (
+        "Ratio of the ASNs used in each Autonomous System Range.",
+        ["range"],
+    ),
+}
+
+
+def _count_by(queryset, *lookups):
+    """Return {(values of lookups): count} for `queryset`, in a single GROUP BY query."""
+    return {
+        tuple(row[:-1]): row[-1]
+        for row in queryset.order_by().values_list(*lookups).annotate(count=Count("pk")).values_list(*lookups, "count")
+    }
+
+
+def compute_inventory():
+    """Compute the BGP inventory gauges from the database, independently of the cache.
+
+    Returns:
+        (dict): {"timestamp": computation time, "duration": seconds, "samples": {metric name: [(labels, value)]}}.
+    """
+    start = time.monotonic()
+    samples = {name: [] for name in INVENTORY_METRICS}
+
+    for model, name in (
+        (models.Peering, "nautobot_bgp_models_peerings"),
+        (models.BGPRoutingInstance, "nautobot_bgp_models_routing_instances"),
+    ):
+        for (status,), count in _count_by(model.objects.all(), "status__name").items():
+            samples[name].append(([status or ""], count))
+
+    endpoints = _count_by(
+        models.PeerEndpoint.objects.annotate(
+            asn=helpers.inherited_field_expression(models.PeerEndpoint, "autonomous_system")
+        ),
+        "routing_instance__device__role__name",
+        "asn",
+        "peering__status__name",
+    )
+    asn_numbers = dict(
+        models.AutonomousSystem.objects.filter(pk__in={asn for _, asn, _ in endpoints if asn}).values_list("pk", "asn")
+    )
+    per_role = {}
+    per_asn = {}
+    for (role, asn, status), count in endpoints.items():
+        status = status or ""
+        role_key = (role or "", status)
+        asn_key = (str(asn_numbers[asn]) if asn in asn_numbers else "", status)
+        per_role[role_key] = per_role.get(role_key, 0) + count
+        per_asn[asn_key] = per_asn.get(asn_key, 0) + count
+    samples["nautobot_bgp_models_peer_endpoints_per_device_role"] = [(list(k), v) for k, v in per_role.items()]
+    samples["nautobot_bgp_models_peer_endpoints_per_autonomous_system"] = [(list(k), v) for k, v in per_asn.items()]
+
+    for row in reports.range_utilization():
+        samples["nautobot_bgp_models_asn_range_size"].append(([row["name"]], row["size"]))
+        samples["nautobot_bgp_models_asn_range_used"].append(([row["name"]], row["used"]))
+        samples["nautobot_bgp_models_asn_range_utilization"].append(([row["name"]], row["utilization"]))
+
+    return {"timestamp": time.time(), "duration": time.monotonic() - start, "samples": samples}
+
+
+def refresh_inventory():
+    """Compute the BGP inventory gauges and store them in the cache."""
+    inventory = compute_inventory()
+    cache.set(CACHE_KEY, inventory, timeout=None)
+    return inventory
+
+
+def _refresh_inventory_in_background():
+    """Thread target refreshing the cached inventory, then releasing the refresh lock and the database connections."""
+    try:
+        refresh_inventory()
+    finally:
+        cache.delete(REFRESH_LOCK_KEY)
+        connections.close_all()
+
+
+def get_inventory():
+    """Return the cached BGP inventory gauges, refreshing them in the background once expired.
+
+    The gauges are computed synchronously only when there is nothing cached yet or when the TTL is 0.
+    """
+    ttl = settings.PLUGINS_CONFIG.get("nautobot_bgp_models", {}).get("metrics_cache_ttl", 60)
+    inventory = cache.get(CACHE_KEY)
+    if inventory is None or not ttl:
+        return refresh_inventory()
+
+    if time.time() - inventory["timestamp"] > ttl and cache.add(REFRESH_LOCK_KEY, True, timeout=REFRESH_LOCK_TIMEOUT):
+        threading.Thread(target=_refresh_inventory_in_background, daemon=True).start()
+    return inventory
+
+
+def metric_bgp_inventory():
+    """Yield the BGP inventory gauges, along with the age and computation time of the cached values."""
+    inventory = get_inventory()
+    for name, (description, labels) in INVENTORY_METRICS.items():
+        gauge = GaugeMetricFamily(name, description, labels=labels)
+        for label_values, value in inventory["samples"][name]:
+            gauge.add_metric(label_values, value)
+        yield gauge
+
+    gauge = GaugeMetricFamily("nautobot_bgp_models_inventory_age_seconds", "Age of the BGP inventory metrics.")
+    gauge.add_metric([], time.time() - inventory["timestamp"])
+    yield gauge
+    gauge = GaugeMetricFamily(
+        "nautobot_bgp_models_inventory_duration_seconds", "Time taken to compute the BGP inventory metrics."
+    )
+    gauge.add_metric([], inventory["duration"])
+    yield gauge
+
+
+metrics = [metric_bgp_inventory]
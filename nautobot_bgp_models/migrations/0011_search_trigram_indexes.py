@@ -0,0 +1,68 @@
+"""Trigram indexes supporting the case-insensitive `q` search of the BGP models on PostgreSQL.
+
+The `icontains` lookups generate `UPPER("column"::text) LIKE UPPER(...)` predicates, which are matched by GIN indexes
+over the same expression with the `gin_trgm_ops` operator class of the `pg_trgm` extension. The indexes are skipped,
+leaving the search functional but unindexed, on other databases or when the extension can't be enabled.
+"""
+
+import logging
+
+from django.db import DatabaseError, migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+# Table: columns searched with icontains.
+SEARCH_COLUMNS = {
+    "nautobot_bgp_models_autonomoussystem": ["description"],
+    "nautobot_bgp_models_autonomoussystemrange": ["name", "description"],
+    "nautobot_bgp_models_bgproutinginstance": ["description"],
+    "nautobot_bgp_models_peergrouptemplate": ["name", "description"],
+    "nautobot_bgp_models_peergroup": ["name", "description"],
+    "nautobot_bgp_models_peerendpoint": ["description"],
+}
+
+
+def _index_name(table, column):
+    return f"{table[len('nautobot_bgp_models_'):]}_{column}_trgm"[:63]
+
+
+def create_trigram_indexes(apps, schema_editor):  # pylint: disable=unused-argument
+    """Enable pg_trgm and create the trigram indexes, if possible."""
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError as err:
+        logger.warning("Unable to enable the pg_trgm extension, BGP search indexes not created: %s", err)
+        return
+
+    quote = schema_editor.quote_name
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {quote(_index_name(table, column))} "
+                f"ON {quote(table)} USING gin ((UPPER({quote(column)}::text)) gin_trgm_ops)"
+            )
+
+
+def drop_trigram_indexes(apps, schema_editor):  # pylint: disable=unused-argument
+    """Drop the trigram indexes, leaving the pg_trgm extension in place."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(_index_name(table, column))}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_bgp_models", "0010_alter_autonomoussystem_status_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_bgp_models", "0011_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="addressfamily",
+            index=models.Index(fields=["routing_instance", "vrf", "afi_safi"], name="bgp_af_ri_vrf_afisafi_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="addressfamily",
+            index=models.Index(
+                condition=models.Q(("vrf__isnull", True)),
+                fields=["routing_instance", "afi_safi"],
+                name="bgp_af_ri_afisafi_global_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="autonomoussystemrange",
+            index=models.Index(fields=["asn_min", "asn_max"], name="bgp_asrange_min_max_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="peergroup",
+            index=models.Index(fields=["routing_instance", "vrf"], name="bgp_peergroup_ri_vrf_idx"),
+        ),
+    ]
@@ -0,0 +1,40 @@
+"""GiST interval index supporting the containment and overlap lookups of AutonomousSystemRange on PostgreSQL.
+
+The index is over the same `int8range(asn_min, asn_max, '[]')` expression as the lookups of
+`AutonomousSystemRangeQuerySet`. Other databases use the (asn_min, asn_max) B-tree index instead.
+"""
+
+from django.db import migrations
+
+TABLE = "nautobot_bgp_models_autonomoussystemrange"
+INDEX = "bgp_asrange_interval_idx"
+
+
+def create_interval_index(apps, schema_editor):  # pylint: disable=unused-argument
+    """Create the GiST index of the ranges, on PostgreSQL only."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {quote(INDEX)} ON {quote(TABLE)} "
+        f"USING gist (int8range({quote('asn_min')}, {quote('asn_max')}, '[]'))"
+    )
+
+
+def drop_interval_index(apps, schema_editor):  # pylint: disable=unused-argument
+    """Drop the GiST index of the ranges."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(INDEX)}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_bgp_models", "0012_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_interval_index, drop_interval_index),
+    ]
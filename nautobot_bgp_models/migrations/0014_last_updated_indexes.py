@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_bgp_models", "0013_autonomoussystemrange_interval_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="addressfamily",
+            index=models.Index(fields=["last_updated"], name="bgp_af_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="autonomoussystem",
+            index=models.Index(fields=["last_updated"], name="bgp_as_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="autonomoussystemrange",
+            index=models.Index(fields=["last_updated"], name="bgp_asrange_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="bgproutinginstance",
+            index=models.Index(fields=["last_updated"], name="bgp_ri_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="peerendpoint",
+            index=models.Index(fields=["last_updated"], name="bgp_pe_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="peerendpointaddressfamily",
+            index=models.Index(fields=["last_updated"], name="bgp_peaf_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="peergroup",
+            index=models.Index(fields=["last_updated"], name="bgp_peergroup_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="peergroupaddressfamily",
+            index=models.Index(fields=["last_updated"], name="bgp_pgaf_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="peergrouptemplate",
+            index=models.Index(fields=["last_updated"], name="bgp_pgt_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="peering",
+            index=models.Index(fields=["last_updated"], name="bgp_peering_updated_idx"),
+        ),
+    ]
@@ -7,7 +7,7 @@ from django.core.exceptions import ValidationError
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils.html import format_html
-from nautobot.apps.models import OrganizationalModel, PrimaryModel, extras_features
+from nautobot.apps.models import BaseManager, OrganizationalModel, PrimaryModel, extras_features
 from nautobot.apps.utils import deepmerge
 from nautobot.circuits.models import Provider
 from nautobot.dcim.fields import ASNField
@@ -17,6 +17,8 @@ from nautobot.tenancy.models import Tenant
 from netutils.asn import int_to_asdot
 
 from nautobot_bgp_models.choices import AFISAFIChoices
+from nautobot_bgp_models.instrumentation import instrumented
+from nautobot_bgp_models.querysets import AutonomousSystemRangeQuerySet
 
 
 def rgetattr(obj, attr, *args):
@@ -31,8 +33,18 @@ def rgetattr(obj, attr, *args):
 class InheritanceMixin(models.Model):
     """BGP common mixin class."""
 
+    @instrumented("inheritance")
     def get_inherited_field(self, field_name, inheritance_path=None):
-        """Returns value, inheritance_indicator, inheritance_source."""
+        """Returns value, inheritance_indicator, inheritance_source.
+
+        Without an explicit `inheritance_path`, the field is read from the fields resolved by
+        `resolve_inherited_fields()` when they are.
+        """
+        resolved_fields = getattr(self, "_resolved_fields", None)
+        if inheritance_path is None and resolved_fields is not None and field_name in resolved_fields:
+            field = resolved_fields[field_name]
+            return field["value"], field["inherited"], field["source"]
+
         field_value = getattr(self, field_name, None)
         if field_value:
             return field_value, False, None
@@ -69,9 +81,21 @@ class InheritanceMixin(models.Model):
 
         return result
 
+    def resolve_inherited_fields(self):
+        """Resolve every inherited field once, for the following reads of these fields to reuse.
+
+        Meant for the views rendering many inherited fields of an object they don't modify, such as the detail views:
+        the resolved values are not updated when the object or its parents change.
+        """
+        self._resolved_fields = self.get_fields(include_inherited=True)
+        return self._resolved_fields
+
     @property
     def fields_inherited(self):
         """Wrapper intended to remove function call with attributes from within a jinja template."""
+        resolved_fields = getattr(self, "_resolved_fields", None)
+        if resolved_fields is not None:
+            return resolved_fields
         return self.get_fields(include_inherited=True)
 
     class Meta:
@@ -100,6 +124,7 @@ class BGPExtraAttributesMixin(models.Model):
         return [rgetattr(self, f"{x}.extra_attributes", None) for x in paths]
 
     @property
+    @instrumented("extra_attributes")
     def extra_attributes_inherited(self):
         """Render extra attributes for an object."""
         # always manually query for extra attributes
@@ -141,6 +166,9 @@ class AutonomousSystem(PrimaryModel):
     class Meta:
         ordering = ["asn"]
         verbose_name = "Autonomous system"
+        indexes = [
+            models.Index(name="bgp_as_updated_idx", fields=["last_updated"]),
+        ]
 
     def __str__(self):
         """String representation of an AutonomousSystem."""
@@ -151,6 +179,11 @@ class AutonomousSystem(PrimaryModel):
         """ASDOT (RFC 5396) representation of an AutonomousSystem."""
         return int_to_asdot(self.asn)
 
+    @property
+    def autonomous_system_ranges(self):
+        """Return the Autonomous System Ranges containing the ASN, from the widest to the narrowest."""
+        return AutonomousSystemRange.objects.containing(self.asn).order_by("asn_min", "-asn_max")
+
 
 @extras_features(
     "custom_fields",
@@ -170,9 +203,15 @@ class AutonomousSystemRange(PrimaryModel):
     description = models.CharField(max_length=255, blank=True)
     tenant = models.ForeignKey(to=Tenant, on_delete=models.PROTECT, blank=True, null=True)
 
+    objects = BaseManager.from_queryset(AutonomousSystemRangeQuerySet)()
+
     class Meta:
         ordering = ["asn_min"]
         verbose_name = "Autonomous System Range"
+        indexes = [
+            models.Index(name="bgp_asrange_min_max_idx", fields=["asn_min", "asn_max"]),
+            models.Index(name="bgp_asrange_updated_idx", fields=["last_updated"]),
+        ]
 
     def __str__(self):
         """String representation of an AutonomousSystemRange."""
@@ -183,6 +222,15 @@ class AutonomousSystemRange(PrimaryModel):
         if self.asn_min >= self.asn_max:
             raise ValidationError("asn_min value must be lower than asn_max value.")
 
+        # Ranges may be nested in one another, but not partially overlap.
+        crossing = AutonomousSystemRange.objects.exclude(pk=self.pk).crossing(self.asn_min, self.asn_max).first()
+        if crossing:
+            raise ValidationError(
+                f"The range partially overlaps {crossing.name} ({crossing.asn_min}-{crossing.asn_max}), "
+                "ranges may only be nested in one another."
+            )
+
+    @instrumented("asn_allocation")
     def get_next_available_asn(self):
         """Return the first available ASN number in the range, or None if none are available."""
         asn_nums = AutonomousSystem.objects.filter(asn__gte=self.asn_min, asn__lte=self.asn_max).values_list(
@@ -246,6 +294,9 @@ class BGPRoutingInstance(PrimaryModel, BGPExtraAttributesMixin):
     class Meta:
         verbose_name = "BGP Routing Instance"
         unique_together = [("device", "autonomous_system")]
+        indexes = [
+            models.Index(name="bgp_ri_updated_idx", fields=["last_updated"]),
+        ]
 
     def clean(self):
         """Clean."""
@@ -296,6 +347,10 @@ class PeerGroupTemplate(PrimaryModel, BGPExtraAttributesMixin):
 
     class Meta:
         verbose_name = "BGP Peer Group Template"
+        indexes = [
+            # Templates changed since a watermark, along with the peer groups and endpoints inheriting from them.
+            models.Index(name="bgp_pgt_updated_idx", fields=["last_updated"]),
+        ]
 
 
 @extras_features(
@@ -391,6 +446,11 @@ class PeerGroup(PrimaryModel, InheritanceMixin, BGPExtraAttributesMixin):
         unique_together = [("name", "routing_instance", "vrf")]
         verbose_name = "BGP Peer Group"
         ordering = ["name"]
+        indexes = [
+            # Peer groups of a routing instance and VRF, looked up without a name.
+            models.Index(name="bgp_peergroup_ri_vrf_idx", fields=["routing_instance", "vrf"]),
+            models.Index(name="bgp_peergroup_updated_idx", fields=["last_updated"]),
+        ]
 
     def clean(self):
         """Clean."""
@@ -526,8 +586,13 @@ class PeerEndpoint(PrimaryModel, InheritanceMixin, BGPExtraAttributesMixin):
          3. Endpoint's `source_interface` attribute
          4. Peer Groups' `source_interface` attribute
 
-        The effective IP Address of an endpoint is based on the above order.
+        The effective IP Address of an endpoint is based on the above order, and is read from the fields resolved by
+        `resolve_inherited_fields()` when they are.
         """
+        resolved_local_ip_address = getattr(self, "_resolved_local_ip_address", None)
+        if resolved_local_ip_address is not None:
+            return resolved_local_ip_address if return_inheritance else resolved_local_ip_address[0]
+
         inherited_source_ip, is_source_ip_inherited, source_ip_inheritance = self.get_inherited_field(
             field_name="source_ip"
         )
@@ -551,6 +616,12 @@ class PeerEndpoint(PrimaryModel, InheritanceMixin, BGPExtraAttributesMixin):
 
         return (None, None, None) if return_inheritance else None
 
+    def resolve_inherited_fields(self):
+        """Resolve every inherited field once, along with the local IP address derived from them."""
+        resolved_fields = super().resolve_inherited_fields()
+        self._resolved_local_ip_address = self.get_local_ip_address(return_inheritance=True)
+        return resolved_fields
+
     @property
     def local_ip(self):
         """Get the local IP address object, or None if not set."""
@@ -590,6 +661,9 @@ class PeerEndpoint(PrimaryModel, InheritanceMixin, BGPExtraAttributesMixin):
 
     class Meta:
         verbose_name = "BGP Peer Endpoint"
+        indexes = [
+            models.Index(name="bgp_pe_updated_idx", fields=["last_updated"]),
+        ]
 
     def __str__(self):
         """String."""
@@ -659,15 +733,30 @@ class Peering(OrganizationalModel):
 
     class Meta:
         verbose_name = "BGP Peering"
+        indexes = [
+            models.Index(name="bgp_peering_updated_idx", fields=["last_updated"]),
+        ]
+
+    def _get_prefetched_endpoints(self):
+        """Get the prefetched endpoints of this Peering ordered by pk, or None if they are not prefetched."""
+        if "endpoints" not in getattr(self, "_prefetched_objects_cache", {}):
+            return None
+        return sorted(self.endpoints.all(), key=lambda endpoint: endpoint.pk)
 
     @property
     def endpoint_a(self):
         """Get the "first" endpoint associated with this Peering."""
+        endpoints = self._get_prefetched_endpoints()
+        if endpoints is not None:
+            return endpoints[0] if endpoints else None
         return self.endpoints.order_by("pk")[0] if self.endpoints.exists() else None
 
     @property
     def endpoint_z(self):
         """Get the "second" endpoint associated with this Peering."""
+        endpoints = self._get_prefetched_endpoints()
+        if endpoints is not None:
+            return endpoints[1] if len(endpoints) > 1 else None
         return self.endpoints.order_by("pk")[1] if self.endpoints.count() > 1 else None
 
     def __str__(self):
@@ -737,6 +826,17 @@ class AddressFamily(OrganizationalModel, BGPExtraAttributesMixin):
         ordering = ["-routing_instance", "-vrf"]
         verbose_name = "BGP address family"
         verbose_name_plural = "BGP Address Families"
+        indexes = [
+            models.Index(name="bgp_af_ri_vrf_afisafi_idx", fields=["routing_instance", "vrf", "afi_safi"]),
+            # Global address families, inherited from by most peer group and peer endpoint address families.
+            # Not created on MySQL, which doesn't support partial indexes.
+            models.Index(
+                name="bgp_af_ri_afisafi_global_idx",
+                fields=["routing_instance", "afi_safi"],
+                condition=models.Q(vrf__isnull=True),
+            ),
+            models.Index(name="bgp_af_updated_idx", fields=["last_updated"]),
+        ]
 
     def __str__(self):
         """String representation of a single AddressFamily."""
@@ -817,6 +917,9 @@ class PeerGroupAddressFamily(OrganizationalModel, InheritanceMixin, BGPExtraAttr
         unique_together = ["peer_group", "afi_safi"]
         verbose_name = "BGP peer-group address family"
         verbose_name_plural = "BGP Peer-Group Address Families"
+        indexes = [
+            models.Index(name="bgp_pgaf_updated_idx", fields=["last_updated"]),
+        ]
 
     csv_headers = [
         "peer_group",
@@ -902,6 +1005,9 @@ class PeerEndpointAddressFamily(OrganizationalModel, InheritanceMixin, BGPExtraA
         unique_together = ["peer_endpoint", "afi_safi"]
         verbose_name = "BGP peer-endpoint address family"
         verbose_name_plural = "BGP Peer-Endpoint Address Families"
+        indexes = [
+            models.Index(name="bgp_peaf_updated_idx", fields=["last_updated"]),
+        ]
 
     csv_headers = [
         "peer_endpoint",
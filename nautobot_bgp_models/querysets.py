@@ -0,0 +1,51 @@
+"""Custom QuerySets of the BGP models."""
+
+from django.db import connections
+from django.db.models import BooleanField, F, Field, Func, Q, Value
+from nautobot.apps.models import RestrictedQuerySet
+
+
+class Int8Range(Func):
+    """PostgreSQL `int8range()` of two inclusive bounds, as indexed by `bgp_asrange_interval_idx`."""
+
+    function = "int8range"
+    template = "%(function)s(%(expressions)s, '[]')"
+    output_field = Field()
+
+
+def _range_operator(lhs, operator, rhs):
+    """Boolean expression applying a PostgreSQL range `operator` to two Int8Range expressions."""
+    return Func(lhs, rhs, template="(%(expressions)s)", arg_joiner=f" {operator} ", output_field=BooleanField())
+
+
+class AutonomousSystemRangeQuerySet(RestrictedQuerySet):
+    """QuerySet of AutonomousSystemRange records, with interval lookups.
+
+    On PostgreSQL, the lookups are answered by the GiST index over `int8range(asn_min, asn_max, '[]')`. On other
+    databases, they are range scans of the (asn_min, asn_max) index.
+    """
+
+    def _interval_lookup(self, operator, fallback, asn_min, asn_max):
+        if connections[self.db].vendor == "postgresql":
+            return self.filter(
+                _range_operator(
+                    Int8Range(F("asn_min"), F("asn_max")), operator, Int8Range(Value(asn_min), Value(asn_max))
+                )
+            )
+        return self.filter(fallback)
+
+    def containing(self, asn_min, asn_max=None):
+        """Ranges containing the ASN `asn_min`, or all the ASNs from `asn_min` to `asn_max`."""
+        if asn_max is None:
+            asn_max = asn_min
+        return self._interval_lookup("@>", Q(asn_min__lte=asn_min, asn_max__gte=asn_max), asn_min, asn_max)
+
+    def overlapping(self, asn_min, asn_max):
+        """Ranges sharing at least one ASN with the range from `asn_min` to `asn_max`."""
+        return self._interval_lookup("&&", Q(asn_min__lte=asn_max, asn_max__gte=asn_min), asn_min, asn_max)
+
+    def crossing(self, asn_min, asn_max):
+        """Ranges partially overlapping the range from `asn_min` to `asn_max`, neither containing nor nested in it."""
+        return self.overlapping(asn_min, asn_max).exclude(
+            Q(asn_min__lte=asn_min, asn_max__gte=asn_max) | Q(asn_min__gte=asn_min, asn_max__lte=asn_max)
+        )
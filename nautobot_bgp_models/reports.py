@@ -0,0 +1,176 @@
+"""Reports of the BGP Models app, too heavy to be computed within a web request and run by Jobs instead.
+
+The reports only read from the database, from the `reporting_database` alias of the app settings when configured, for
+example a read replica declared in the Django `DATABASES` setting.
+"""
+
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F, Func, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from nautobot.dcim.models import Interface
+from nautobot.extras.models import Role
+from nautobot.ipam.models import IPAddress
+
+from nautobot_bgp_models import helpers, models
+
+RANGE_UTILIZATION_FIELDS = ["name", "asn_min", "asn_max", "size", "used", "utilization"]
+
+RESOLVED_CONFIG_FIELDS = [
+    "id",
+    "peering",
+    "device",
+    "peer_group",
+    "autonomous_system",
+    "description",
+    "enabled",
+    "local_ip",
+    "source_interface",
+    "role",
+    "address_families",
+]
+
+
+def get_reporting_database():
+    """Database alias the reports read from, the default database unless `reporting_database` is configured."""
+    return settings.PLUGINS_CONFIG.get("nautobot_bgp_models", {}).get("reporting_database") or DEFAULT_DB_ALIAS
+
+
+def range_utilization(using=None):
+    """Number and ratio of the ASNs used in each Autonomous System Range, in a single query.
+
+    Returns:
+        (list[dict]): one row per range, with the keys listed in `RANGE_UTILIZATION_FIELDS`.
+    """
+    used = (
+        models.AutonomousSystem.objects.filter(asn__gte=OuterRef("asn_min"), asn__lte=OuterRef("asn_max"))
+        .order_by()
+        .annotate(count=Func(F("pk"), function="COUNT"))
+        .values("count")
+    )
+    ranges = (
+        models.AutonomousSystemRange.objects.using(using)
+        .annotate(used=Coalesce(Subquery(used, output_field=IntegerField()), Value(0)))
+        .values_list("name", "asn_min", "asn_max", "used")
+    )
+    rows = []
+    for name, asn_min, asn_max, used_count in ranges:
+        size = asn_max - asn_min + 1
+        rows.append(
+            {
+                "name": name,
+                "asn_min": asn_min,
+                "asn_max": asn_max,
+                "size": size,
+                "used": used_count,
+                "utilization": used_count / size,
+            }
+        )
+    return rows
+
+
+def iter_resolved_peer_endpoints(batch_size=10000, using=None):
+    """Yield the effective configuration of every PeerEndpoint, with the inherited values resolved.
+
+    The endpoints are read by batches of `batch_size`, paginated by primary key, each batch costing a constant number
+    of queries.
+
+    Yields:
+        (dict): one row per endpoint, with the keys listed in `RESOLVED_CONFIG_FIELDS`.
+    """
+    asns = dict(models.AutonomousSystem.objects.using(using).values_list("pk", "asn"))
+    roles = dict(Role.objects.using(using).values_list("pk", "name"))
+    columns = [
+        "pk",
+        "peering",
+        "routing_instance__device__name",
+        "peer_group",
+        "peer_group__name",
+        F("local_ip"),
+        *(
+            helpers.inherited_field_expression(models.PeerEndpoint, field_name)
+            for field_name in ("autonomous_system", "description", "enabled", "source_interface", "role")
+        ),
+    ]
+    last_endpoint = None
+    while True:
+        endpoints = models.PeerEndpoint.objects.using(using).order_by("pk")
+        if last_endpoint is not None:
+            endpoints = endpoints.filter(pk__gt=last_endpoint)
+        endpoints = list(helpers.alias_local_ip(endpoints).values_list(*columns)[:batch_size])
+        if not endpoints:
+            return
+        last_endpoint = endpoints[-1][0]
+
+        addresses = {
+            pk: f"{host}/{mask_length}"
+            for pk, host, mask_length in IPAddress.objects.using(using)
+            .filter(pk__in={row[5] for row in endpoints if row[5]})
+            .values_list("pk", "host", "mask_length")
+        }
+        interfaces = dict(
+            Interface.objects.using(using)
+            .filter(pk__in={row[9] for row in endpoints if row[9]})
+            .values_list("pk", "name")
+        )
+        endpoint_afs = {}
+        for endpoint, afi_safi in (
+            models.PeerEndpointAddressFamily.objects.using(using)
+            .filter(peer_endpoint__in=[row[0] for row in endpoints])
+            .values_list("peer_endpoint", "afi_safi")
+        ):
+            endpoint_afs.setdefault(endpoint, set()).add(afi_safi)
+        peer_group_afs = {}
+        for peer_group, afi_safi in (
+            models.PeerGroupAddressFamily.objects.using(using)
+            .filter(peer_group__in={row[3] for row in endpoints if row[3]})
+            .values_list("peer_group", "afi_safi")
+        ):
+            peer_group_afs.setdefault(peer_group, set()).add(afi_safi)
+
+        for pk, peering, device, peer_group, peer_group_name, local_ip, *values in endpoints:
+            asn, description, enabled, source_interface, role = values
+            yield {
+                "id": str(pk),
+                "peering": str(peering),
+                "device": device,
+                "peer_group": peer_group_name,
+                "autonomous_system": asns.get(asn),
+                "description": description or "",
+                "enabled": bool(enabled),
+                "local_ip": addresses.get(local_ip),
+                "source_interface": interfaces.get(source_interface),
+                "role": roles.get(role),
+                "address_families": sorted(endpoint_afs.get(pk, set()) | peer_group_afs.get(peer_group, set())),
+            }
+
+
+def render_report(rows, fields, output_format="json"):
+    """Serialize the rows of a report as JSON or CSV.
+
+    Args:
+        rows (Iterable[dict]): rows of the report, with the keys listed in `fields`.
+        fields (list[str]): columns of the CSV report.
+        output_format (str): either "json" or "csv".
+
+    Returns:
+        (str): the report. The JSON report includes the generation time and the number of rows.
+    """
+    if output_format == "csv":
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: ",".join(value) if isinstance(value, list) else value for key, value in row.items()})
+        return output.getvalue()
+
+    if output_format != "json":
+        raise ValueError(f"Unsupported report format {output_format!r}")
+
+    rows = list(rows)
+    return json.dumps({"generated": timezone.now().isoformat(), "count": len(rows), "rows": rows}, indent=2)
@@ -2,6 +2,11 @@
 
 from django.apps import apps as global_apps
 from django.conf import settings
+from django.contrib.auth.models import Group
+from django.db import transaction
+from nautobot.users.models import ObjectPermission
+
+from nautobot_bgp_models.api import caching
 
 PLUGIN_SETTINGS = settings.PLUGINS_CONFIG["nautobot_bgp_models"]
 
@@ -29,3 +34,22 @@ def post_migrate_create_statuses(sender, *, apps=global_apps, **kwargs):
             if ct_model not in status.content_types.all():
                 status.content_types.add(ct_model)
                 status.save()
+
+
+def invalidate_cached_api_responses(sender, instance, **kwargs):
+    """Callback function for post_save(), post_delete() and m2m_changed() -- discard the stale cached API responses.
+
+    The cached responses are per user, so that any change of the object permissions, of the groups or of the group
+    memberships of the users discards all of them. The responses are discarded once the transaction commits:
+    discarding them earlier would let a concurrent request cache the previous rows again until `api_cache_ttl` expires.
+    Nothing is done while the cache is disabled.
+    """
+    if kwargs.get("action", "post_").startswith("pre_") or not caching.get_cache_ttl():
+        return
+
+    # m2m_changed() passes the model on the other side of the relation as `model`.
+    changed_models = {type(instance), kwargs.get("model")}
+    if changed_models & {ObjectPermission, Group}:
+        transaction.on_commit(caching.invalidate)
+    elif changed_models & caching.WATCHED_MODELS:
+        transaction.on_commit(lambda: caching.invalidate(*changed_models))
@@ -12,7 +12,7 @@ from nautobot.apps.tables import (
     ToggleColumn,
 )
 
-from . import models
+from . import helpers, models
 
 ASN_LINK = """
 {% if record.present_in_database %}
@@ -221,6 +221,10 @@ class PeerEndpointTable(BaseTable):
             "peer_group",
         )
 
+    def render_peering(self, value):
+        """Render the Peering from the summaries of its endpoints, when prefetched with `prefetch_displayed_endpoints()`."""
+        return helpers.format_peering(value)
+
 
 class PeeringTable(StatusTableMixin, BaseTable):
     """Table representation of Peering records."""
@@ -5,63 +5,25 @@ from nautobot.apps.ui import (
     SectionChoices,
     TemplateExtension,
 )
-from nautobot.core.ui import object_detail
 
-from nautobot_bgp_models import tables
+from nautobot_bgp_models.views import LazyPanel
 
 
 class DeviceContent(TemplateExtension):
-    """Template extension for Device content."""
+    """Template extension for Device content.
+
+    The BGP data of the Device is loaded after the page is rendered, with its sessions paginated, so that the Device
+    page doesn't depend on the number of BGP sessions.
+    """
 
     model = "dcim.device"
 
     object_detail_panels = (
-        object_detail.ObjectsTablePanel(
+        LazyPanel(
             weight=100,
             section=SectionChoices.RIGHT_HALF,
-            table_class=tables.AutonomousSystemTable,
-            table_filter="bgproutinginstance__device",
-            add_button_route=None,
-            show_table_config_button=False,
-            paginate=False,
-            include_columns=["asn"],
-            exclude_columns=set(tables.AutonomousSystemTable.Meta.default_columns).difference({"asn"}),
-        ),
-        object_detail.ObjectsTablePanel(
-            weight=200,
-            section=SectionChoices.RIGHT_HALF,
-            table_class=tables.BGPRoutingInstanceTable,
-            table_filter="device",
-            add_button_route=None,
-            show_table_config_button=False,
-            paginate=False,
-            include_columns=["routing_instance"],
-            exclude_columns=set(tables.BGPRoutingInstanceTable.Meta.default_columns).difference({"routing_instance"}),
-        ),
-        object_detail.ObjectsTablePanel(
-            weight=300,
-            section=SectionChoices.RIGHT_HALF,
-            table_class=tables.AddressFamilyTable,
-            table_filter="routing_instance__device",
-            add_button_route=None,
-            show_table_config_button=False,
-            paginate=False,
-            include_columns=["routing_instance", "address_family"],
-            exclude_columns=set(tables.AddressFamilyTable.Meta.default_columns).difference(
-                {"routing_instance", "address_family"}
-            ),
-        ),
-        object_detail.ObjectsTablePanel(
-            weight=400,
-            section=SectionChoices.RIGHT_HALF,
-            table_class=tables.PeerEndpointTable,
-            table_filter="routing_instance__device",
-            add_button_route=None,
-            show_table_config_button=False,
-            paginate=False,
-            table_title="BGP Peerings",
-            include_columns=["peering"],
-            exclude_columns=set(tables.PeerEndpointTable.Meta.default_columns).difference({"peering"}),
+            label="BGP",
+            url_name="plugins:nautobot_bgp_models:device_bgp_panel",
         ),
     )
 
@@ -1,11 +1,18 @@
 """Unit tests for nautobot_bgp_models."""
 
-from unittest import skip
+import uuid
+from unittest import mock, skip
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.test import override_settings
-from nautobot.apps.testing import APIViewTestCases
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from nautobot.apps.testing import APITestCase, APIViewTestCases
 from nautobot.circuits.models import Provider
 from nautobot.dcim.choices import InterfaceTypeChoices
 from nautobot.dcim.models import Device, DeviceType, Interface, Location, LocationType, Manufacturer
@@ -15,6 +22,7 @@ from nautobot.users.models import ObjectPermission
 from rest_framework import status
 
 from nautobot_bgp_models import choices, models
+from nautobot_bgp_models.api import caching
 
 User = get_user_model()
 
@@ -52,6 +60,35 @@ class AutonomousSystemAPITestCase(APIViewTestCases.APIViewTestCase):
             {"asn": 65551, "status": status_active.pk},
             {"asn": 4294967294, "status": status_active.pk, "description": "Reserved for private use"},
         ]
+        cls.asn_range = models.AutonomousSystemRange.objects.create(
+            name="Private", asn_min=4200000000, asn_max=4200000001
+        )
+
+    def test_autonomous_system_ranges(self):
+        """Test the opt-in list of the Autonomous System Ranges containing the ASN."""
+        self.add_permissions("nautobot_bgp_models.view_autonomoussystem")
+        instance = models.AutonomousSystem.objects.get(asn=4200000000)
+        url = self._get_detail_url(instance)
+
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotIn("autonomous_system_ranges", response.data)
+
+        # Only the ranges visible to the user are listed.
+        response = self.client.get(f"{url}?include=autonomous_system_ranges", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["autonomous_system_ranges"], [])
+
+        self.add_permissions("nautobot_bgp_models.view_autonomoussystemrange")
+        response = self.client.get(f"{url}?include=autonomous_system_ranges", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["autonomous_system_ranges"]), 1)
+        asn_range = response.data["autonomous_system_ranges"][0]
+        self.assertEqual(asn_range["id"], self.asn_range.pk)
+        self.assertEqual(asn_range["object_type"], "nautobot_bgp_models.autonomoussystemrange")
+        self.assertEqual(
+            (asn_range["name"], asn_range["asn_min"], asn_range["asn_max"]), ("Private", 4200000000, 4200000001)
+        )
 
 
 class AutonomousSystemRangeAPITestCase(APIViewTestCases.APIViewTestCase):
@@ -169,14 +206,125 @@ class PeerGroupTemplateAPITestCase(APIViewTestCases.APIViewTestCase):
         pgt1_ea = {"key1": 1, "key2": {"nested_key2": "nested_value2", "nk2": 2}}
 
         # URLs tested. In each case, PeerGroupTemplate extra attribute should be the same.
-        # PeerGroupTemplate does not support include_inherited filter param.
-        # TODO(mzb): add negative test case for not-supported include_inherited.
-        response = self.client.get(url, **self.header)
+        # PeerGroupTemplate has nothing to inherit, include_inherited returns the values of the model.
+        for _url in [url, f"{url}?include_inherited=true"]:
+            response = self.client.get(_url, **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            extra_attrs = dict(response.data["extra_attributes"])
+
+            # Ensure extra_attributes are as on the model
+            self.assertEqual(extra_attrs, pgt1_ea)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_list_objects_include_inherited(self):
+        """Test that the list accepts include_inherited and returns the values of the models."""
+        obj_perm = ObjectPermission(name="Test permission", actions=["view"])
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(self.model))
+
+        response = self.client.get(f"{self._get_list_url()}?include_inherited=true", **self.header)
         self.assertHttpStatus(response, status.HTTP_200_OK)
-        extra_attrs = dict(response.data["extra_attributes"])
+        self.assertEqual(
+            {result["name"]: result["extra_attributes"] for result in response.data["results"]},
+            {pgt.name: pgt.extra_attributes for pgt in models.PeerGroupTemplate.objects.all()},
+        )
 
-        # Ensure extra_attributes are as on the model
-        self.assertEqual(extra_attrs, pgt1_ea)
+
+class PeerGroupTemplateInstantiateAPITestCase(APITestCase):
+    """Test the PeerGroupTemplate `instantiate` API action."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.BGPRoutingInstance))
+
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        cls.routing_instances = [
+            models.BGPRoutingInstance.objects.create(
+                device=Device.objects.create(
+                    device_type=devicetype, role=devicerole, name=f"Device {i}", location=location, status=status_active
+                ),
+                autonomous_system=asn,
+                status=status_active,
+            )
+            for i in range(1, 4)
+        ]
+        cls.pgt1 = models.PeerGroupTemplate.objects.create(name="PGT1")
+        cls.pgt2 = models.PeerGroupTemplate.objects.create(name="PGT2")
+
+        # Already instantiated on the first routing instance.
+        models.PeerGroup.objects.create(
+            name="PGT1", peergroup_template=cls.pgt1, routing_instance=cls.routing_instances[0]
+        )
+
+        cls.url = reverse("plugins-api:nautobot_bgp_models-api:peergrouptemplate-instantiate")
+
+    def _add_permissions(self):
+        for model, actions in (
+            (models.PeerGroupTemplate, ["view"]),
+            (models.BGPRoutingInstance, ["view"]),
+            (models.PeerGroup, ["add"]),
+        ):
+            obj_perm = ObjectPermission(name=f"Test permission {model.__name__}", actions=actions)
+            obj_perm.save()
+            obj_perm.users.add(self.user)
+            obj_perm.object_types.add(ContentType.objects.get_for_model(model))
+
+    def test_instantiate_without_permission(self):
+        data = {"peergroup_templates": [self.pgt1.pk]}
+        response = self.client.post(self.url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(models.PeerGroup.objects.count(), 1)
+
+    def test_instantiate_all_routing_instances(self):
+        self._add_permissions()
+        data = {"peergroup_templates": [self.pgt1.pk, self.pgt2.pk]}
+        response = self.client.post(self.url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 5)
+        for routing_instance in self.routing_instances:
+            self.assertEqual(
+                set(routing_instance.peer_groups.values_list("name", "peergroup_template__name")),
+                {("PGT1", "PGT1"), ("PGT2", "PGT2")},
+            )
+
+        # Idempotent: a second run does not create anything.
+        response = self.client.post(self.url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 0)
+
+    def test_instantiate_filtered_routing_instances(self):
+        self._add_permissions()
+        data = {
+            "peergroup_templates": [self.pgt2.pk],
+            "routing_instance_filter": {"device": ["Device 1", "Device 2"]},
+        }
+        response = self.client.post(self.url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(
+            set(models.PeerGroup.objects.filter(name="PGT2").values_list("routing_instance__device__name", flat=True)),
+            {"Device 1", "Device 2"},
+        )
+
+    def test_instantiate_invalid_filter(self):
+        self._add_permissions()
+        data = {
+            "peergroup_templates": [self.pgt2.pk],
+            "routing_instance_filter": {"device": ["No Such Device"]},
+        }
+        response = self.client.post(self.url, data, format="json", **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("routing_instance_filter", response.data)
 
 
 class BGPRoutingInstanceAPITestCase(APIViewTestCases.APIViewTestCase):
@@ -304,9 +452,7 @@ class BGPRoutingInstanceAPITestCase(APIViewTestCases.APIViewTestCase):
 
         device_2_extra_attributes = {"key1": 1, "key2": {"nested_key2": "nested_value2", "nk2": 2}}
 
-        # URLs tested. In each case, BGPRoutingInstance extra attribute should be the same.
-        # PeerGroupTemplate does not support include_inherited filter param.
-        # TODO(mzb): add negative test case for not-supported include_inherited.
+        # BGPRoutingInstance does not support the include_inherited filter param.
         response = self.client.get(url, **self.header)
         self.assertHttpStatus(response, status.HTTP_200_OK)
         extra_attrs = dict(response.data["extra_attributes"])
@@ -314,6 +460,9 @@ class BGPRoutingInstanceAPITestCase(APIViewTestCases.APIViewTestCase):
         # Ensure extra_attributes are as on the model
         self.assertEqual(extra_attrs, device_2_extra_attributes)
 
+        response = self.client.get(f"{self._get_list_url()}?include_inherited=true", **self.header)
+        self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+
     @skip("Not implemented")
     def test_notes_url_on_object(self):
         pass
@@ -1075,6 +1224,24 @@ class AddressFamilyAPITestCase(APIViewTestCases.APIViewTestCase):
             "vrf": vrf.pk,
         }
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_list_objects_include_inherited(self):
+        """Test that the list accepts include_inherited and returns the values of the models."""
+        models.AddressFamily.objects.filter(afi_safi=choices.AFISAFIChoices.AFI_IPV4_UNICAST).update(
+            extra_attributes={"af_key": "af_value"}
+        )
+        obj_perm = ObjectPermission(name="Test permission", actions=["view"])
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(self.model))
+
+        response = self.client.get(f"{self._get_list_url()}?include_inherited=true", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(
+            {result["afi_safi"]: result["extra_attributes"] for result in response.data["results"]},
+            {af.afi_safi: af.extra_attributes_inherited for af in models.AddressFamily.objects.all()},
+        )
+
 
 #     @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
 #     def test_get_object_include_inherited(self):
@@ -1194,6 +1361,27 @@ class PeerGroupAddressFamilyAPITestCase(APIViewTestCases.APIViewTestCase):
             "extra_attributes": {"key2": 2},
         }
 
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_list_objects_include_inherited(self):
+        """Test that the list includes the extra attributes inherited from the routing instance address family."""
+        models.AddressFamily.objects.create(
+            routing_instance=models.BGPRoutingInstance.objects.get(),
+            afi_safi="ipv4_unicast",
+            extra_attributes={"af_key": "af_value", "key1": 0},
+        )
+        obj_perm = ObjectPermission(name="Test permission", actions=["view"])
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(self.model))
+
+        for params, expected in (
+            ("include_inherited=true", {"af_key": "af_value", "key1": 1}),
+            ("include_inherited=false", {"key1": 1}),
+        ):
+            response = self.client.get(f"{self._get_list_url()}?afi_safi=ipv4_unicast&{params}", **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertEqual([result["extra_attributes"] for result in response.data["results"]], [expected])
+
 
 class PeerEndpointAddressFamilyAPITestCase(APIViewTestCases.APIViewTestCase):
     """Test the PeerEndpointAddressFamily API."""
@@ -1380,3 +1568,876 @@ class PeerEndpointAddressFamilyAPITestCase(APIViewTestCases.APIViewTestCase):
                 "afi_safi": "vpnv4_unicast",
             },
         ]
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_list_objects_include_inherited(self):
+        """Test that the list includes the values inherited from the peer group address family."""
+        models.PeerGroupAddressFamily.objects.create(
+            peer_group=self.pes[0].peer_group,
+            afi_safi="ipv4_unicast",
+            import_policy="PG_IMPORT",
+            export_policy="PG_EXPORT",
+            multipath=True,
+            extra_attributes={"pgaf_key": "pgaf_value"},
+        )
+        obj_perm = ObjectPermission(name="Test permission", actions=["view"])
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(self.model))
+
+        url = f"{self._get_list_url()}?peer_endpoint={self.pes[0].pk}&afi_safi=ipv4_unicast"
+        for params, expected in (
+            ("include_inherited=true", ("PG_IMPORT", "PG_EXPORT", True, {"pgaf_key": "pgaf_value"})),
+            ("include_inherited=false", ("", "", None, None)),
+        ):
+            response = self.client.get(f"{url}&{params}", **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertEqual(
+                [
+                    (result["import_policy"], result["export_policy"], result["multipath"], result["extra_attributes"])
+                    for result in response.data["results"]
+                ],
+                [expected],
+            )
+
+
+class KeysetPaginationAPITestCase(APITestCase):
+    """Test the keyset pagination of the BGP list endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.status_active = Status.objects.get(name__iexact="active")
+        cls.status_planned = Status.objects.get(name__iexact="planned")
+        for status_ in (cls.status_active, cls.status_planned):
+            status_.content_types.add(ContentType.objects.get_for_model(models.Peering))
+        for i in range(7):
+            models.Peering.objects.create(status=cls.status_planned if i % 3 else cls.status_active)
+        cls.url = reverse("plugins-api:nautobot_bgp_models-api:peering-list")
+
+    def setUp(self):
+        super().setUp()
+        self.add_permissions("nautobot_bgp_models.view_peering")
+
+    def get_page(self, url):
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        return response.data
+
+    def test_pages(self):
+        """Test that following the cursors returns every record once, ordered by primary key."""
+        page = self.get_page(f"{self.url}?cursor=&limit=3")
+        self.assertNotIn("count", page)
+        self.assertIsNone(page["previous"])
+        ids = [peering["id"] for peering in page["results"]]
+        while page["next"]:
+            page = self.get_page(page["next"])
+            self.assertLessEqual(len(page["results"]), 3)
+            ids.extend(peering["id"] for peering in page["results"])
+        self.assertEqual(ids, sorted(str(pk) for pk in models.Peering.objects.values_list("pk", flat=True)))
+
+    def test_concurrent_changes(self):
+        """Test that records created or deleted between two pages don't shift the following pages."""
+        page = self.get_page(f"{self.url}?cursor=&limit=3")
+        seen = [peering["id"] for peering in page["results"]]
+        models.Peering.objects.filter(pk=seen[0]).delete()
+        created = models.Peering.objects.create(status=self.status_active)
+        remaining = [
+            str(pk) for pk in models.Peering.objects.filter(pk__gt=seen[-1]).order_by("pk").values_list("pk", flat=True)
+        ]
+
+        ids = []
+        while page["next"]:
+            page = self.get_page(page["next"])
+            ids.extend(peering["id"] for peering in page["results"])
+        self.assertEqual(ids, remaining)
+        self.assertEqual(str(created.pk) in ids, str(created.pk) > seen[-1])
+
+    def test_filters(self):
+        """Test the keyset pagination of a filtered list, seeking to each page without OFFSET."""
+        pk_column = f"{connection.ops.quote_name(models.Peering._meta.db_table)}.{connection.ops.quote_name('id')}"
+        page = self.get_page(f"{self.url}?status=Planned&cursor=&limit=2")
+        ids = [peering["id"] for peering in page["results"]]
+        while page["next"]:
+            with CaptureQueriesContext(connection) as queries:
+                page = self.get_page(page["next"])
+            ids.extend(peering["id"] for peering in page["results"])
+            self.assertTrue(any(f"{pk_column} >" in query["sql"] for query in queries))
+            self.assertFalse(any(" OFFSET " in query["sql"] for query in queries))
+        self.assertEqual(
+            ids,
+            sorted(
+                str(pk) for pk in models.Peering.objects.filter(status=self.status_planned).values_list("pk", flat=True)
+            ),
+        )
+
+    def test_offset_pagination(self):
+        """Test that the limit and offset pagination stays the default."""
+        page = self.get_page(f"{self.url}?limit=3&offset=3")
+        self.assertEqual(page["count"], 7)
+        self.assertEqual(len(page["results"]), 3)
+
+    def test_invalid_cursor(self):
+        """Test that an invalid cursor is rejected."""
+        response = self.client.get(f"{self.url}?cursor=invalid", **self.header)
+        self.assertHttpStatus(response, status.HTTP_404_NOT_FOUND)
+
+
+class SparseFieldsetsAPITestCase(APITestCase):
+    """Test the `fields` and `exclude_fields` query parameters of the BGP endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.AutonomousSystem))
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        cls.asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        template = models.PeerGroupTemplate.objects.create(name="Template", description="From the template")
+        for i in range(3):
+            device = Device.objects.create(
+                device_type=devicetype, role=devicerole, name=f"Device {i}", location=location, status=status_active
+            )
+            routing_instance = models.BGPRoutingInstance.objects.create(
+                device=device, autonomous_system=cls.asn, status=status_active
+            )
+            models.PeerGroup.objects.create(
+                name=f"Group {i}",
+                routing_instance=routing_instance,
+                peergroup_template=template,
+                extra_attributes={"ebgp_multihop": 2},
+            )
+        cls.url = reverse("plugins-api:nautobot_bgp_models-api:peergroup-list")
+
+    def setUp(self):
+        super().setUp()
+        self.add_permissions("nautobot_bgp_models.view_peergroup")
+
+    def get_results(self, query):
+        response = self.client.get(f"{self.url}?{query}", **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_fields(self):
+        """Test that only the requested fields are rendered, along with the id."""
+        for query in ("fields=name,enabled", "fields=name&fields=enabled"):
+            with self.subTest(query=query):
+                results = self.get_results(query)
+                self.assertEqual(len(results), 3)
+                for result in results:
+                    self.assertEqual(set(result), {"id", "name", "enabled"})
+
+    def test_exclude_fields(self):
+        """Test that the excluded fields are not rendered."""
+        result = self.get_results("exclude_fields=extra_attributes,tags,custom_fields")[0]
+        self.assertIn("name", result)
+        self.assertIn("routing_instance", result)
+        self.assertFalse({"extra_attributes", "tags", "custom_fields"} & set(result))
+
+    def test_deferred_columns(self):
+        """Test that the unrendered columns and related objects are not loaded."""
+        table = connection.ops.quote_name(models.PeerGroup._meta.db_table)
+        with CaptureQueriesContext(connection) as queries:
+            self.get_results("fields=name")
+        peergroup_queries = [query["sql"] for query in queries if f"FROM {table}" in query["sql"]]
+        self.assertTrue(peergroup_queries)
+        for sql in peergroup_queries:
+            self.assertNotIn(f"{table}.{connection.ops.quote_name('extra_attributes')}", sql)
+            self.assertNotIn("JOIN", sql)
+
+    def test_filters(self):
+        """Test that the parameters are combined with the filters."""
+        results = self.get_results("name=Group 1&fields=name")
+        self.assertEqual([result["name"] for result in results], ["Group 1"])
+
+    def test_include_inherited(self):
+        """Test that the inherited values are only resolved for the rendered fields."""
+        with mock.patch.object(
+            models.PeerGroup,
+            "get_inherited_field",
+            autospec=True,
+            side_effect=models.PeerGroup.get_inherited_field,
+        ) as get_inherited_field:
+            results = self.get_results("include_inherited=true&fields=description,autonomous_system")
+        self.assertEqual(
+            sorted({call.args[1] for call in get_inherited_field.call_args_list}), ["autonomous_system", "description"]
+        )
+        for result in results:
+            self.assertEqual(set(result), {"id", "description", "autonomous_system"})
+            self.assertEqual(result["description"], "From the template")
+            self.assertEqual(result["autonomous_system"]["id"], self.asn.pk)
+
+        with mock.patch.object(
+            models.PeerGroup, "extra_attributes_inherited", new_callable=mock.PropertyMock
+        ) as extra_attributes_inherited:
+            self.get_results("include_inherited=true&fields=name")
+            extra_attributes_inherited.assert_not_called()
+
+    def test_unknown_field(self):
+        """Test that unknown field names are rejected."""
+        for param in ("fields", "exclude_fields"):
+            with self.subTest(param=param):
+                response = self.client.get(f"{self.url}?{param}=name,nonexistent", **self.header)
+                self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(param, response.data)
+
+    def test_write_requests(self):
+        """Test that the responses to write requests are not trimmed."""
+        self.add_permissions("nautobot_bgp_models.change_peergroup")
+        peer_group = models.PeerGroup.objects.first()
+        response = self.client.patch(
+            f"{reverse('plugins-api:nautobot_bgp_models-api:peergroup-detail', kwargs={'pk': peer_group.pk})}"
+            "?fields=name",
+            {"description": "Updated"},
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["description"], "Updated")
+        self.assertIn("routing_instance", response.data)
+
+
+class UpsertAPITestCase(APITestCase):
+    """Test the bulk upsert of BGP records by their natural keys."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.status_active = Status.objects.get(name__iexact="active")
+        cls.status_active.content_types.add(ContentType.objects.get_for_model(models.AutonomousSystem))
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Device 1", location=location, status=cls.status_active
+        )
+
+        cls.asns = [
+            models.AutonomousSystem.objects.create(asn=asn, status=cls.status_active, description=f"AS {asn}")
+            for asn in range(65001, 65011)
+        ]
+        cls.routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device, autonomous_system=cls.asns[0], status=cls.status_active
+        )
+        cls.vrf = VRF.objects.create(name="Blue")
+        cls.peer_groups = [
+            models.PeerGroup.objects.create(name="Group", routing_instance=cls.routing_instance),
+            models.PeerGroup.objects.create(name="Group", routing_instance=cls.routing_instance, vrf=cls.vrf),
+        ]
+        cls.tag = Tag.objects.create(name="Upserted")
+        cls.tag.content_types.add(ContentType.objects.get_for_model(models.AutonomousSystem))
+
+    def setUp(self):
+        super().setUp()
+        self.add_permissions(
+            "nautobot_bgp_models.view_autonomoussystem",
+            "nautobot_bgp_models.add_autonomoussystem",
+            "nautobot_bgp_models.change_autonomoussystem",
+            "nautobot_bgp_models.view_peergroup",
+            "nautobot_bgp_models.add_peergroup",
+            "nautobot_bgp_models.change_peergroup",
+            "nautobot_bgp_models.view_bgproutinginstance",
+            "ipam.view_vrf",
+            "extras.view_status",
+            "extras.view_tag",
+        )
+
+    def upsert(self, model_name, data, expected_status=status.HTTP_200_OK):
+        url = reverse(f"plugins-api:nautobot_bgp_models-api:{model_name}-upsert")
+        response = self.client.post(url, data, format="json", **self.header)
+        self.assertHttpStatus(response, expected_status)
+        return response.data
+
+    def asn_data(self, asns):
+        return [
+            {"asn": asn.asn, "description": asn.description, "status": str(self.status_active.pk), "tags": []}
+            for asn in asns
+        ]
+
+    def test_upsert(self):
+        """Test that the new records are created and the changed records updated, the others left untouched."""
+        data = self.asn_data(self.asns[:3])
+        data[1]["description"] = "Changed"
+        data[2]["tags"] = [{"id": str(self.tag.pk)}]
+        data.append({"asn": 65100, "status": "Active"})
+        result = self.upsert("autonomoussystem", data)
+
+        created = models.AutonomousSystem.objects.get(asn=65100)
+        self.assertEqual(result["created"], [created.pk])
+        self.assertEqual(result["updated"], [self.asns[1].pk, self.asns[2].pk])
+        self.assertEqual(result["unchanged"], [self.asns[0].pk])
+        self.assertEqual(created.status, self.status_active)
+        self.assertEqual(models.AutonomousSystem.objects.get(pk=self.asns[1].pk).description, "Changed")
+        self.assertEqual(list(models.AutonomousSystem.objects.get(pk=self.asns[2].pk).tags.all()), [self.tag])
+
+    def test_no_changes(self):
+        """Test that a no-op upsert costs the same few queries regardless of the number of records, and no writes."""
+        query_counts = []
+        for count in (2, 10):
+            data = self.asn_data(self.asns[:count])
+            with CaptureQueriesContext(connection) as queries:
+                result = self.upsert("autonomoussystem", data)
+            self.assertEqual(len(result["unchanged"]), count)
+            self.assertFalse(result["created"] or result["updated"])
+            self.assertFalse(any(query["sql"].startswith(("INSERT", "UPDATE")) for query in queries))
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_nullable_key(self):
+        """Test that records are matched by a key including a null field."""
+        data = [
+            {"routing_instance": str(self.routing_instance.pk), "name": "Group", "vrf": None, "description": "Global"},
+            {"routing_instance": str(self.routing_instance.pk), "name": "Group", "vrf": str(self.vrf.pk)},
+            {"routing_instance": str(self.routing_instance.pk), "name": "Other"},
+        ]
+        result = self.upsert("peergroup", data)
+        self.assertEqual(result["updated"], [self.peer_groups[0].pk])
+        self.assertEqual(result["unchanged"], [self.peer_groups[1].pk])
+        self.assertEqual(len(result["created"]), 1)
+        self.assertEqual(models.PeerGroup.objects.get(pk=self.peer_groups[0].pk).description, "Global")
+
+    def test_invalid_data(self):
+        """Test that no record is saved when any of them is invalid, with the errors given per record."""
+        data = self.asn_data(self.asns[:2])
+        data[0]["description"] = "Changed"
+        data[1]["status"] = "No Such Status"
+        errors = self.upsert("autonomoussystem", data, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(errors), 2)
+        self.assertFalse(errors[0])
+        self.assertIn("status", errors[1])
+        self.assertEqual(models.AutonomousSystem.objects.get(pk=self.asns[0].pk).description, "AS 65001")
+
+        errors = self.upsert(
+            "autonomoussystem", [*data[:1], {"asn": "invalid"}, *data[:1]], status.HTTP_400_BAD_REQUEST
+        )
+        self.assertFalse(errors[0])
+        self.assertIn("asn", errors[1])
+        self.assertIn("non_field_errors", errors[2])
+
+        self.upsert("autonomoussystem", {"asn": 65100}, status.HTTP_400_BAD_REQUEST)
+
+    def test_permissions(self):
+        """Test that the change permission is required to update the existing records."""
+        ObjectPermission.objects.filter(actions__contains=["change"]).delete()
+        data = self.asn_data(self.asns[:1])
+        data[0]["description"] = "Changed"
+        self.upsert("autonomoussystem", data, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(models.AutonomousSystem.objects.get(pk=self.asns[0].pk).description, "AS 65001")
+
+
+class ChangesSinceAPITestCase(APITestCase):
+    """Test the feed of the BGP records changed since a watermark."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.peering = models.Peering.objects.create()
+        cls.peer_group_template = models.PeerGroupTemplate.objects.create(name="Template")
+        cls.url = reverse("plugins-api:nautobot_bgp_models-api:changes-since")
+
+    def test_changes_since(self):
+        """Test that the records modified since the watermark are returned, then not returned anymore."""
+        self.add_permissions("nautobot_bgp_models.view_peering")
+        response = self.client.get(self.url, {"since": "2000-01-01T00:00:00Z"}, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["modified"]["nautobot_bgp_models.peering"], [self.peering.pk])
+        # Restricted to the permitted records.
+        self.assertEqual(response.data["modified"]["nautobot_bgp_models.peergrouptemplate"], [])
+
+        response = self.client.get(self.url, {"since": response.data["watermark"].isoformat()}, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response.data["modified"]["nautobot_bgp_models.peering"], [])
+
+    def test_invalid_watermark(self):
+        """Test that the watermark is required."""
+        for params in ({}, {"since": "yesterday"}):
+            response = self.client.get(self.url, params, **self.header)
+            self.assertHttpStatus(response, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("since", response.data)
+
+
+class TemplatedURLAPITestCase(APITestCase):
+    """Test the hyperlinks built from URL templates."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        tag = Tag.objects.create(name="Tag")
+        tag.content_types.add(ContentType.objects.get_for_model(models.AutonomousSystem))
+        for asn in range(65000, 65005):
+            models.AutonomousSystem.objects.create(asn=asn, status=status_active).tags.add(tag)
+        cls.url = reverse("plugins-api:nautobot_bgp_models-api:autonomoussystem-list")
+
+    def setUp(self):
+        super().setUp()
+        self.add_permissions("nautobot_bgp_models.view_autonomoussystem")
+
+    def test_urls(self):
+        """Test that the URLs are the reversed ones."""
+        response = self.client.get(self.url, {"limit": 1}, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        record = response.data["results"][0]
+        asn = models.AutonomousSystem.objects.get(pk=record["id"])
+        request = response.wsgi_request
+        self.assertEqual(record["url"], request.build_absolute_uri(asn.get_absolute_url(api=True)))
+        self.assertEqual(
+            record["notes_url"],
+            request.build_absolute_uri(
+                reverse("plugins-api:nautobot_bgp_models-api:autonomoussystem-notes", args=[asn.pk])
+            ),
+        )
+        self.assertEqual(record["status"]["url"], request.build_absolute_uri(asn.status.get_absolute_url(api=True)))
+        tag = asn.tags.get()
+        self.assertEqual(record["tags"][0]["url"], request.build_absolute_uri(tag.get_absolute_url(api=True)))
+
+    def test_reverse_once_per_view(self):
+        """Test that the number of reversed URLs doesn't depend on the number of records."""
+        counts = []
+        for limit in (1, 5):
+            with mock.patch("rest_framework.reverse.django_reverse", wraps=reverse) as reverse_mock:
+                response = self.client.get(self.url, {"limit": limit}, **self.header)
+            self.assertHttpStatus(response, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), limit)
+            counts.append(reverse_mock.call_count)
+        self.assertEqual(counts[0], counts[1])
+
+
+class PeeringEndpointsAPITestCase(APITestCase):
+    """Test the summaries of the Peer Endpoints included in the Peerings."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        namespace = Namespace.objects.first()
+        Prefix.objects.create(
+            prefix="10.2.0.0/16", namespace=namespace, status=Status.objects.get_for_model(Prefix).first()
+        )
+        manufacturer = Manufacturer.objects.create(name="Endpoints Manufacturer")
+        device_role = Role.objects.create(name="Endpoints Router")
+        device_role.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=DeviceType.objects.create(manufacturer=manufacturer, model="Endpoints Model"),
+            role=device_role,
+            name="Endpoints Device",
+            location=Location.objects.create(
+                name="Endpoints Site",
+                location_type=LocationType.objects.create(name="Endpoints Site Type"),
+                status=Status.objects.get_for_model(Location).first(),
+            ),
+            status=status_active,
+        )
+        routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device,
+            autonomous_system=models.AutonomousSystem.objects.create(asn=65000, status=status_active),
+            status=status_active,
+        )
+        peer_group = models.PeerGroup.objects.create(
+            name="Endpoints Group",
+            routing_instance=routing_instance,
+            source_ip=IPAddress.objects.create(address="10.2.0.1/32", status=status_active, namespace=namespace),
+        )
+        remote_asn = models.AutonomousSystem.objects.create(asn=65001, status=status_active)
+        for index in range(4):
+            peering = models.Peering.objects.create(status=status_active)
+            models.PeerEndpoint.objects.create(
+                routing_instance=routing_instance, peer_group=peer_group, peering=peering
+            )
+            models.PeerEndpoint.objects.create(
+                source_ip=IPAddress.objects.create(
+                    address=f"10.2.1.{index}/32", status=status_active, namespace=namespace
+                ),
+                autonomous_system=remote_asn,
+                peering=peering,
+            )
+        cls.url = reverse("plugins-api:nautobot_bgp_models-api:peering-list")
+
+    def setUp(self):
+        super().setUp()
+        self.add_permissions("nautobot_bgp_models.view_peering")
+
+    def get(self, **params):
+        response = self.client.get(self.url, params, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_opt_in(self):
+        """Test that the endpoints are only included on request, and that the display is the string representation."""
+        for record in self.get():
+            self.assertNotIn("endpoints", record)
+            self.assertEqual(record["display"], str(models.Peering.objects.get(pk=record["id"])))
+
+    def test_endpoints(self):
+        """Test the effective values of the included endpoints."""
+        self.add_permissions("nautobot_bgp_models.view_peerendpoint")
+        for record in self.get(include="endpoints"):
+            peering = models.Peering.objects.get(pk=record["id"])
+            self.assertEqual(
+                [endpoint["id"] for endpoint in record["endpoints"]], [peering.endpoint_a.pk, peering.endpoint_z.pk]
+            )
+            local, remote = sorted(record["endpoints"], key=lambda endpoint: endpoint["device"] is None)
+            self.assertEqual(local["device"], "Endpoints Device")
+            self.assertEqual(local["peer_group"], "Endpoints Group")
+            self.assertEqual(local["local_ip"], "10.2.0.1/32")
+            self.assertEqual(local["autonomous_system"], 65000)
+            self.assertIsNone(remote["device"])
+            self.assertIsNone(remote["peer_group"])
+            self.assertTrue(remote["local_ip"].startswith("10.2.1."))
+            self.assertEqual(remote["autonomous_system"], 65001)
+            self.assertTrue(
+                remote["url"].endswith(models.PeerEndpoint.objects.get(pk=remote["id"]).get_absolute_url(api=True))
+            )
+            self.assertEqual(record["display"], str(peering))
+
+    def test_constant_queries(self):
+        """Test that the number of queries doesn't depend on the number of Peerings."""
+        self.add_permissions("nautobot_bgp_models.view_peerendpoint")
+        self.get(include="endpoints", limit=1)
+        counts = []
+        for limit in (1, 4):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(len(self.get(include="endpoints", limit=limit)), limit)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_restricted_endpoints(self):
+        """Test that only the endpoints visible to the user are included."""
+        for record in self.get(include="endpoints"):
+            self.assertEqual(record["endpoints"], [])
+
+
+class ResolveAPITestCase(APITestCase):
+    """Test the bulk resolution of the inherited values."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        namespace = Namespace.objects.first()
+        Prefix.objects.create(
+            prefix="10.3.0.0/16", namespace=namespace, status=Status.objects.get_for_model(Prefix).first()
+        )
+        manufacturer = Manufacturer.objects.create(name="Resolve Manufacturer")
+        device_role = Role.objects.create(name="Resolve Router")
+        device_role.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=DeviceType.objects.create(manufacturer=manufacturer, model="Resolve Model"),
+            role=device_role,
+            name="Resolve Device",
+            location=Location.objects.create(
+                name="Resolve Site",
+                location_type=LocationType.objects.create(name="Resolve Site Type"),
+                status=Status.objects.get_for_model(Location).first(),
+            ),
+            status=status_active,
+        )
+        routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device,
+            autonomous_system=models.AutonomousSystem.objects.create(asn=65000, status=status_active),
+            status=status_active,
+            extra_attributes={"routing_instance": True, "shared": {"b": "routing_instance"}},
+        )
+        models.AddressFamily.objects.create(
+            routing_instance=routing_instance,
+            afi_safi=choices.AFISAFIChoices.AFI_IPV4_UNICAST,
+            extra_attributes={"address_family": True, "shared": {"a": "address_family"}},
+        )
+        template = models.PeerGroupTemplate.objects.create(
+            name="Resolve Template",
+            description="Template",
+            enabled=True,
+            extra_attributes={"template": True, "shared": {"b": "template"}},
+        )
+        peer_group = models.PeerGroup.objects.create(
+            name="Resolve Group",
+            routing_instance=routing_instance,
+            peergroup_template=template,
+            source_ip=IPAddress.objects.create(address="10.3.0.1/32", status=status_active, namespace=namespace),
+            extra_attributes={"shared": {"a": "peer_group"}},
+        )
+        models.PeerGroupAddressFamily.objects.create(
+            peer_group=peer_group,
+            afi_safi=choices.AFISAFIChoices.AFI_IPV4_UNICAST,
+            import_policy="IMPORT",
+            extra_attributes={"peer_group_address_family": True, "shared": {"b": "peer_group_address_family"}},
+        )
+        cls.peer_endpoints = [
+            models.PeerEndpoint.objects.create(
+                routing_instance=routing_instance,
+                peer_group=peer_group,
+                peering=models.Peering.objects.create(status=status_active),
+                description=f"Endpoint {index}" if index else "",
+                extra_attributes={"peer_endpoint": index},
+            )
+            for index in range(3)
+        ]
+        for peer_endpoint in cls.peer_endpoints:
+            models.PeerEndpointAddressFamily.objects.create(
+                peer_endpoint=peer_endpoint,
+                afi_safi=choices.AFISAFIChoices.AFI_IPV4_UNICAST,
+                export_policy="EXPORT",
+                extra_attributes={"shared": {"a": "peer_endpoint_address_family"}},
+            )
+
+    @staticmethod
+    def get_url(model):
+        return reverse(f"plugins-api:nautobot_bgp_models-api:{model._meta.model_name}-resolve")
+
+    def resolve(self, model, ids, expected_status=status.HTTP_200_OK):
+        response = self.client.post(self.get_url(model), {"ids": ids}, format="json", **self.header)
+        self.assertHttpStatus(response, expected_status)
+        return response.data
+
+    def test_resolve(self):
+        """Test that the resolved values are the ones inherited by the records."""
+        for model in (models.PeerGroup, models.PeerEndpoint, models.PeerEndpointAddressFamily):
+            with self.subTest(model=model.__name__):
+                self.add_permissions(f"nautobot_bgp_models.view_{model._meta.model_name}")
+                instances = list(model.objects.all())
+                data = self.resolve(model, [instance.pk for instance in instances])
+                self.assertEqual(data["missing"], [])
+                self.assertEqual([record["id"] for record in data["results"]], [instance.pk for instance in instances])
+                for instance, record in zip(instances, data["results"]):
+                    self.assertEqual(record["object_type"], model._meta.label_lower)
+                    self.assertTrue(record["url"].endswith(instance.get_absolute_url(api=True)))
+                    self.assertEqual(record["extra_attributes"], instance.extra_attributes_inherited)
+                    for field_name in model.property_inheritance:
+                        value = instance.get_inherited_field(field_name)[0]
+                        if isinstance(record[field_name], dict):
+                            self.assertEqual(record[field_name]["id"], value.pk)
+                        else:
+                            self.assertEqual(record[field_name], value)
+
+    def test_resolved_values(self):
+        """Test the values resolved through every level of inheritance."""
+        self.add_permissions(
+            "nautobot_bgp_models.view_peerendpoint", "nautobot_bgp_models.view_peerendpointaddressfamily"
+        )
+        peer_endpoint = self.peer_endpoints[0]
+        record = self.resolve(models.PeerEndpoint, [peer_endpoint.pk])["results"][0]
+        self.assertEqual(record["autonomous_system"]["id"], peer_endpoint.routing_instance.autonomous_system.pk)
+        self.assertEqual(record["description"], "Template")
+        self.assertTrue(record["enabled"])
+        self.assertEqual(record["source_ip"]["id"], peer_endpoint.peer_group.source_ip.pk)
+        self.assertEqual(
+            record["extra_attributes"],
+            {
+                "routing_instance": True,
+                "shared": {"a": "peer_group", "b": "routing_instance"},
+                "template": True,
+                "peer_endpoint": 0,
+            },
+        )
+
+        address_family = peer_endpoint.address_families.get()
+        record = self.resolve(models.PeerEndpointAddressFamily, [address_family.pk])["results"][0]
+        self.assertEqual(record["import_policy"], "IMPORT")
+        self.assertEqual(record["export_policy"], "EXPORT")
+        self.assertEqual(
+            record["extra_attributes"],
+            {
+                "peer_group_address_family": True,
+                "shared": {"a": "peer_endpoint_address_family", "b": "peer_group_address_family"},
+                "address_family": True,
+            },
+        )
+
+    def test_constant_queries(self):
+        """Test that the number of queries doesn't depend on the number of records."""
+        self.add_permissions("nautobot_bgp_models.view_peerendpointaddressfamily")
+        ids = list(models.PeerEndpointAddressFamily.objects.values_list("pk", flat=True))
+        self.resolve(models.PeerEndpointAddressFamily, ids[:1])
+        counts = []
+        for count in (1, 3):
+            with CaptureQueriesContext(connection) as queries:
+                self.resolve(models.PeerEndpointAddressFamily, ids[:count])
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_missing(self):
+        """Test that the unknown and duplicate IDs are reported, in the order of the request."""
+        self.add_permissions("nautobot_bgp_models.view_peerendpoint")
+        unknown = uuid.uuid4()
+        ids = [unknown, self.peer_endpoints[1].pk, self.peer_endpoints[0].pk, self.peer_endpoints[1].pk]
+        data = self.resolve(models.PeerEndpoint, ids)
+        self.assertEqual([record["id"] for record in data["results"]], ids[1:3])
+        self.assertEqual(data["missing"], [unknown])
+
+    def test_permissions(self):
+        """Test that the records which aren't viewable by the user are missing."""
+        ids = [peer_endpoint.pk for peer_endpoint in self.peer_endpoints]
+        self.resolve(models.PeerEndpoint, ids, status.HTTP_403_FORBIDDEN)
+
+        permission = ObjectPermission.objects.create(
+            name="Resolve permission", actions=["view"], constraints={"pk": str(ids[0])}
+        )
+        permission.users.add(self.user)
+        permission.object_types.add(ContentType.objects.get_for_model(models.PeerEndpoint))
+        data = self.resolve(models.PeerEndpoint, ids)
+        self.assertEqual([record["id"] for record in data["results"]], ids[:1])
+        self.assertEqual(data["missing"], ids[1:])
+
+    def test_invalid(self):
+        """Test that an empty list and IDs which aren't UUIDs are rejected."""
+        self.add_permissions("nautobot_bgp_models.view_peerendpoint")
+        self.resolve(models.PeerEndpoint, [], status.HTTP_400_BAD_REQUEST)
+        self.resolve(models.PeerEndpoint, ["Endpoint"], status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    PLUGINS_CONFIG={
+        **settings.PLUGINS_CONFIG,
+        "nautobot_bgp_models": {**settings.PLUGINS_CONFIG["nautobot_bgp_models"], "api_cache_ttl": 60},
+    }
+)
+class CachedResponseAPITestCase(APITestCase):
+    """Test the cache of the REST API responses of the read-mostly BGP models."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        cls.asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active, description="First")
+        models.AutonomousSystem.objects.create(asn=65001, status=status_active)
+        cls.list_url = reverse("plugins-api:nautobot_bgp_models-api:autonomoussystem-list")
+        cls.detail_url = reverse(
+            "plugins-api:nautobot_bgp_models-api:autonomoussystem-detail", kwargs={"pk": cls.asn.pk}
+        )
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.add_permissions("nautobot_bgp_models.view_autonomoussystem")
+
+    def get(self, url, **params):
+        response = self.client.get(url, params, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        return response.data
+
+    def test_cache_hit(self):
+        """Test that a cached response is served without querying the BGP tables."""
+        data = self.get(self.list_url)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(self.list_url), data)
+        self.assertFalse(any("nautobot_bgp_models_" in query["sql"] for query in queries))
+
+        # Each query string is cached separately.
+        self.assertEqual(self.get(self.list_url, asn=65001)["count"], 1)
+
+    def test_invalidated_on_change(self):
+        """Test that changing a record discards the cached responses of its model."""
+        self.assertEqual(self.get(self.detail_url)["description"], "First")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.asn.description = "Second"
+            self.asn.validated_save()
+        self.assertEqual(self.get(self.detail_url)["description"], "Second")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            models.AutonomousSystem.objects.filter(asn=65001).delete()
+        self.assertEqual(self.get(self.list_url)["count"], 1)
+
+    def test_disabled(self):
+        """Test that the changes don't discard any cached response while the cache is disabled."""
+        app_settings = {**settings.PLUGINS_CONFIG["nautobot_bgp_models"], "api_cache_ttl": 0}
+        with override_settings(PLUGINS_CONFIG={**settings.PLUGINS_CONFIG, "nautobot_bgp_models": app_settings}):
+            with mock.patch.object(caching, "invalidate") as invalidate:
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.asn.description = "Second"
+                    self.asn.validated_save()
+                    ObjectPermission.objects.get(users=self.user).delete()
+        invalidate.assert_not_called()
+
+    def test_invalidated_on_commit(self):
+        """Test that the cached responses are discarded once the change is committed, not before."""
+        self.assertEqual(self.get(self.detail_url)["description"], "First")
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                self.asn.description = "Second"
+                self.asn.validated_save()
+                version = caching.get_version(models.AutonomousSystem)
+                # A response cached before the commit, here the previous one, is discarded by the commit
+                self.assertEqual(self.get(self.detail_url)["description"], "First")
+            self.assertEqual(caching.get_version(models.AutonomousSystem), version)
+        self.assertTrue(callbacks)
+        self.assertNotEqual(caching.get_version(models.AutonomousSystem), version)
+        self.assertEqual(self.get(self.detail_url)["description"], "Second")
+
+    def test_invalidated_by_rendered_model(self):
+        """Test that changing a record rendered in the responses of another model discards them."""
+        self.add_permissions("nautobot_bgp_models.view_autonomoussystemrange")
+        self.assertEqual(self.get(self.detail_url, include="autonomous_system_ranges")["autonomous_system_ranges"], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            models.AutonomousSystemRange.objects.create(name="Range", asn_min=64512, asn_max=65534)
+        ranges = self.get(self.detail_url, include="autonomous_system_ranges")["autonomous_system_ranges"]
+        self.assertEqual(len(ranges), 1)
+
+    def test_invalidated_by_rendered_nautobot_model(self):
+        """Test that renaming the Device of the routing instance of an AddressFamily discards its cached responses."""
+        self.add_permissions("nautobot_bgp_models.view_addressfamily")
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.BGPRoutingInstance))
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Device 1", location=location, status=status_active
+        )
+        routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device, autonomous_system=self.asn, status=status_active
+        )
+        models.AddressFamily.objects.create(routing_instance=routing_instance, afi_safi="ipv4_unicast")
+        url = reverse("plugins-api:nautobot_bgp_models-api:addressfamily-list")
+        self.assertIn("Device 1", self.get(url, depth=1)["results"][0]["routing_instance"]["display"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            device.name = "Renamed Device"
+            device.save()
+        self.assertIn("Renamed Device", self.get(url, depth=1)["results"][0]["routing_instance"]["display"])
+
+    def test_invalidated_on_permission_change(self):
+        """Test that the cached responses are discarded when the permissions change."""
+        self.assertEqual(self.get(self.list_url)["count"], 2)
+        permission = ObjectPermission.objects.get(users=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            permission.constraints = {"asn": 65000}
+            permission.save()
+        self.assertEqual(self.get(self.list_url)["count"], 1)
+
+    def test_invalidated_on_group_change(self):
+        """Test that the cached responses are discarded when the user is removed from a group."""
+        ObjectPermission.objects.get(users=self.user).delete()
+        group = Group.objects.create(name="BGP Readers")
+        broad_permission = ObjectPermission.objects.create(name="All ASNs", actions=["view"])
+        broad_permission.object_types.add(ContentType.objects.get_for_model(models.AutonomousSystem))
+        broad_permission.groups.add(group)
+        narrow_permission = ObjectPermission.objects.create(
+            name="ASN 65000", actions=["view"], constraints={"asn": 65000}
+        )
+        narrow_permission.object_types.add(ContentType.objects.get_for_model(models.AutonomousSystem))
+        narrow_permission.users.add(self.user)
+        self.user.groups.add(group)
+        self.assertEqual(self.get(self.list_url)["count"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.remove(group)
+        self.assertEqual(self.get(self.list_url)["count"], 1)
+
+    def test_superuser_change(self):
+        """Test that the responses cached for a superuser aren't served once they are no longer superuser."""
+        ObjectPermission.objects.get(users=self.user).delete()
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertEqual(self.get(self.list_url)["count"], 2)
+
+        self.add_permissions("nautobot_bgp_models.view_autonomoussystem")
+        ObjectPermission.objects.filter(users=self.user).update(constraints={"asn": 65000})
+        self.user.is_superuser = False
+        self.user.save()
+        self.assertEqual(self.get(self.list_url)["count"], 1)
@@ -0,0 +1,186 @@
+"""Unit test automation for the integrity audit of nautobot_bgp_models."""
+
+import csv
+import io
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from nautobot.dcim.models import Device, DeviceType, Interface, Location, LocationType, Manufacturer
+from nautobot.extras.models import Role, Status
+from nautobot.ipam.models import VRF, IPAddress, Namespace, Prefix
+
+from nautobot_bgp_models import models
+from nautobot_bgp_models.audit import CHECKS, REPORT_FIELDS, render_report, run_audit
+
+
+class AuditTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
+    """Test the set-based integrity audit."""
+
+    @classmethod
+    def setUpTestData(cls):  # pylint: disable=too-many-locals, too-many-statements
+        """One-time class data setup."""
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.Peering))
+        interface_status = Status.objects.get_for_model(Interface).first()
+
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device_1, device_2 = (
+            Device.objects.create(
+                device_type=devicetype, role=devicerole, name=f"Device {i}", location=location, status=status_active
+            )
+            for i in (1, 2)
+        )
+
+        namespace = Namespace.objects.first()
+        prefix_status = Status.objects.get_for_model(Prefix).first()
+        cls.vrf = VRF.objects.create(name="VRF", namespace=namespace)
+        Prefix.objects.create(prefix="10.0.0.0/8", namespace=namespace, status=prefix_status)
+        vrf_prefix = Prefix.objects.create(prefix="192.168.0.0/16", namespace=namespace, status=prefix_status)
+        vrf_prefix.vrfs.add(cls.vrf)
+        ip_1, ip_2, ip_3, vrf_ip = (
+            IPAddress.objects.create(address=address, status=status_active, namespace=namespace)
+            for address in ("10.0.0.1/32", "10.0.0.2/32", "10.0.0.3/32", "192.168.0.1/32")
+        )
+        interface_1 = Interface.objects.create(device=device_1, name="Loopback1", status=interface_status)
+        interface_1.add_ip_addresses(ip_1)
+        Interface.objects.create(device=device_1, name="Loopback2", status=interface_status).add_ip_addresses(vrf_ip)
+        interface_2 = Interface.objects.create(device=device_2, name="Loopback1", status=interface_status)
+        interface_2.add_ip_addresses(ip_2)
+
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        ri_1 = models.BGPRoutingInstance.objects.create(device=device_1, autonomous_system=asn, status=status_active)
+        ri_2 = models.BGPRoutingInstance.objects.create(device=device_2, autonomous_system=asn, status=status_active)
+
+        def endpoint(**kwargs):
+            return models.PeerEndpoint.objects.create(**kwargs)
+
+        # Valid Peering, IP inherited from the only IP of the source interface and from the Peer Group.
+        cls.valid_peering = models.Peering.objects.create(status=status_active)
+        pg_2 = models.PeerGroup.objects.create(name="PG", routing_instance=ri_2, source_ip=ip_2)
+        cls.valid_endpoints = [
+            endpoint(peering=cls.valid_peering, routing_instance=ri_1, source_interface=interface_1),
+            endpoint(peering=cls.valid_peering, routing_instance=ri_2, peer_group=pg_2),
+        ]
+
+        # IP of another device, endpoint without ASN.
+        peering = models.Peering.objects.create(status=status_active)
+        cls.ip_not_on_device = endpoint(peering=peering, routing_instance=ri_1, source_ip=ip_2)
+        cls.missing_asn = endpoint(peering=peering, source_ip=ip_3)
+
+        # Same routing instance and same IP on both sides, endpoint without IP.
+        cls.same_ri_and_ip = models.Peering.objects.create(status=status_active)
+        endpoint(peering=cls.same_ri_and_ip, routing_instance=ri_1, source_ip=ip_1)
+        endpoint(peering=cls.same_ri_and_ip, routing_instance=ri_1, source_ip=ip_1)
+        cls.missing_ip = endpoint(peering=models.Peering.objects.create(status=status_active), routing_instance=ri_2)
+
+        # Peer Groups in a VRF.
+        cls.pg_interface_vrf = models.PeerGroup.objects.create(
+            name="PG interface", routing_instance=ri_1, vrf=cls.vrf, source_interface=interface_1
+        )
+        cls.pg_ip_vrf = models.PeerGroup.objects.create(
+            name="PG IP", routing_instance=ri_1, vrf=cls.vrf, source_ip=ip_1
+        )
+        cls.pg_ip_not_on_device = models.PeerGroup.objects.create(
+            name="PG remote IP", routing_instance=ri_1, source_ip=ip_2
+        )
+        pg_vrf = models.PeerGroup.objects.create(name="PG VRF", routing_instance=ri_1, vrf=cls.vrf)
+        cls.vrf_mismatch = endpoint(
+            peering=models.Peering.objects.create(status=status_active),
+            routing_instance=ri_1,
+            peer_group=pg_vrf,
+            source_ip=ip_1,
+        )
+        endpoint(
+            peering=models.Peering.objects.create(status=status_active),
+            routing_instance=ri_1,
+            peer_group=pg_vrf,
+            source_ip=vrf_ip,
+        )
+
+    def test_run_audit(self):
+        """Test that every check reports the expected objects in a single query."""
+        with self.assertNumQueries(len(CHECKS)):
+            findings = run_audit()
+
+        reported = {}
+        for finding in findings:
+            reported.setdefault(finding["check"], set()).add(finding["id"])
+        self.assertEqual(
+            reported,
+            {
+                "endpoint_missing_asn": {str(self.missing_asn.pk)},
+                "endpoint_missing_ip": {str(self.missing_ip.pk)},
+                "endpoint_ip_not_on_device": {str(self.ip_not_on_device.pk)},
+                "endpoint_vrf_mismatch": {str(self.vrf_mismatch.pk)},
+                "peer_group_interface_vrf_mismatch": {str(self.pg_interface_vrf.pk)},
+                "peer_group_ip_not_on_device": {str(self.pg_ip_not_on_device.pk)},
+                "peer_group_ip_vrf_mismatch": {str(self.pg_ip_vrf.pk)},
+                "peering_same_routing_instance": {str(self.same_ri_and_ip.pk)},
+                "peering_same_ip": {str(self.same_ri_and_ip.pk)},
+            },
+        )
+
+    def test_run_audit_matches_clean(self):
+        """Test that the endpoints and peer groups reported are exactly those failing model validation."""
+        findings = run_audit()
+        for model in (models.PeerEndpoint, models.PeerGroup):
+            label = f"nautobot_bgp_models.{model._meta.model_name}"
+            invalid = set()
+            for obj in model.objects.all():
+                try:
+                    obj.clean()
+                except ValidationError:
+                    invalid.add(str(obj.pk))
+            self.assertEqual({finding["id"] for finding in findings if finding["model"] == label}, invalid)
+
+        self.assertEqual(len(self.valid_peering.endpoints.all()), 2)
+        self.valid_peering.validate_peers()
+        with self.assertRaises(ValidationError):
+            self.same_ri_and_ip.validate_peers()
+
+    def test_run_audit_checks(self):
+        """Test running a subset of the checks."""
+        findings = run_audit(["endpoint_missing_asn"])
+        self.assertEqual(
+            findings,
+            [
+                {
+                    "check": "endpoint_missing_asn",
+                    "model": "nautobot_bgp_models.peerendpoint",
+                    "id": str(self.missing_asn.pk),
+                    "device": "",
+                    "message": CHECKS["endpoint_missing_asn"][2],
+                }
+            ],
+        )
+
+    def test_render_report(self):
+        """Test the JSON and CSV reports."""
+        findings = run_audit()
+
+        report = json.loads(render_report(findings, "json"))
+        self.assertEqual(report["findings"], findings)
+        self.assertEqual(report["summary"]["peering_same_ip"], 1)
+
+        rows = list(csv.DictReader(io.StringIO(render_report(findings, "csv"))))
+        self.assertEqual(rows, findings)
+        self.assertEqual(list(rows[0]), REPORT_FIELDS)
+
+        with self.assertRaises(ValueError):
+            render_report(findings, "xml")
+
+    def test_management_command(self):
+        """Test the audit_bgp_models management command."""
+        output = io.StringIO()
+        call_command("audit_bgp_models", "--format", "csv", "--check", "peering_same_ip", stdout=output)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual([row["id"] for row in rows], [str(self.same_ri_and_ip.pk)])
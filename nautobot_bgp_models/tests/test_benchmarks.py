@@ -0,0 +1,34 @@
+"""Query budget checks of the benchmark scenarios of nautobot_bgp_models."""
+
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from nautobot_bgp_models.benchmarks import SCENARIOS, run_benchmarks
+
+
+class BenchmarkQueryBudgetsTestCase(TestCase):
+    """Run every benchmark scenario on a small generated dataset and enforce its SQL query budget."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Generate at least one page of each BGP model."""
+        call_command(
+            "generate_bgp_test_data",
+            "--scale",
+            "--devices=10",
+            "--peer-groups=5",
+            "--endpoints=100",
+            "--address-families=1",
+            "--seed=benchmarks",
+            stdout=io.StringIO(),
+        )
+
+    def test_query_budgets(self):
+        """Test that no scenario exceeds its query budget. Wall time budgets depend on the hardware."""
+        results = run_benchmarks(repeat=2, time_factor=None)
+        self.assertEqual([result["scenario"] for result in results], list(SCENARIOS))
+        for result in results:
+            with self.subTest(scenario=result["scenario"]):
+                self.assertTrue(result["passed"], result)
@@ -0,0 +1,131 @@
+"""Unit test automation for the columnar export of nautobot_bgp_models."""
+
+import tempfile
+from unittest import mock, skipUnless
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from nautobot.dcim.models import Device, DeviceType, Interface, Location, LocationType, Manufacturer
+from nautobot.extras.models import Role, Status
+from nautobot.ipam.models import IPAddress, Namespace, Prefix
+
+from nautobot_bgp_models import export, models
+from nautobot_bgp_models.choices import AFISAFIChoices
+
+
+class ExportSessionsTestCase(TestCase):
+    """Test the export of the BGP sessions with the effective values of their endpoints."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """One-time class data setup."""
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.Peering))
+        interface_status = Status.objects.get_for_model(Interface).first()
+
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        cls.peeringrole = Role.objects.create(name="Export Peer", color="00ff00")
+        cls.peeringrole.content_types.add(ContentType.objects.get_for_model(models.PeerEndpoint))
+        device_1, device_2 = (
+            Device.objects.create(
+                device_type=devicetype, role=devicerole, name=f"Device {i}", location=location, status=status_active
+            )
+            for i in (1, 2)
+        )
+
+        namespace = Namespace.objects.first()
+        Prefix.objects.create(
+            prefix="10.0.0.0/8", namespace=namespace, status=Status.objects.get_for_model(Prefix).first()
+        )
+        ip_1, ip_2 = (
+            IPAddress.objects.create(address=address, status=status_active, namespace=namespace)
+            for address in ("10.0.0.1/32", "10.0.0.2/32")
+        )
+        interface = Interface.objects.create(device=device_2, name="Loopback1", status=interface_status)
+        interface.add_ip_addresses(ip_2)
+
+        asn_1 = models.AutonomousSystem.objects.create(asn=65001, status=status_active)
+        asn_2 = models.AutonomousSystem.objects.create(asn=65002, status=status_active)
+        ri_1 = models.BGPRoutingInstance.objects.create(device=device_1, autonomous_system=asn_1, status=status_active)
+        ri_2 = models.BGPRoutingInstance.objects.create(device=device_2, autonomous_system=asn_2, status=status_active)
+        peer_group = models.PeerGroup.objects.create(name="Group", routing_instance=ri_2, source_interface=interface)
+        models.PeerGroupAddressFamily.objects.create(peer_group=peer_group, afi_safi=AFISAFIChoices.AFI_IPV4_UNICAST)
+
+        cls.peerings = sorted(
+            (models.Peering.objects.create(status=status_active) for _ in range(3)), key=lambda p: p.pk
+        )
+        cls.endpoints = []
+        for peering in cls.peerings[:2]:
+            endpoint_1 = models.PeerEndpoint.objects.create(
+                peering=peering, routing_instance=ri_1, source_ip=ip_1, role=cls.peeringrole
+            )
+            models.PeerEndpointAddressFamily.objects.create(
+                peer_endpoint=endpoint_1, afi_safi=AFISAFIChoices.AFI_IPV6_UNICAST
+            )
+            endpoint_2 = models.PeerEndpoint.objects.create(
+                peering=peering, routing_instance=ri_2, peer_group=peer_group
+            )
+            cls.endpoints.append(sorted([endpoint_1, endpoint_2], key=lambda e: e.pk))
+
+    def test_iter_session_batches(self):
+        """Test the rows, by batches, with the effective values of both endpoints."""
+        # AS and roles, 5 per batch (no IP addresses to look up for the last Peering, without endpoints), final empty batch
+        with self.assertNumQueries(2 + 5 + 4 + 1):
+            batches = list(export.iter_session_batches(batch_size=2))
+        self.assertEqual([len(batch["peering_id"]) for batch in batches], [2, 1])
+        rows = [dict(zip(batch, values)) for batch in batches for values in zip(*batch.values())]
+        self.assertEqual([row["peering_id"] for row in rows], [str(peering.pk) for peering in self.peerings])
+        self.assertEqual(set(rows[0]), set(export.SESSION_COLUMNS))
+
+        for row, peering in zip(rows, self.peerings):
+            self.assertEqual(row["status"], "Active")
+            endpoints = [endpoint for pair in self.endpoints for endpoint in pair if endpoint.peering == peering]
+            if not endpoints:
+                self.assertTrue(all(row[f"{side}_endpoint_id"] is None for side in ("a", "z")))
+                continue
+            for side, endpoint in zip(("a", "z"), endpoints):
+                self.assertEqual(row[f"{side}_endpoint_id"], str(endpoint.pk))
+                if endpoint.peer_group:
+                    expected = ("Device 2", "10.0.0.2/32", 65002, "Group", None, ["ipv4_unicast"])
+                else:
+                    expected = ("Device 1", "10.0.0.1/32", 65001, None, "Export Peer", ["ipv6_unicast"])
+                self.assertEqual(
+                    tuple(
+                        row[f"{side}_{name}"]
+                        for name in ("device", "local_ip", "asn", "peer_group", "role", "address_families")
+                    ),
+                    expected,
+                )
+
+    @skipUnless(export.PYARROW_AVAILABLE, "pyarrow is not installed")
+    def test_export_sessions(self):
+        """Test the Parquet and Arrow files."""
+        import pyarrow.ipc  # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+
+        with tempfile.NamedTemporaryFile(suffix=".parquet") as output:
+            self.assertEqual(export.export_sessions(output.name, "parquet", batch_size=2), 3)
+            table = pyarrow.parquet.read_table(output.name)
+        self.assertEqual(table.column_names, list(export.SESSION_COLUMNS))
+        self.assertEqual(table.num_rows, 3)
+
+        with tempfile.NamedTemporaryFile(suffix=".arrow") as output:
+            self.assertEqual(export.export_sessions(output.name, "arrow"), 3)
+            table = pyarrow.ipc.open_file(output.name).read_all()
+        self.assertEqual(
+            table.column("a_asn").to_pylist()[:2],
+            [65002 if endpoint_a.peer_group else 65001 for endpoint_a, _ in self.endpoints],
+        )
+
+    @mock.patch.object(export, "PYARROW_AVAILABLE", False)
+    def test_management_command_without_pyarrow(self):
+        """Test that the missing optional dependency is reported."""
+        with self.assertRaisesRegex(CommandError, "pyarrow"):
+            call_command("export_bgp_sessions", "sessions.parquet")
@@ -1,6 +1,7 @@
 """Unit test automation for FilterSet classes in nautobot_bgp_models."""
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.test import TestCase
 
 # from nautobot.circuits.models import Provider
@@ -92,6 +93,34 @@ class AutonomousSystemTestCase(FilterTestCases.FilterTestCase):
         self.assertEqual(self.filterset({"q": "420"}, self.queryset).qs.count(), 3)
         self.assertEqual(self.filterset({"q": "another"}, self.queryset).qs.count(), 1)
 
+    def test_search_asn(self):
+        """Test searching ASNs in asplain, asdot and range notations."""
+        for value, expected in (
+            ("4200000001", [4200000001]),
+            ("AS 4200000002", [4200000002]),
+            ("64086.59905", [4200000001]),
+            ("4200000001-4200000002", [4200000001, 4200000002]),
+            ("64086.59904-4200000001", [4200000000, 4200000001]),
+            ("4200000009", []),
+            ("20000000", []),
+            ("²", []),
+        ):
+            with self.subTest(value=value):
+                self.assertEqual(
+                    list(self.filterset({"q": value}, self.queryset).qs.values_list("asn", flat=True)), expected
+                )
+
+    def test_search_asn_query(self):
+        """Test that ASNs are matched with range predicates rather than a text match."""
+        sql = str(self.filterset({"q": "65000"}, self.queryset).qs.query)
+        where = sql.split(" WHERE ", 1)[1].split(" ORDER BY ", 1)[0]
+        column = (
+            f"{connection.ops.quote_name(models.AutonomousSystem._meta.db_table)}.{connection.ops.quote_name('asn')}"
+        )
+        self.assertIn(f"{column} >= 65000", where)
+        # The ASN column is only compared, never cast to text.
+        self.assertEqual(where.count(column), where.count(f"{column} >= ") + where.count(f"{column} <= "))
+
     def test_asn_range(self):
         """Test filtering by ASN Range."""
         params = {"autonomous_system_range": [self.asn_range.pk]}
@@ -136,6 +165,13 @@ class AutonomousSystemRangeTestCase(FilterTestCases.FilterTestCase):
         """Test filtering by Q search value."""
         self.assertEqual(self.filterset({"q": "DC"}, self.queryset).qs.count(), 2)
 
+    def test_search_asn(self):
+        """Test searching the ranges containing an ASN or overlapping an ASN range."""
+        self.assertEqual(list(self.filterset({"q": "110"}, self.queryset).qs), [self.asn_range_1])
+        self.assertEqual(
+            list(self.filterset({"q": "1500-2500"}, self.queryset).qs), [self.asn_range_2, self.asn_range_3]
+        )
+
 
 class BGPRoutingInstanceTestCase(FilterTestCases.FilterTestCase):
     """Test filtering of BGPRoutingInstance records."""
@@ -1458,3 +1494,120 @@ class FilterExtensionTestCase(TestCase):
         self.assertEqual(result.count(), queryset.count())
         result = _filter_interfaces_by_routing_instance(queryset, "test", "")
         self.assertEqual(result.count(), queryset.count())
+
+    def test_interface_filter_nested_modules(self):
+        """Filtering Interface and IPAddress by routing instance includes interfaces of nested modules."""
+        status_active = Status.objects.get(name__iexact="active")
+        module_type = ModuleType.objects.create(manufacturer=self.module.module_type.manufacturer, model="Optic")
+        InterfaceTemplate.objects.create(module_type=module_type, name="Optic0", type=InterfaceTypeChoices.TYPE_OTHER)
+        module_bay = ModuleBay.objects.create(parent_module=self.module, name="Subslot1", position="1")
+        nested_module = Module.objects.create(
+            module_type=module_type, parent_module_bay=module_bay, status=status_active
+        )
+        nested_interface = Interface.objects.get(module=nested_module)
+        nested_ip = IPAddress.objects.create(
+            address="10.1.1.3/32", status=status_active, namespace=self.ip_on_device_interface.parent.namespace
+        )
+        nested_interface.add_ip_addresses([nested_ip])
+
+        interfaces = _filter_interfaces_by_routing_instance(
+            Interface.objects.all(), "test", [self.bgp_routing_instance.pk]
+        )
+        self.assertEqual(set(interfaces), {self.interface_on_device, self.interface_on_module, nested_interface})
+        ips = _filter_ips_by_routing_instance(IPAddress.objects.all(), "test", [self.bgp_routing_instance.pk])
+        self.assertEqual(set(ips), {self.ip_on_device_interface, self.ip_on_module_interface, nested_ip})
+
+    def test_interface_filter_query(self):
+        """Test that the filtered queries compare the interface columns without joining the module tables."""
+        with self.assertNumQueries(3):  # Devices, modules in the device, modules in these modules.
+            interfaces = _filter_interfaces_by_routing_instance(
+                Interface.objects.all(), "test", [self.bgp_routing_instance.pk]
+            )
+        self.assertNotIn("dcim_module", str(interfaces.query))
+
+        ips = _filter_ips_by_routing_instance(IPAddress.objects.all(), "test", [self.bgp_routing_instance.pk])
+        self.assertNotIn("dcim_module", str(ips.query))
+        self.assertNotIn("DISTINCT", str(ips.query))
+
+
+class SearchTestCase(TestCase):
+    """Test the indexed `q` search of the BGP models."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=status_active)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="edge-01", location=location, status=status_active
+        )
+        namespace = Namespace.objects.first()
+        Prefix.objects.create(prefix="10.0.0.0/8", namespace=namespace, status=status_active)
+        cls.ip_1, cls.ip_2 = (
+            IPAddress.objects.create(address=address, status=status_active, namespace=namespace)
+            for address in ("10.0.0.1/32", "10.0.0.2/32")
+        )
+
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device, autonomous_system=asn, status=status_active, router_id=cls.ip_1
+        )
+        cls.peer_group = models.PeerGroup.objects.create(
+            name="UPSTREAMS", routing_instance=routing_instance, source_ip=cls.ip_1
+        )
+        peering = models.Peering.objects.create(status=status_active)
+        cls.endpoint = models.PeerEndpoint.objects.create(
+            peering=peering, routing_instance=routing_instance, source_ip=cls.ip_2, description="Transit"
+        )
+
+    def search(self, filterset, value):
+        return filterset({"q": value}, filterset.Meta.model.objects.all()).qs
+
+    def test_search_ip(self):
+        """Test that IP addresses match the IPAddress foreign keys."""
+        self.assertEqual(list(self.search(filters.PeerEndpointFilterSet, "10.0.0.2")), [self.endpoint])
+        self.assertEqual(list(self.search(filters.PeerEndpointFilterSet, "10.0.0.1")), [])
+        self.assertEqual(list(self.search(filters.PeerGroupFilterSet, "10.0.0.1/32")), [self.peer_group])
+        self.assertEqual(self.search(filters.BGPRoutingInstanceFilterSet, "10.0.0.1").count(), 1)
+
+    def test_search_id(self):
+        """Test that the primary key is matched exactly, without a text cast."""
+        self.assertEqual(
+            list(self.search(filters.PeerEndpointFilterSet, str(self.endpoint.pk).upper())), [self.endpoint]
+        )
+        for filterset in (
+            filters.AutonomousSystemFilterSet,
+            filters.AutonomousSystemRangeFilterSet,
+            filters.BGPRoutingInstanceFilterSet,
+            filters.PeerGroupTemplateFilterSet,
+            filters.PeerGroupFilterSet,
+            filters.PeerEndpointFilterSet,
+        ):
+            with self.subTest(filterset=filterset.__name__):
+                where = str(self.search(filterset, "transit").query).split(" WHERE ", 1)[1].split(" ORDER BY ", 1)[0]
+                model = filterset.Meta.model
+                self.assertNotIn(
+                    f"{connection.ops.quote_name(model._meta.db_table)}.{connection.ops.quote_name('id')}", where
+                )
+
+    def test_search_device_and_description(self):
+        """Test the text search of device names and descriptions."""
+        self.assertEqual(list(self.search(filters.PeerEndpointFilterSet, "EDGE")), [self.endpoint])
+        self.assertEqual(list(self.search(filters.PeerEndpointFilterSet, "ransi")), [self.endpoint])
+        self.assertEqual(list(self.search(filters.PeerGroupFilterSet, "stream")), [self.peer_group])
+
+    def test_trigram_index(self):
+        """Test that the planner uses the trigram indexes, where pg_trgm is available."""
+        if connection.vendor != "postgresql":
+            self.skipTest("Trigram indexes are only created on PostgreSQL")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'peergroup_name_trgm'")
+            if cursor.fetchone() is None:
+                self.skipTest("pg_trgm is not available in this database")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = models.PeerGroup.objects.filter(name__icontains="stream").explain()
+        self.assertIn("peergroup_name_trgm", plan)
@@ -0,0 +1,70 @@
+"""Unit test automation for the generate_bgp_test_data management command."""
+
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from nautobot_bgp_models import models
+from nautobot_bgp_models.audit import run_audit
+
+
+class GenerateScaleDataTestCase(TestCase):
+    """Test the scale mode of the generate_bgp_test_data command."""
+
+    def generate(self, *args):
+        """Run the command in scale mode with a small dataset."""
+        call_command(
+            "generate_bgp_test_data",
+            "--scale",
+            "--devices=5",
+            "--instances-per-device=2",
+            "--peer-groups=3",
+            "--endpoints=20",
+            "--address-families=2",
+            "--batch-size=7",
+            *args,
+            stdout=io.StringIO(),
+        )
+
+    def peerings(self):
+        """Return the generated Peerings as sorted (device, peer group) pairs, independently of primary keys."""
+        return sorted(
+            tuple(
+                sorted(
+                    models.PeerEndpoint.objects.filter(peering=peering).values_list(
+                        "routing_instance__device__name", "routing_instance__autonomous_system__asn", "peer_group__name"
+                    )
+                )
+            )
+            for peering in models.Peering.objects.all()
+        )
+
+    def test_scale(self):
+        """Test the number of generated objects and their consistency."""
+        self.generate("--seed=bgp")
+
+        self.assertEqual(models.BGPRoutingInstance.objects.count(), 10)
+        self.assertEqual(models.PeerGroupTemplate.objects.count(), 3)
+        self.assertEqual(models.PeerGroup.objects.count(), 30)
+        self.assertEqual(models.Peering.objects.count(), 10)
+        self.assertEqual(models.PeerEndpoint.objects.count(), 20)
+        self.assertEqual(models.AddressFamily.objects.count(), 20)
+        self.assertEqual(models.PeerGroupAddressFamily.objects.count(), 60)
+        self.assertEqual(models.PeerEndpointAddressFamily.objects.count(), 40)
+        for endpoint in models.PeerEndpoint.objects.all():
+            self.assertEqual(endpoint.peer.peer, endpoint)
+            self.assertIsNotNone(endpoint.local_ip)
+        self.assertEqual(run_audit(), [])
+
+    def test_seed(self):
+        """Test that the same seed generates the same dataset, reusing the existing devices."""
+        self.generate("--seed=bgp")
+        peerings = self.peerings()
+
+        with self.assertRaises(CommandError):
+            self.generate("--seed=bgp")
+
+        self.generate("--seed=bgp", "--flush")
+        self.assertEqual(self.peerings(), peerings)
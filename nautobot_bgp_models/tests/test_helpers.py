@@ -1,11 +1,27 @@
 """Unit test automation for Helper methods in nautobot_bgp_models."""
 
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
-from nautobot.extras.models import Status
+from django.utils import timezone
+from nautobot.dcim.models import Device, DeviceType, Location, LocationType, Manufacturer
+from nautobot.extras.context_managers import web_request_context
+from nautobot.extras.models import Role, Status
+from nautobot.ipam.models import VRF
 
 from nautobot_bgp_models import models
-from nautobot_bgp_models.helpers import add_available_asns
+from nautobot_bgp_models.helpers import (
+    CHANGE_FEED_MODELS,
+    add_available_asns,
+    get_changes_since,
+    get_peer_inconsistencies,
+    instantiate_peer_group_templates,
+    merge_asn_ranges,
+    parse_asn_search,
+    repair_peer_pointers,
+)
 
 
 class AddAvailableAsns(TestCase):
@@ -66,3 +82,256 @@ class AddAvailableAsns(TestCase):
         ]
 
         self.assertEqual(expected_availability, add_available_asns(instance=instance, asns=asns))
+
+
+class MergeAsnRanges(TestCase):
+    """Test the merge of ASN ranges."""
+
+    def test_merge(self):
+        self.assertEqual(
+            merge_asn_ranges([(300, 400), (100, 200), (150, 160), (201, 250), (190, 210), (402, 500)]),
+            [(100, 250), (300, 400), (402, 500)],
+        )
+
+    def test_records(self):
+        asn_ranges = [
+            models.AutonomousSystemRange(name="Range 90 120", asn_min=90, asn_max=120),
+            models.AutonomousSystemRange(name="Range 100 110", asn_min=100, asn_max=110),
+        ]
+        self.assertEqual(merge_asn_ranges(asn_ranges), [(90, 120)])
+        self.assertEqual(merge_asn_ranges([]), [])
+
+
+class ParseAsnSearch(TestCase):
+    """Test the parsing of ASN search strings."""
+
+    def test_asplain_prefix(self):
+        self.assertEqual(
+            parse_asn_search("42949"),
+            [
+                (42949, 42949),
+                (429490, 429499),
+                (4294900, 4294999),
+                (42949000, 42949999),
+                (429490000, 429499999),
+                (4294900000, 4294967295),
+            ],
+        )
+        self.assertEqual(parse_asn_search("4294967295"), [(4294967295, 4294967295)])
+        self.assertEqual(parse_asn_search("4294967296"), [])
+        self.assertEqual(parse_asn_search("42949", prefixes=False), [(42949, 42949)])
+
+    def test_asdot(self):
+        self.assertEqual(parse_asn_search("65000.10"), [(4259840010, 4259840010)])
+        self.assertEqual(parse_asn_search("AS0.65000"), [(65000, 65000)])
+        self.assertEqual(parse_asn_search("65536.1"), [])
+        self.assertEqual(parse_asn_search("0.0"), [])
+
+    def test_range(self):
+        self.assertEqual(parse_asn_search("64512-65534"), [(64512, 65534)])
+        self.assertEqual(parse_asn_search("as 1.0 - 1.10"), [(65536, 65546)])
+        self.assertEqual(parse_asn_search("65534-64512"), [])
+        self.assertEqual(parse_asn_search("64512-"), [])
+
+    def test_not_asn(self):
+        for value in ("", "private", "ASdf", "0", "065000", "-1", "65000.x", "1e5", "²", "1²", "AS²", "1-²", "1.²"):
+            with self.subTest(value=value):
+                self.assertEqual(parse_asn_search(value), [])
+
+
+class InstantiatePeerGroupTemplates(TestCase):
+    """Test the bulk instantiation of PeerGroupTemplates."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """One-time class data setup."""
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.BGPRoutingInstance))
+
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        for i in range(1, 5):
+            models.BGPRoutingInstance.objects.create(
+                device=Device.objects.create(
+                    device_type=devicetype, role=devicerole, name=f"Device {i}", location=location, status=status_active
+                ),
+                autonomous_system=asn,
+                status=status_active,
+            )
+        cls.routing_instances = models.BGPRoutingInstance.objects.all()
+        cls.pgt1 = models.PeerGroupTemplate.objects.create(name="PGT1")
+        cls.pgt2 = models.PeerGroupTemplate.objects.create(name="PGT2")
+
+    def test_creates_missing_peer_groups(self):
+        """Test that a PeerGroup is created for every template and routing instance."""
+        created = instantiate_peer_group_templates([self.pgt1, self.pgt2], self.routing_instances, batch_size=3)
+        self.assertEqual(len(created), 8)
+        for routing_instance in self.routing_instances:
+            self.assertEqual(
+                set(routing_instance.peer_groups.values_list("name", "peergroup_template", "vrf")),
+                {("PGT1", self.pgt1.pk, None), ("PGT2", self.pgt2.pk, None)},
+            )
+
+    def test_skips_existing_peer_groups(self):
+        """Test that existing (name, routing_instance, vrf=None) combinations are skipped."""
+        routing_instance = self.routing_instances.first()
+        models.PeerGroup.objects.create(name="PGT1", routing_instance=routing_instance)
+        # A PeerGroup of the same name in a VRF does not prevent the global one from being created.
+        vrf = VRF.objects.create(name="Ark B")
+        models.PeerGroup.objects.create(name="PGT2", routing_instance=routing_instance, vrf=vrf)
+
+        with self.assertNumQueries(4):  # savepoint, anti-join, bulk_create, release savepoint
+            created = instantiate_peer_group_templates([self.pgt1, self.pgt2], self.routing_instances)
+        self.assertEqual(len(created), 7)
+        self.assertEqual(routing_instance.peer_groups.filter(name="PGT1").count(), 1)
+        self.assertEqual(routing_instance.peer_groups.filter(name="PGT2").count(), 2)
+
+        self.assertEqual(instantiate_peer_group_templates([self.pgt1, self.pgt2], self.routing_instances), [])
+
+    def test_no_templates(self):
+        """Test that no query is issued without templates."""
+        with self.assertNumQueries(0):
+            self.assertEqual(instantiate_peer_group_templates([], self.routing_instances), [])
+
+
+class PeerPointerRepair(TestCase):
+    """Test the detection and repair of inconsistent PeerEndpoint peer pointers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """One-time class data setup."""
+        cls.peering_ok, cls.peering_missing, cls.peering_asymmetric, cls.peering_single, cls.peering_empty = (
+            models.Peering.objects.create() for _ in range(5)
+        )
+        cls.e1, cls.e2 = (models.PeerEndpoint.objects.create(peering=cls.peering_ok) for _ in range(2))
+        cls.e3, cls.e4 = (models.PeerEndpoint.objects.create(peering=cls.peering_missing) for _ in range(2))
+        cls.e5, cls.e6 = (models.PeerEndpoint.objects.create(peering=cls.peering_asymmetric) for _ in range(2))
+        cls.e7 = models.PeerEndpoint.objects.create(peering=cls.peering_single)
+
+        models.PeerEndpoint.objects.filter(pk=cls.e1.pk).update(peer=cls.e2)
+        models.PeerEndpoint.objects.filter(pk=cls.e2.pk).update(peer=cls.e1)
+        models.PeerEndpoint.objects.filter(pk=cls.e5.pk).update(peer=cls.e6)
+        models.PeerEndpoint.objects.filter(pk=cls.e6.pk).update(peer=cls.e1)
+        models.PeerEndpoint.objects.filter(pk=cls.e7.pk).update(peer=cls.e2)
+
+    def test_get_peer_inconsistencies(self):
+        """Test that every kind of inconsistency is reported."""
+        with self.assertNumQueries(3):
+            inconsistencies = get_peer_inconsistencies()
+        self.assertEqual(
+            inconsistencies["invalid_peerings"],
+            {self.peering_single.pk: 1, self.peering_empty.pk: 0},
+        )
+        self.assertEqual(inconsistencies["foreign_peers"], {self.e6.pk: self.e1.pk, self.e7.pk: self.e2.pk})
+        self.assertEqual(
+            inconsistencies["mismatched_peers"],
+            {self.e3.pk: self.e4.pk, self.e4.pk: self.e3.pk, self.e6.pk: self.e5.pk},
+        )
+
+    def test_repair_peer_pointers(self):
+        """Test that the peer pointers are fixed and a second run finds nothing to fix."""
+        self.assertEqual(repair_peer_pointers(), 4)
+
+        peers = dict(models.PeerEndpoint.objects.values_list("pk", "peer"))
+        self.assertEqual(peers[self.e1.pk], self.e2.pk)
+        self.assertEqual(peers[self.e2.pk], self.e1.pk)
+        self.assertEqual(peers[self.e3.pk], self.e4.pk)
+        self.assertEqual(peers[self.e4.pk], self.e3.pk)
+        self.assertEqual(peers[self.e5.pk], self.e6.pk)
+        self.assertEqual(peers[self.e6.pk], self.e5.pk)
+        self.assertIsNone(peers[self.e7.pk])
+
+        inconsistencies = get_peer_inconsistencies()
+        self.assertEqual(inconsistencies["foreign_peers"], {})
+        self.assertEqual(inconsistencies["mismatched_peers"], {})
+        self.assertEqual(repair_peer_pointers(inconsistencies), 0)
+
+
+class GetChangesSince(TestCase):
+    """Test the feed of the BGP records changed since a watermark."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """One-time class data setup."""
+        cls.user = get_user_model().objects.create_user(username="sync", is_superuser=True)
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.BGPRoutingInstance))
+
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        cls.ri1, cls.ri2 = (
+            models.BGPRoutingInstance.objects.create(
+                device=Device.objects.create(
+                    device_type=devicetype, role=devicerole, name=f"Device {i}", location=location, status=status_active
+                ),
+                autonomous_system=asn,
+                status=status_active,
+            )
+            for i in range(1, 3)
+        )
+        cls.template = models.PeerGroupTemplate.objects.create(name="Template")
+        cls.pg1 = models.PeerGroup.objects.create(name="PG1", routing_instance=cls.ri1, peergroup_template=cls.template)
+        cls.pg2 = models.PeerGroup.objects.create(name="PG2", routing_instance=cls.ri1)
+        cls.pg3 = models.PeerGroup.objects.create(name="PG3", routing_instance=cls.ri2)
+        peering = models.Peering.objects.create()
+        cls.e1 = models.PeerEndpoint.objects.create(peering=peering, routing_instance=cls.ri1, peer_group=cls.pg1)
+        cls.e2 = models.PeerEndpoint.objects.create(peering=peering, routing_instance=cls.ri1, peer_group=cls.pg2)
+        cls.e3 = models.PeerEndpoint.objects.create(peering=peering, routing_instance=cls.ri2)
+
+        cls.since = timezone.now()
+        for model in CHANGE_FEED_MODELS:
+            model.objects.update(last_updated=cls.since - timedelta(days=1))
+
+    def test_no_changes(self):
+        """Test that nothing is returned without changes, with a watermark to pass to the next call."""
+        changes = get_changes_since(self.since, self.user)
+        self.assertGreaterEqual(changes["watermark"], self.since)
+        for key in ("modified", "deleted"):
+            self.assertEqual(set(changes[key]), {model._meta.label_lower for model in CHANGE_FEED_MODELS})
+            self.assertFalse(any(changes[key].values()))
+        self.assertEqual(
+            changes["inherited"], {"nautobot_bgp_models.peergroup": [], "nautobot_bgp_models.peerendpoint": []}
+        )
+
+    def test_template_change(self):
+        """Test that the Peer Groups and Peer Endpoints inheriting from a modified template are returned."""
+        self.template.description = "Changed"
+        self.template.validated_save()
+        changes = get_changes_since(self.since, self.user)
+        self.assertEqual(changes["modified"]["nautobot_bgp_models.peergrouptemplate"], [self.template.pk])
+        self.assertEqual(changes["inherited"]["nautobot_bgp_models.peergroup"], [self.pg1.pk])
+        self.assertEqual(changes["inherited"]["nautobot_bgp_models.peerendpoint"], [self.e1.pk])
+
+    def test_routing_instance_and_peer_group_changes(self):
+        """Test that the descendants of modified routing instances and peer groups are returned, once."""
+        self.ri2.validated_save()
+        self.pg2.validated_save()
+        changes = get_changes_since(self.since, self.user)
+        self.assertEqual(changes["modified"]["nautobot_bgp_models.peergroup"], [self.pg2.pk])
+        self.assertEqual(changes["inherited"]["nautobot_bgp_models.peergroup"], [self.pg3.pk])
+        self.assertEqual(
+            changes["inherited"]["nautobot_bgp_models.peerendpoint"], sorted([self.e2.pk, self.e3.pk], key=str)
+        )
+
+    def test_deletion(self):
+        """Test that the deleted records are returned from the change log."""
+        pk = self.e3.pk
+        with web_request_context(self.user):
+            models.PeerEndpoint.objects.get(pk=pk).delete()
+        changes = get_changes_since(self.since, self.user)
+        self.assertEqual(changes["deleted"]["nautobot_bgp_models.peerendpoint"], [pk])
+        self.assertNotIn(pk, changes["inherited"]["nautobot_bgp_models.peerendpoint"])
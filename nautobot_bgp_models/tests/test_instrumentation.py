@@ -0,0 +1,161 @@
+"""Unit test automation for the per-request instrumentation of nautobot_bgp_models."""
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from nautobot.apps.testing import APITestCase
+from nautobot.dcim.models import Device, DeviceType, Location, LocationType, Manufacturer
+from nautobot.extras.models import Role, Status
+from nautobot.users.models import ObjectPermission
+from prometheus_client import REGISTRY, generate_latest
+
+from nautobot_bgp_models import models
+from nautobot_bgp_models.instrumentation import collect_request_metrics, instrumented
+
+
+def app_settings(**kwargs):
+    """PLUGINS_CONFIG with the app settings overridden by `kwargs`."""
+    return {
+        **settings.PLUGINS_CONFIG,
+        "nautobot_bgp_models": {**settings.PLUGINS_CONFIG["nautobot_bgp_models"], **kwargs},
+    }
+
+
+class InstrumentedTestCase(TestCase):
+    """Test the `instrumented` decorator."""
+
+    def test_outside_of_request(self):
+        """Test that the decorated function is called directly without metrics collection."""
+        self.assertEqual(instrumented("inheritance")(lambda value: value)(42), 42)
+
+    def test_nested_calls(self):
+        """Test that nested calls of the same operation are measured once."""
+
+        @instrumented("serializer")
+        def outer(depth):
+            return inner(depth) if depth else None
+
+        @instrumented("serializer")
+        def inner(depth):
+            return outer(depth - 1)
+
+        with collect_request_metrics() as metrics:
+            outer(3)
+            outer(0)
+        self.assertEqual(metrics.counts["serializer"], 2)
+        self.assertGreater(metrics.seconds["serializer"], 0)
+
+    def test_asn_allocation(self):
+        """Test the instrumentation of the ASN allocator and the SQL query count."""
+        asn_range = models.AutonomousSystemRange.objects.create(name="Range", asn_min=65000, asn_max=65010)
+        with collect_request_metrics() as metrics:
+            self.assertEqual(asn_range.get_next_available_asn(), 65000)
+        self.assertEqual(metrics.counts["asn_allocation"], 1)
+        self.assertEqual(metrics.queries, 1)
+        self.assertIn("db;dur=", metrics.server_timing())
+        self.assertIn("bgp-asn-allocation;dur=", metrics.server_timing())
+        self.assertNotIn("bgp-inheritance", metrics.server_timing())
+
+    def test_count_queries(self):
+        """Test that the SQL queries are only measured once `count_queries()` is called."""
+        asn_range = models.AutonomousSystemRange.objects.create(name="Range", asn_min=65000, asn_max=65010)
+        with collect_request_metrics(count_queries=False) as metrics:
+            asn_range.get_next_available_asn()
+            self.assertEqual(metrics.queries, 0)
+            self.assertNotIn("db;dur=", metrics.server_timing())
+            metrics.count_queries()
+            asn_range.get_next_available_asn()
+        self.assertEqual(metrics.counts["asn_allocation"], 2)
+        self.assertEqual(metrics.queries, 1)
+        self.assertIn("db;dur=", metrics.server_timing())
+
+
+class InstrumentationMiddlewareTestCase(APITestCase):
+    """Test the metrics and the Server-Timing header of BGP API requests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.BGPRoutingInstance))
+
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Device 1", location=location, status=status_active
+        )
+
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device, autonomous_system=asn, status=status_active, extra_attributes={"a": 1}
+        )
+        template = models.PeerGroupTemplate.objects.create(name="PGT", autonomous_system=asn, extra_attributes={"b": 2})
+        for i in range(3):
+            models.PeerGroup.objects.create(
+                name=f"PG {i}", routing_instance=routing_instance, peergroup_template=template
+            )
+
+        cls.url = reverse("plugins-api:nautobot_bgp_models-api:peergroup-list")
+        cls.view_name = "plugins-api:nautobot_bgp_models-api:peergroup-list"
+
+    def setUp(self):
+        super().setUp()
+        obj_perm = ObjectPermission(name="Test permission", actions=["view"])
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(models.PeerGroup))
+
+    def sample(self, name, operation=None):
+        """Return the value of a Prometheus sample for the peer group list view."""
+        labels = {"view": self.view_name}
+        if operation:
+            labels["operation"] = operation
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    @override_settings(PLUGINS_CONFIG=app_settings(instrumentation=True, server_timing_header=True))
+    def test_server_timing_header(self):
+        """Test that the BGP operations and SQL queries are reported in the Server-Timing header."""
+        response = self.client.get(f"{self.url}?include_inherited=true", **self.header)
+        self.assertHttpStatus(response, 200)
+        entries = {entry.split(";")[0]: entry for entry in response["Server-Timing"].split(", ")}
+        self.assertEqual(set(entries), {"bgp-inheritance", "bgp-extra-attributes", "bgp-serializer", "db"})
+        self.assertIn('desc="REST API serializations: 3"', entries["bgp-serializer"])
+        self.assertIn('desc="Extra attributes merges: 3"', entries["bgp-extra-attributes"])
+
+    @override_settings(PLUGINS_CONFIG=app_settings(instrumentation=True))
+    def test_prometheus_metrics(self):
+        """Test that the request totals are observed in the Prometheus histograms."""
+        requests = self.sample("nautobot_bgp_models_request_queries_count")
+        serializations = self.sample("nautobot_bgp_models_request_operations_sum", "serializer")
+        queries = self.sample("nautobot_bgp_models_request_queries_sum")
+
+        response = self.client.get(self.url, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(self.sample("nautobot_bgp_models_request_queries_count"), requests + 1)
+        self.assertEqual(self.sample("nautobot_bgp_models_request_operations_sum", "serializer"), serializations + 3)
+        self.assertGreater(self.sample("nautobot_bgp_models_request_queries_sum"), queries)
+
+        # The histograms are in the default registry exported by the Nautobot metrics endpoint.
+        self.assertIn(b"nautobot_bgp_models_request_operations_bucket", generate_latest(REGISTRY))
+
+    @override_settings(PLUGINS_CONFIG=app_settings(instrumentation=False, server_timing_header=True))
+    def test_instrumentation_disabled(self):
+        """Test that nothing is measured when the instrumentation is disabled."""
+        requests = self.sample("nautobot_bgp_models_request_queries_count")
+        response = self.client.get(self.url, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(self.sample("nautobot_bgp_models_request_queries_count"), requests)
+
+    def test_instrumentation_disabled_by_default(self):
+        """Test that the instrumentation is opt-in."""
+        requests = self.sample("nautobot_bgp_models_request_queries_count")
+        response = self.client.get(self.url, **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(self.sample("nautobot_bgp_models_request_queries_count"), requests)
@@ -0,0 +1,250 @@
+"""Unit test automation for Jobs in nautobot_bgp_models."""
+
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from nautobot.apps.testing import TransactionTestCase, run_job_for_testing
+from nautobot.dcim.models import Device, DeviceType, Location, LocationType, Manufacturer
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import Job, Role, Status
+
+from nautobot_bgp_models import export, models
+from nautobot_bgp_models.choices import AFISAFIChoices
+
+
+class InstantiatePeerGroupTemplatesJobTestCase(TransactionTestCase):
+    """Test the InstantiatePeerGroupTemplates Job."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Per-test data setup."""
+        super().setUp()
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.BGPRoutingInstance))
+
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        self.devicerole = Role.objects.create(name="Router", color="ff0000")
+        self.devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        other_role = Role.objects.create(name="Switch", color="00ff00")
+        other_role.content_types.add(ContentType.objects.get_for_model(Device))
+
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        for i, role in enumerate([self.devicerole, self.devicerole, other_role]):
+            models.BGPRoutingInstance.objects.create(
+                device=Device.objects.create(
+                    device_type=devicetype, role=role, name=f"Device {i}", location=location, status=status_active
+                ),
+                autonomous_system=asn,
+                status=status_active,
+            )
+        self.pgt = models.PeerGroupTemplate.objects.create(name="PGT1")
+        self.job = Job.objects.get(
+            job_class_name="InstantiatePeerGroupTemplates", module_name="nautobot_bgp_models.jobs"
+        )
+
+    def test_instantiate_on_device_role(self):
+        """Test that the templates are instantiated on the filtered routing instances only."""
+        job_result = run_job_for_testing(
+            self.job,
+            peergroup_templates=[self.pgt.pk],
+            device_roles=[self.devicerole.pk],
+        )
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(job_result.result, {"created": 2})
+        self.assertEqual(
+            set(models.PeerGroup.objects.values_list("routing_instance__device__name", flat=True)),
+            {"Device 0", "Device 1"},
+        )
+
+
+class RepairPeerEndpointPeersJobTestCase(TransactionTestCase):
+    """Test the RepairPeerEndpointPeers Job."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Per-test data setup."""
+        super().setUp()
+        peering = models.Peering.objects.create()
+        self.endpoint_a = models.PeerEndpoint.objects.create(peering=peering)
+        self.endpoint_z = models.PeerEndpoint.objects.create(peering=peering)
+        self.job = Job.objects.get(job_class_name="RepairPeerEndpointPeers", module_name="nautobot_bgp_models.jobs")
+
+    def test_dryrun(self):
+        """Test that nothing is changed in dry-run mode."""
+        job_result = run_job_for_testing(self.job, dryrun=True)
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(job_result.result["mismatched_peers"], 2)
+        self.assertEqual(job_result.result["updated"], 0)
+        self.assertFalse(models.PeerEndpoint.objects.filter(peer__isnull=False).exists())
+
+    def test_repair(self):
+        """Test that the endpoints are pointed at each other."""
+        job_result = run_job_for_testing(self.job, dryrun=False)
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(job_result.result["updated"], 2)
+        self.endpoint_a.refresh_from_db()
+        self.endpoint_z.refresh_from_db()
+        self.assertEqual(self.endpoint_a.peer, self.endpoint_z)
+        self.assertEqual(self.endpoint_z.peer, self.endpoint_a)
+
+
+class AuditBGPModelsJobTestCase(TransactionTestCase):
+    """Test the AuditBGPModels Job."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Per-test data setup."""
+        super().setUp()
+        peering = models.Peering.objects.create()
+        self.endpoint = models.PeerEndpoint.objects.create(peering=peering)
+        self.job = Job.objects.get(job_class_name="AuditBGPModels", module_name="nautobot_bgp_models.jobs")
+
+    def test_audit_csv(self):
+        """Test that the report is attached to the JobResult."""
+        job_result = run_job_for_testing(
+            self.job, checks=["endpoint_missing_asn", "peering_same_ip"], output_format="csv"
+        )
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(job_result.result, {"endpoint_missing_asn": 1, "peering_same_ip": 0})
+        report = job_result.files.get().file.read().decode("utf-8")
+        self.assertIn(f"endpoint_missing_asn,nautobot_bgp_models.peerendpoint,{self.endpoint.pk}", report)
+
+
+class ExportBGPSessionsJobTestCase(TransactionTestCase):
+    """Test the ExportBGPSessions Job."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Per-test data setup."""
+        super().setUp()
+        models.Peering.objects.create()
+        self.job = Job.objects.get(job_class_name="ExportBGPSessions", module_name="nautobot_bgp_models.jobs")
+
+    @mock.patch.object(export, "PYARROW_AVAILABLE", False)
+    def test_export_without_pyarrow(self):
+        """Test that the Job fails without the optional dependency."""
+        job_result = run_job_for_testing(self.job, output_format="parquet")
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_FAILURE)
+        self.assertFalse(job_result.files.exists())
+
+
+class ExportResolvedPeerEndpointsJobTestCase(TransactionTestCase):
+    """Test the ExportResolvedPeerEndpoints Job."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Per-test data setup."""
+        super().setUp()
+        status_active = Status.objects.get(name__iexact="active")
+        status_active.content_types.add(ContentType.objects.get_for_model(models.BGPRoutingInstance))
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Device 1", location=location, status=status_active
+        )
+        routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device,
+            autonomous_system=models.AutonomousSystem.objects.create(asn=65001, status=status_active),
+            status=status_active,
+        )
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        peergroup_template = models.PeerGroupTemplate.objects.create(
+            name="PGT1", autonomous_system=asn, description="From the template", enabled=True
+        )
+        peering = models.Peering.objects.create()
+        self.endpoint = models.PeerEndpoint.objects.create(
+            peering=peering,
+            routing_instance=routing_instance,
+            peer_group=models.PeerGroup.objects.create(
+                name="Group", routing_instance=routing_instance, peergroup_template=peergroup_template
+            ),
+        )
+        models.PeerGroupAddressFamily.objects.create(
+            peer_group=self.endpoint.peer_group, afi_safi=AFISAFIChoices.AFI_IPV4_UNICAST
+        )
+        models.PeerEndpointAddressFamily.objects.create(
+            peer_endpoint=self.endpoint, afi_safi=AFISAFIChoices.AFI_IPV6_UNICAST
+        )
+        self.job = Job.objects.get(job_class_name="ExportResolvedPeerEndpoints", module_name="nautobot_bgp_models.jobs")
+
+    def test_export_json(self):
+        """Test that the inherited values are resolved in the report attached to the JobResult."""
+        job_result = run_job_for_testing(self.job, output_format="json")
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(job_result.result, {"peer_endpoints": 1})
+        report = json.loads(job_result.files.get().file.read())
+        self.assertEqual(report["count"], 1)
+        self.assertEqual(
+            report["rows"][0],
+            {
+                "id": str(self.endpoint.pk),
+                "peering": str(self.endpoint.peering.pk),
+                "device": "Device 1",
+                "peer_group": "Group",
+                "autonomous_system": 65000,
+                "description": "From the template",
+                "enabled": True,
+                "local_ip": None,
+                "source_interface": None,
+                "role": None,
+                "address_families": ["ipv4_unicast", "ipv6_unicast"],
+            },
+        )
+
+
+class ASNRangeUtilizationJobTestCase(TransactionTestCase):
+    """Test the ASNRangeUtilization Job."""
+
+    databases = ("default", "job_logs")
+
+    def setUp(self):
+        """Per-test data setup."""
+        super().setUp()
+        status_active = Status.objects.get(name__iexact="active")
+        models.AutonomousSystemRange.objects.create(name="Full", asn_min=65000, asn_max=65001)
+        models.AutonomousSystemRange.objects.create(name="Empty", asn_min=65100, asn_max=65199)
+        for asn in (65000, 65001):
+            models.AutonomousSystem.objects.create(asn=asn, status=status_active)
+        self.job = Job.objects.get(job_class_name="ASNRangeUtilization", module_name="nautobot_bgp_models.jobs")
+
+    def test_utilization_csv(self):
+        """Test that the report is attached to the JobResult."""
+        job_result = run_job_for_testing(self.job, output_format="csv")
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertEqual(job_result.result, {"ranges": 2, "full": 1})
+        report = job_result.files.get().file.read().decode("utf-8")
+        self.assertIn("Full,65000,65001,2,2,1.0", report)
+        self.assertIn("Empty,65100,65199,100,0,0.0", report)
+
+    def test_reporting_database(self):
+        """Test that the report is read from the configured reporting database."""
+        plugins_config = {
+            **settings.PLUGINS_CONFIG,
+            "nautobot_bgp_models": {**settings.PLUGINS_CONFIG["nautobot_bgp_models"], "reporting_database": "job_logs"},
+        }
+        with (
+            override_settings(PLUGINS_CONFIG=plugins_config),
+            CaptureQueriesContext(connections["job_logs"]) as queries,
+        ):
+            job_result = run_job_for_testing(self.job, output_format="json")
+        self.assertEqual(job_result.result, {"ranges": 2, "full": 1})
+        self.assertTrue(any("nautobot_bgp_models_autonomoussystemrange" in query["sql"] for query in queries))
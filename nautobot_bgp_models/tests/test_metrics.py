@@ -0,0 +1,126 @@
+"""Unit test automation for the Prometheus inventory metrics of nautobot_bgp_models."""
+
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from nautobot.dcim.models import Device, DeviceType, Location, LocationType, Manufacturer
+from nautobot.extras.models import Role, Status
+
+from nautobot_bgp_models import metrics, models
+
+
+class InventoryMetricsTestCase(TestCase):
+    """Test the computation and the caching of the inventory gauges."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        status_planned = Status.objects.get(name__iexact="planned")
+        for model in (models.Peering, models.BGPRoutingInstance):
+            for status in (status_active, status_planned):
+                status.content_types.add(ContentType.objects.get_for_model(model))
+
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        roles = [Role.objects.create(name=name, color="ff0000") for name in ("Edge", "Core")]
+        for role in roles:
+            role.content_types.add(ContentType.objects.get_for_model(Device))
+        device_1, device_2 = (
+            Device.objects.create(
+                device_type=devicetype, role=role, name=f"Device {i}", location=location, status=status_active
+            )
+            for i, role in enumerate(roles)
+        )
+
+        asn_1 = models.AutonomousSystem.objects.create(asn=65001, status=status_active)
+        asn_2 = models.AutonomousSystem.objects.create(asn=65002, status=status_active)
+        models.AutonomousSystem.objects.create(asn=4200000000, status=status_active)
+        ri_1 = models.BGPRoutingInstance.objects.create(device=device_1, autonomous_system=asn_1, status=status_active)
+        ri_2 = models.BGPRoutingInstance.objects.create(device=device_2, autonomous_system=asn_1, status=status_planned)
+        peer_group = models.PeerGroup.objects.create(name="PG", routing_instance=ri_2, autonomous_system=asn_2)
+
+        for status in (status_active, status_active, status_planned):
+            peering = models.Peering.objects.create(status=status)
+            models.PeerEndpoint.objects.create(peering=peering, routing_instance=ri_1)
+            models.PeerEndpoint.objects.create(peering=peering, routing_instance=ri_2, peer_group=peer_group)
+
+        models.AutonomousSystemRange.objects.create(name="Private", asn_min=64512, asn_max=65534)
+        models.AutonomousSystemRange.objects.create(name="Empty", asn_min=100, asn_max=199)
+
+    def setUp(self):
+        cache.delete(metrics.CACHE_KEY)
+        cache.delete(metrics.REFRESH_LOCK_KEY)
+
+    def test_compute_inventory(self):
+        """Test the gauges, computed with a fixed number of queries."""
+        with self.assertNumQueries(5):
+            samples = metrics.compute_inventory()["samples"]
+
+        def values(name):
+            return {tuple(labels): value for labels, value in samples[name]}
+
+        self.assertEqual(values("nautobot_bgp_models_peerings"), {("Active",): 2, ("Planned",): 1})
+        self.assertEqual(values("nautobot_bgp_models_routing_instances"), {("Active",): 1, ("Planned",): 1})
+        self.assertEqual(
+            values("nautobot_bgp_models_peer_endpoints_per_device_role"),
+            {("Edge", "Active"): 2, ("Edge", "Planned"): 1, ("Core", "Active"): 2, ("Core", "Planned"): 1},
+        )
+        # The autonomous system of the second endpoints is inherited from their Peer Group.
+        self.assertEqual(
+            values("nautobot_bgp_models_peer_endpoints_per_autonomous_system"),
+            {("65001", "Active"): 2, ("65001", "Planned"): 1, ("65002", "Active"): 2, ("65002", "Planned"): 1},
+        )
+        self.assertEqual(values("nautobot_bgp_models_asn_range_size"), {("Private",): 1023, ("Empty",): 100})
+        self.assertEqual(values("nautobot_bgp_models_asn_range_used"), {("Private",): 2, ("Empty",): 0})
+        self.assertEqual(values("nautobot_bgp_models_asn_range_utilization"), {("Private",): 2 / 1023, ("Empty",): 0})
+
+    def test_metric_bgp_inventory(self):
+        """Test the metric families yielded to the Nautobot metrics collector."""
+        families = {family.name: family for family in metrics.metric_bgp_inventory()}
+        self.assertEqual(
+            set(families),
+            {
+                *metrics.INVENTORY_METRICS,
+                "nautobot_bgp_models_inventory_age_seconds",
+                "nautobot_bgp_models_inventory_duration_seconds",
+            },
+        )
+        self.assertEqual(
+            {(sample.labels["status"], sample.value) for sample in families["nautobot_bgp_models_peerings"].samples},
+            {("Active", 2), ("Planned", 1)},
+        )
+
+    @mock.patch("nautobot_bgp_models.metrics.threading.Thread")
+    def test_get_inventory_cache(self, thread):
+        """Test that cached gauges are served without queries and refreshed in the background once expired."""
+        inventory = metrics.get_inventory()
+        with self.assertNumQueries(0):
+            self.assertEqual(metrics.get_inventory(), inventory)
+        thread.assert_not_called()
+
+        inventory["timestamp"] -= 61
+        cache.set(metrics.CACHE_KEY, inventory, timeout=None)
+        with self.assertNumQueries(0):
+            self.assertEqual(metrics.get_inventory(), inventory)
+            # A single refresh runs at a time.
+            metrics.get_inventory()
+        thread.assert_called_once_with(target=metrics._refresh_inventory_in_background, daemon=True)  # pylint: disable=protected-access
+        thread.return_value.start.assert_called_once()
+
+    @override_settings(
+        PLUGINS_CONFIG={
+            **settings.PLUGINS_CONFIG,
+            "nautobot_bgp_models": {**settings.PLUGINS_CONFIG["nautobot_bgp_models"], "metrics_cache_ttl": 0},
+        }
+    )
+    def test_get_inventory_without_cache(self):
+        """Test that the gauges are computed on every call when the TTL is 0."""
+        metrics.get_inventory()
+        with self.assertNumQueries(5):
+            metrics.get_inventory()
@@ -2,6 +2,7 @@
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db.models.deletion import ProtectedError
 from django.test import TestCase
 from nautobot.circuits.models import Provider
@@ -79,6 +80,35 @@ class AutonomousSystemRangeTestCase(TestCase):
             context.exception.messages[0],
         )
 
+    def test_nested_ranges(self):
+        """Test that ranges may be nested in one another or adjacent."""
+        models.AutonomousSystemRange(name="Nested", asn_min=110, asn_max=125).validated_save()
+        models.AutonomousSystemRange(name="Parent", asn_min=1, asn_max=1000).validated_save()
+        models.AutonomousSystemRange(name="Adjacent", asn_min=1001, asn_max=2000).validated_save()
+        self.asn_range.asn_max = 130
+        self.asn_range.validated_save()
+
+    def test_partially_overlapping_ranges(self):
+        """Test that partially overlapping ranges are rejected."""
+        for asn_min, asn_max in ((90, 100), (125, 130), (101, 130)):
+            with self.assertRaises(ValidationError) as context:
+                models.AutonomousSystemRange(name="Overlapping", asn_min=asn_min, asn_max=asn_max).validated_save()
+            self.assertIn("The range partially overlaps Test Range (100-125)", context.exception.messages[0])
+
+    def test_containing(self):
+        """Test the lookup of the ranges containing an ASN or a range of ASNs."""
+        parent = models.AutonomousSystemRange.objects.create(name="Parent", asn_min=1, asn_max=1000)
+        models.AutonomousSystemRange.objects.create(name="Other", asn_min=1001, asn_max=2000)
+        self.assertEqual(list(self.autonomous_system_120.autonomous_system_ranges), [parent, self.asn_range])
+        self.assertEqual(list(self.autonomous_system_150.autonomous_system_ranges), [parent])
+        self.assertQuerysetEqual(
+            models.AutonomousSystemRange.objects.containing(100, 125), [parent, self.asn_range], ordered=False
+        )
+        self.assertQuerysetEqual(
+            models.AutonomousSystemRange.objects.overlapping(900, 1100), ["Parent", "Other"], lambda r: r.name, False
+        )
+        self.assertQuerysetEqual(models.AutonomousSystemRange.objects.crossing(120, 130), [self.asn_range])
+
 
 class BGPRoutingInstanceTestCase(TestCase):
     """Test the BGPRoutingInstance model."""
@@ -307,6 +337,33 @@ class PeerEndpointTestCase(TestCase):  # pylint: disable=too-many-instance-attri
         self.assertEqual(str(self.peerendpoint_1), "Device 1 1.1.1.1/32 (AS 12345)")
         self.assertEqual(str(self.peerendpoint_2), "1.1.1.2/32 (AS 23456)")
 
+    def test_resolve_inherited_fields(self):
+        """Test that the resolved inherited fields are reused rather than resolved again."""
+        peerendpoint = models.PeerEndpoint.objects.select_related("routing_instance__device").get(
+            pk=self.peerendpoint_1.pk
+        )
+        peerendpoint.source_ip = None
+        peerendpoint.peer_group.source_interface = self.interface_1
+        resolved_fields = peerendpoint.resolve_inherited_fields()
+        self.assertEqual(resolved_fields, peerendpoint.get_fields(include_inherited=True))
+        self.assertEqual(
+            resolved_fields["autonomous_system"],
+            {
+                "value": self.bgp_routing_instance_1.autonomous_system,
+                "inherited": True,
+                "source": self.bgp_routing_instance_1,
+            },
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(peerendpoint.fields_inherited, resolved_fields)
+            self.assertEqual(
+                peerendpoint.get_inherited_field("source_interface"), (self.interface_1, True, self.peergroup_1)
+            )
+            self.assertEqual(peerendpoint.local_ip, self.ipaddress_1)
+            self.assertEqual(str(peerendpoint), "Device 1 1.1.1.1/32 (AS 12345)")
+        # An explicit inheritance path is always resolved
+        self.assertEqual(peerendpoint.get_inherited_field("source_interface", inheritance_path=[]), (None, False, None))
+
     # def test_vrf_fixup_from_local_ip(self):
     #     """If VRF is None, but local_ip is assigned to a VRF, use that."""
     #     self.peerendpoint_1.vrf = None
@@ -532,6 +589,15 @@ class PeeringTestCase(TestCase):
             in ["2.2.2.2/32 (AS 23456) ↔︎ 1.1.1.1/32 (AS 12345)", "1.1.1.1/32 (AS 12345) ↔︎ 2.2.2.2/32 (AS 23456)"]
         )
 
+    def test_prefetched_endpoints(self):
+        """Test that the endpoints of a Peering are read from the prefetched endpoints, if any."""
+        endpoint_a, endpoint_z = self.peering.endpoints.order_by("pk")
+        peering = models.Peering.objects.prefetch_related("endpoints").get(pk=self.peering.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(peering.endpoint_a, endpoint_a)
+            self.assertEqual(peering.endpoint_z, endpoint_z)
+            self.assertIs(peering.endpoint_a, peering.endpoint_a)
+
     def test_update_peers(self):
         """Test update_peers to update peer on both endpoints."""
         endpoints = self.peering.endpoints.all()
@@ -640,3 +706,103 @@ class AddressFamilyTestCase(TestCase):
 #             "An AddressFamily cannot reference both a peer-group and a peer endpoint",
 #             context.exception.messages[0],
 #         )
+
+
+class IndexUsageTestCase(TestCase):
+    """Test that the planner uses the indexes of the BGP filter and inheritance lookups."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """One-time class data setup."""
+        status_active = Status.objects.get(name__iexact="active")
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location_status = Status.objects.get_for_model(Location).first()
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=location_status)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Device 1", location=location, status=status_active
+        )
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        cls.vrf = VRF.objects.create(name="Blue")
+        cls.routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device, autonomous_system=asn, status=status_active
+        )
+        for vrf in (None, cls.vrf):
+            models.AddressFamily.objects.create(
+                afi_safi=AFISAFIChoices.AFI_IPV4_UNICAST, routing_instance=cls.routing_instance, vrf=vrf
+            )
+        cls.peer_group = models.PeerGroup.objects.create(
+            name="Group A", routing_instance=cls.routing_instance, vrf=cls.vrf
+        )
+        cls.peering = models.Peering.objects.create(status=status_active)
+        models.PeerEndpoint.objects.create(
+            peering=cls.peering, routing_instance=cls.routing_instance, peer_group=cls.peer_group
+        )
+        models.AutonomousSystemRange.objects.create(name="Private", asn_min=64512, asn_max=65534)
+
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("The plans are checked on PostgreSQL only")
+        # Tables this small are scanned sequentially otherwise.
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name):  # pylint: disable=invalid-name
+        """Assert that the plan of `queryset`, unordered like in `get()`, scans the index `index_name`."""
+        plan = queryset.order_by().explain()
+        self.assertRegex(plan, rf"Index (Only )?Scan using {index_name}|Bitmap Index Scan on {index_name}", plan)
+
+    def test_address_family_indexes(self):
+        """Test the lookups of the parent address family, with and without VRF."""
+        address_families = self.routing_instance.address_families
+        self.assertUsesIndex(
+            address_families.filter(vrf=None, afi_safi=AFISAFIChoices.AFI_IPV4_UNICAST), "bgp_af_ri_afisafi_global_idx"
+        )
+        self.assertUsesIndex(
+            address_families.filter(vrf=self.vrf, afi_safi=AFISAFIChoices.AFI_IPV4_UNICAST), "bgp_af_ri_vrf_afisafi_idx"
+        )
+
+    def test_peer_group_index(self):
+        """Test the lookup of the peer groups of a routing instance and VRF."""
+        self.assertUsesIndex(
+            models.PeerGroup.objects.filter(routing_instance=self.routing_instance, vrf=self.vrf),
+            "bgp_peergroup_ri_vrf_idx",
+        )
+
+    def test_peer_group_address_family_index(self):
+        """Test the lookup of the address family of a peer group, by the foreign key or the unique together index."""
+        self.assertUsesIndex(
+            self.peer_group.address_families.filter(afi_safi=AFISAFIChoices.AFI_IPV4_UNICAST),
+            r"nautobot_bgp_models_peer\w*_peer_group_id\w+",
+        )
+
+    def test_peer_endpoint_indexes(self):
+        """Test the lookups of the peer endpoints by peering, peer group and routing instance."""
+        self.assertUsesIndex(self.peering.endpoints.all(), r"nautobot_bgp_models_peerendpoint_peering_id\w+")
+        self.assertUsesIndex(self.peer_group.endpoints.all(), r"nautobot_bgp_models_peerendpoint_peer_group_id\w+")
+        self.assertUsesIndex(
+            models.PeerEndpoint.objects.filter(routing_instance=self.routing_instance),
+            r"nautobot_bgp_models_peerendpoint_routing_instance_id\w+",
+        )
+
+    def test_autonomous_system_range_index(self):
+        """Test the lookup of the ranges containing an ASN."""
+        self.assertUsesIndex(
+            models.AutonomousSystemRange.objects.filter(asn_min__lte=65000, asn_max__gte=65000),
+            "bgp_asrange_min_max_idx",
+        )
+
+    def test_autonomous_system_range_interval_index(self):
+        """Test the interval lookups of the ranges."""
+        self.assertUsesIndex(models.AutonomousSystemRange.objects.containing(65000), "bgp_asrange_interval_idx")
+        self.assertUsesIndex(models.AutonomousSystemRange.objects.overlapping(64000, 64600), "bgp_asrange_interval_idx")
+
+    def test_last_updated_indexes(self):
+        """Test the lookups of the records changed since a watermark."""
+        since = self.peer_group.last_updated
+        self.assertUsesIndex(models.PeerGroupTemplate.objects.filter(last_updated__gte=since), "bgp_pgt_updated_idx")
+        self.assertUsesIndex(models.PeerGroup.objects.filter(last_updated__gte=since), "bgp_peergroup_updated_idx")
+        self.assertUsesIndex(models.PeerEndpoint.objects.filter(last_updated__gte=since), "bgp_pe_updated_idx")
@@ -5,7 +5,8 @@ from importlib import metadata
 from unittest import skipIf
 
 from django.contrib.contenttypes.models import ContentType
-from nautobot.apps.testing import ViewTestCases
+from django.urls import reverse
+from nautobot.apps.testing import TestCase, ViewTestCases
 from nautobot.circuits.models import Provider
 from nautobot.dcim.models import Device, DeviceType, Interface, Location, LocationType, Manufacturer
 from nautobot.extras.models import Role, Status
@@ -74,6 +75,19 @@ class AutonomousSystemTestCase(ViewTestCases.PrimaryObjectViewTestCase):
             "description": "New description",
         }
 
+        models.AutonomousSystemRange.objects.create(name="Private Use", asn_min=4200000000, asn_max=4294967294)
+
+    def test_containing_ranges(self):
+        """Test that the detail view lists the Autonomous System Ranges containing the ASN."""
+        self.add_permissions(
+            "nautobot_bgp_models.view_autonomoussystem", "nautobot_bgp_models.view_autonomoussystemrange"
+        )
+        instance = models.AutonomousSystem.objects.get(asn=4200000000)
+        response = self.client.get(instance.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, "Containing Autonomous System Ranges")
+        self.assertContains(response, "Private Use")
+
 
 class AutonomousSystemRangeTestCase(ViewTestCases.PrimaryObjectViewTestCase):
     """Test views related to the AutonomousSystemRange model."""
@@ -106,7 +120,7 @@ class AutonomousSystemRangeTestCase(ViewTestCases.PrimaryObjectViewTestCase):
         cls.csv_data = (
             "asn_min,asn_max,name,description",
             "1000,2000,range1,range1 descr",
-            "2000,4000,range2,range2 descr",
+            "2001,4000,range2,range2 descr",
             "5000,9999,range3,range3 descr",
         )
 
@@ -675,3 +689,229 @@ class PeerEndpointAddressFamilyTestCase(ViewTestCases.PrimaryObjectViewTestCase)
         ]
 
         cls.bulk_edit_data = {"import_policy": "foo", "export_policy": "bar"}
+
+
+class GlobalSearchTestCase(TestCase):
+    """Test the BGP models in the Nautobot global search."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=status_active)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Device 1", location=location, status=status_active
+        )
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active, description="Backbone")
+        routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device, autonomous_system=asn, status=status_active, description="Backbone instance"
+        )
+        models.PeerGroupTemplate.objects.create(name="Backbone template")
+        models.PeerGroup.objects.create(name="Backbone peers", routing_instance=routing_instance)
+        models.PeerEndpoint.objects.create(
+            peering=models.Peering.objects.create(status=status_active),
+            routing_instance=routing_instance,
+            description="Backbone endpoint",
+        )
+        models.AutonomousSystemRange.objects.create(name="Backbone range", asn_min=64512, asn_max=65534)
+
+    def test_global_search(self):
+        """Test that every searchable BGP model is part of the global search results."""
+        self.user.is_superuser = True
+        self.user.save()
+        response = self.client.get(reverse("search"), {"q": "backbone"})
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            {result["name"] for result in response.context["results"]},
+            {
+                "Autonomous systems",
+                "Autonomous System Ranges",
+                "BGP Routing Instances",
+                "BGP Peer Group Templates",
+                "BGP Peer Groups",
+                "BGP Peer Endpoints",
+            },
+        )
+
+
+class DeviceBGPPanelTestCase(TestCase):
+    """Test the lazily loaded BGP panel of the Device detail view."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=status_active)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        cls.device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Panel Device", location=location, status=status_active
+        )
+        peer_device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Panel Peer", location=location, status=status_active
+        )
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        cls.routing_instance = models.BGPRoutingInstance.objects.create(
+            device=cls.device, autonomous_system=asn, status=status_active
+        )
+        peer_instance = models.BGPRoutingInstance.objects.create(
+            device=peer_device, autonomous_system=asn, status=status_active
+        )
+        cls.address_family = models.AddressFamily.objects.create(
+            routing_instance=cls.routing_instance, afi_safi=AFISAFIChoices.AFI_IPV4_UNICAST
+        )
+        namespace = Namespace.objects.first()
+        Prefix.objects.create(prefix="10.0.0.0/8", namespace=namespace, status=status_active)
+        cls.peerings = []
+        for i in range(1, 8):
+            peering = models.Peering.objects.create(status=status_active)
+            for instance, host in ((cls.routing_instance, 2 * i), (peer_instance, 2 * i + 1)):
+                models.PeerEndpoint.objects.create(
+                    peering=peering,
+                    routing_instance=instance,
+                    source_ip=IPAddress.objects.create(
+                        address=f"10.0.0.{host}/32", namespace=namespace, status=status_active
+                    ),
+                )
+            cls.peerings.append(peering)
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("plugins:nautobot_bgp_models:device_bgp_panel", kwargs={"pk": self.device.pk})
+
+    def test_device_view(self):
+        """Test that the Device detail view only references the BGP panel."""
+        self.user.is_superuser = True
+        self.user.save()
+        response = self.client.get(self.device.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, f'data-lazy-panel-url="{self.url}"')
+        self.assertNotContains(response, str(self.peerings[0]))
+
+    def test_panel(self):
+        """Test the routing instances, address families and sessions of the panel."""
+        self.user.is_superuser = True
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, str(self.routing_instance))
+        self.assertContains(response, str(self.address_family))
+        for peering in self.peerings:
+            self.assertContains(response, str(peering))
+
+    def test_pagination(self):
+        """Test that the sessions are paginated, in a constant number of queries."""
+        self.user.is_superuser = True
+        self.user.config_data = {"pagination": {"per_page": 5}}
+        self.user.save()
+        self.client.get(self.url)
+        with self.assertNumQueries(9):
+            first_page = self.client.get(self.url)
+        with self.assertNumQueries(9):
+            second_page = self.client.get(self.url, {"page": 2})
+        self.assertContains(first_page, "Showing 1-5 of 7")
+        self.assertContains(first_page, 'href="?page=2" data-lazy-page')
+        self.assertContains(second_page, "Showing 6-7 of 7")
+        shown = [
+            [peering for peering in self.peerings if str(peering) in page.content.decode()]
+            for page in (first_page, second_page)
+        ]
+        self.assertEqual(len(shown[0]), 5)
+        self.assertEqual(len(shown[1]), 2)
+
+    def test_permissions(self):
+        """Test that the panel requires the view permission on the Device and only shows permitted records."""
+        self.assertHttpStatus(self.client.get(self.url), 403)
+        self.add_permissions("dcim.view_device")
+        response = self.client.get(self.url)
+        self.assertHttpStatus(response, 200)
+        self.assertNotContains(response, str(self.peerings[0]))
+
+
+class PeerGroupPeeringsPanelTestCase(TestCase):
+    """Test the lazily loaded Peerings panel of the PeerGroup detail view."""
+
+    @classmethod
+    def setUpTestData(cls):
+        status_active = Status.objects.get(name__iexact="active")
+        manufacturer = Manufacturer.objects.create(name="Cisco")
+        devicetype = DeviceType.objects.create(manufacturer=manufacturer, model="CSR 1000V")
+        location_type = LocationType.objects.create(name="site")
+        location = Location.objects.create(name="Site 1", location_type=location_type, status=status_active)
+        devicerole = Role.objects.create(name="Router", color="ff0000")
+        devicerole.content_types.add(ContentType.objects.get_for_model(Device))
+        device = Device.objects.create(
+            device_type=devicetype, role=devicerole, name="Route Server", location=location, status=status_active
+        )
+        asn = models.AutonomousSystem.objects.create(asn=65000, status=status_active)
+        routing_instance = models.BGPRoutingInstance.objects.create(
+            device=device, autonomous_system=asn, status=status_active
+        )
+        cls.peer_group = models.PeerGroup.objects.create(name="IXP Members", routing_instance=routing_instance)
+        namespace = Namespace.objects.first()
+        Prefix.objects.create(prefix="10.0.0.0/8", namespace=namespace, status=status_active)
+        cls.peerings = []
+        for i in range(1, 8):
+            peering = models.Peering.objects.create(status=status_active)
+            models.PeerEndpoint.objects.create(
+                peering=peering,
+                routing_instance=routing_instance,
+                peer_group=cls.peer_group,
+                source_ip=IPAddress.objects.create(
+                    address=f"10.0.0.{2 * i}/32", namespace=namespace, status=status_active
+                ),
+            )
+            models.PeerEndpoint.objects.create(
+                peering=peering,
+                autonomous_system=models.AutonomousSystem.objects.create(asn=64500 + i, status=status_active),
+                source_ip=IPAddress.objects.create(
+                    address=f"10.0.0.{2 * i + 1}/32", namespace=namespace, status=status_active
+                ),
+            )
+            cls.peerings.append(peering)
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("plugins:nautobot_bgp_models:peergroup_peerings_panel", kwargs={"pk": self.peer_group.pk})
+
+    def test_peer_group_view(self):
+        """Test that the PeerGroup detail view only references the Peerings panel."""
+        self.user.is_superuser = True
+        self.user.save()
+        response = self.client.get(self.peer_group.get_absolute_url())
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, f'data-lazy-panel-url="{self.url}"')
+        self.assertNotContains(response, str(self.peerings[0]))
+
+    def test_pagination(self):
+        """Test that the Peerings are paginated, in a constant number of queries."""
+        self.user.is_superuser = True
+        self.user.config_data = {"pagination": {"per_page": 5}}
+        self.user.save()
+        self.client.get(self.url)
+        with self.assertNumQueries(7):
+            first_page = self.client.get(self.url)
+        with self.assertNumQueries(7):
+            second_page = self.client.get(self.url, {"page": 2})
+        self.assertContains(first_page, "Showing 1-5 of 7")
+        self.assertContains(second_page, "Showing 6-7 of 7")
+        shown = [
+            [peering for peering in self.peerings if str(peering) in page.content.decode()]
+            for page in (first_page, second_page)
+        ]
+        self.assertEqual(len(shown[0]), 5)
+        self.assertEqual(len(shown[1]), 2)
+
+    def test_permissions(self):
+        """Test that the panel requires the view permission on the Peer Group and only shows permitted records."""
+        self.assertHttpStatus(self.client.get(self.url), 403)
+        self.add_permissions("nautobot_bgp_models.view_peergroup")
+        response = self.client.get(self.url)
+        self.assertHttpStatus(response, 200)
+        self.assertNotContains(response, str(self.peerings[0]))
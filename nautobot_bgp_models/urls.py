@@ -21,6 +21,12 @@ router.register("peer-group-address-families", views.PeerGroupAddressFamilyUIVie
 router.register("peer-endpoint-address-families", views.PeerEndpointAddressFamilyUIViewSet)
 
 urlpatterns = [
+    path("devices/<uuid:pk>/bgp/", views.DeviceBGPPanelView.as_view(), name="device_bgp_panel"),
+    path(
+        "peer-groups/<uuid:pk>/peerings/",
+        views.PeerGroupPeeringsPanelView.as_view(),
+        name="peergroup_peerings_panel",
+    ),
     path("peerings/add/", views.PeeringAddView.as_view(), name="peering_add"),
     path("docs/", RedirectView.as_view(url=static("nautobot_bgp_models/docs/index.html")), name="docs"),
 ]
@@ -2,8 +2,12 @@
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.shortcuts import redirect, render
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils.html import format_html
+from django.views.generic import View
+from django_tables2 import RequestConfig
 from nautobot.apps.choices import ButtonActionIconChoices
 from nautobot.apps.ui import (
     Button,
@@ -13,10 +17,13 @@ from nautobot.apps.ui import (
     ObjectFieldsPanel,
     ObjectsTablePanel,
     ObjectTextPanel,
+    Panel,
     SectionChoices,
     Tab,
 )
+from nautobot.apps.utils import get_permission_for_model
 from nautobot.apps.views import (
+    EnhancedPaginator,
     NautobotUIViewSet,
     ObjectBulkDestroyViewMixin,
     ObjectChangeLogViewMixin,
@@ -26,8 +33,11 @@ from nautobot.apps.views import (
     ObjectEditViewMixin,
     ObjectListViewMixin,
     ObjectNotesViewMixin,
+    ObjectPermissionRequiredMixin,
     get_obj_from_context,
+    get_paginate_count,
 )
+from nautobot.dcim.models import Device
 
 from . import filters, forms, helpers, models, tables
 from .api import serializers
@@ -50,10 +60,8 @@ class BGPObjectsFieldPanel(ObjectFieldsPanel):
         if key not in obj.property_inheritance:
             return super().render_value(key, value, context)
 
-        value, inheritance_indicator, inheritance_source = obj.get_inherited_field(
-            field_name=key,
-            inheritance_path=obj.property_inheritance[key],
-        )
+        # Read from the fields resolved once by InheritedFieldsViewMixin, if any
+        value, inheritance_indicator, inheritance_source = obj.get_inherited_field(field_name=key)
 
         rendered_value = super().render_value(key, value, context)
 
@@ -78,6 +86,39 @@ class BGPObjectsFieldPanel(ObjectFieldsPanel):
         return super().render_key(key, value, context)
 
 
+class LazyPanel(Panel):
+    """Panel whose content is rendered by another view, loaded once the page is rendered.
+
+    The page links of the loaded content, marked with a `data-lazy-page` attribute, are loaded in place as well.
+    """
+
+    def __init__(self, *, url_name, **kwargs):
+        """Instantiate a LazyPanel loading its content from the `url_name` view, given the `pk` of the object."""
+        self.url_name = url_name
+        super().__init__(body_content_template_path="nautobot_bgp_models/inc/lazy_panel.html", **kwargs)
+
+    def get_extra_context(self, context):
+        """Add the URL of the content of the panel."""
+        obj = get_obj_from_context(context)
+        return {"lazy_panel_url": reverse(self.url_name, kwargs={"pk": obj.pk})}
+
+
+class InheritedFieldsViewMixin:
+    """Resolve the inherited fields of the object of a detail view once, for all of its panels to reuse.
+
+    Without it, each inherited field displayed by a BGPObjectsFieldPanel is resolved on its own.
+    """
+
+    def get_extra_context(self, request, instance=None):
+        """Resolve the inherited fields of the displayed object."""
+        context = super().get_extra_context(request, instance)
+
+        if instance is not None and self.action == "retrieve":
+            instance.resolve_inherited_fields()
+
+        return context
+
+
 extra_attributes_tab = Tab(
     weight=100,
     tab_id="extra_attributes",
@@ -120,6 +161,18 @@ class AutonomousSystemUIViewSet(NautobotUIViewSet):
                 section=SectionChoices.LEFT_HALF,
                 fields=["asn", "asn_asdot", "description", "status", "provider"],
             ),
+            ObjectsTablePanel(
+                section=SectionChoices.RIGHT_HALF,
+                weight=100,
+                table_class=tables.AutonomousSystemRangeTable,
+                table_attribute="autonomous_system_ranges",
+                related_field_name="autonomous_system",
+                table_title="Containing Autonomous System Ranges",
+                exclude_columns=["actions"],
+                add_button_route=None,
+                enable_related_link=False,
+                paginate=False,
+            ),
         ],
     )
 
@@ -217,7 +270,7 @@ class BGPRoutingInstanceUIViewSet(NautobotUIViewSet):
     )
 
 
-class PeerGroupUIViewSet(NautobotUIViewSet):
+class PeerGroupUIViewSet(InheritedFieldsViewMixin, NautobotUIViewSet):
     """UIViewset for PeerGroup model."""
 
     bulk_update_form_class = forms.PeerGroupBulkEditForm
@@ -271,16 +324,11 @@ class PeerGroupUIViewSet(NautobotUIViewSet):
                     {"peer_group_address_family"}
                 ),
             ),
-            ObjectsTablePanel(
+            LazyPanel(
                 weight=100,
                 section=SectionChoices.RIGHT_HALF,
-                table_class=tables.PeerEndpointTable,
-                table_filter="peer_group",
-                table_title="Peerings In This Group",
-                show_table_config_button=False,
-                paginate=False,
-                include_columns=["peering"],
-                exclude_columns=set(tables.PeerEndpointTable.Meta.default_columns).difference({"peering"}),
+                label="Peerings In This Group",
+                url_name="plugins:nautobot_bgp_models:peergroup_peerings_panel",
             ),
         ],
     )
@@ -325,7 +373,7 @@ class PeerGroupTemplateUIViewSet(NautobotUIViewSet):
     )
 
 
-class PeerEndpointUIViewSet(NautobotUIViewSet):
+class PeerEndpointUIViewSet(InheritedFieldsViewMixin, NautobotUIViewSet):
     """UIViewset for PeerEndpoint model."""
 
     bulk_update_form_class = forms.PeerEndpointBulkEditForm
@@ -491,6 +539,18 @@ class PeeringUIViewSet(  # pylint: disable=abstract-method
         ],
     )
 
+    def get_queryset(self):
+        """Prefetch the endpoints of the displayed Peering, for all of its panels to share."""
+        queryset = super().get_queryset()
+
+        if self.action == "retrieve":
+            endpoints = models.PeerEndpoint.objects.select_related(
+                "routing_instance__device", "autonomous_system", "peer_group__peergroup_template", "source_ip"
+            )
+            queryset = queryset.prefetch_related(Prefetch("endpoints", queryset=endpoints))
+
+        return queryset
+
     def get_extra_context(self, request, instance=None):
         """Get extra context data."""
         context = super().get_extra_context(request, instance)
@@ -499,6 +559,12 @@ class PeeringUIViewSet(  # pylint: disable=abstract-method
             context["endpoint_a"] = instance.endpoint_a
             context["endpoint_z"] = instance.endpoint_z
 
+        if instance and self.action == "retrieve":
+            # Resolve the inherited fields of both endpoints once, for all of their panels to reuse
+            for endpoint in (context["endpoint_a"], context["endpoint_z"]):
+                if endpoint is not None:
+                    endpoint.resolve_inherited_fields()
+
         return context
 
 
@@ -562,6 +628,112 @@ class PeeringAddView(ObjectEditView):
         )
 
 
+def get_panel_table(request, table_class, data, columns, paginate=False):
+    """Instantiate a table of a panel, showing the given `columns` only, paginated with the `page` query parameter."""
+    table = table_class(data, orderable=False)
+    for column in table.columns:
+        if column.name not in columns:
+            table.columns.hide(column.name)
+    for column in columns:
+        table.columns.show(column)
+    if paginate:
+        paginate = {"paginator_class": EnhancedPaginator, "per_page": get_paginate_count(request)}
+        RequestConfig(request, paginate).configure(table)
+    return table
+
+
+class DeviceBGPPanelView(ObjectPermissionRequiredMixin, View):
+    """Content of the BGP panel of a Device: its routing instances and address families, and a page of its sessions.
+
+    The routing instances are loaded along with their autonomous systems and address families, and each page of
+    sessions along with the summaries of both endpoints of their Peerings, in a fixed number of queries.
+    """
+
+    queryset = Device.objects.all()
+    template_name = "nautobot_bgp_models/inc/device_bgp_panel.html"
+
+    def get_required_permission(self):
+        """View permission on the Device."""
+        return get_permission_for_model(Device, "view")
+
+    def get(self, request, pk):
+        """Render the content of the panel."""
+        device = get_object_or_404(self.queryset, pk=pk)
+        address_families = models.AddressFamily.objects.restrict(request.user, "view").select_related("vrf")
+        routing_instances = list(
+            models.BGPRoutingInstance.objects.restrict(request.user, "view")
+            .filter(device=device)
+            .select_related("device", "autonomous_system")
+            .prefetch_related(Prefetch("address_families", queryset=address_families))
+        )
+        sessions = (
+            models.PeerEndpoint.objects.restrict(request.user, "view")
+            .filter(routing_instance__device=device)
+            .select_related("peering")
+            .prefetch_related(helpers.prefetch_displayed_endpoints("peering__endpoints"))
+            .order_by("pk")
+        )
+        return render(
+            request,
+            self.template_name,
+            {
+                "object": device,
+                "routing_instance_table": get_panel_table(
+                    request,
+                    tables.BGPRoutingInstanceTable,
+                    routing_instances,
+                    ["routing_instance", "autonomous_system"],
+                ),
+                "address_family_table": get_panel_table(
+                    request,
+                    tables.AddressFamilyTable,
+                    [
+                        address_family
+                        for instance in routing_instances
+                        for address_family in instance.address_families.all()
+                    ],
+                    ["routing_instance", "address_family"],
+                ),
+                "session_table": get_panel_table(
+                    request, tables.PeerEndpointTable, sessions, ["peering"], paginate=True
+                ),
+            },
+        )
+
+
+class PeerGroupPeeringsPanelView(ObjectPermissionRequiredMixin, View):
+    """Content of the Peerings panel of a Peer Group: a page of its Peer Endpoints, displayed as their Peerings.
+
+    Each page is loaded along with the summaries of both endpoints of its Peerings in a fixed number of queries.
+    """
+
+    queryset = models.PeerGroup.objects.all()
+    template_name = "nautobot_bgp_models/inc/panel_table.html"
+
+    def get_required_permission(self):
+        """View permission on the Peer Group."""
+        return get_permission_for_model(models.PeerGroup, "view")
+
+    def get(self, request, pk):
+        """Render the content of the panel."""
+        peer_group = get_object_or_404(self.queryset, pk=pk)
+        peer_endpoints = (
+            models.PeerEndpoint.objects.restrict(request.user, "view")
+            .filter(peer_group=peer_group)
+            .select_related("peering")
+            .prefetch_related(helpers.prefetch_displayed_endpoints("peering__endpoints"))
+            .order_by("pk")
+        )
+        return render(
+            request,
+            self.template_name,
+            {
+                "object": peer_group,
+                "table": get_panel_table(request, tables.PeerEndpointTable, peer_endpoints, ["peering"], paginate=True),
+            },
+        )
+
+
 class AddressFamilyUIViewSet(NautobotUIViewSet):
     """UIViewset for AddressFamily model."""
 
@@ -596,7 +768,7 @@ class AddressFamilyUIViewSet(NautobotUIViewSet):
     )
 
 
-class PeerGroupAddressFamilyUIViewSet(NautobotUIViewSet):
+class PeerGroupAddressFamilyUIViewSet(InheritedFieldsViewMixin, NautobotUIViewSet):
     """UIViewset for PeerGroupAddressFamily model."""
 
     bulk_update_form_class = forms.PeerGroupAddressFamilyBulkEditForm
@@ -648,7 +820,7 @@ class PeerGroupAddressFamilyUIViewSet(NautobotUIViewSet):
     )
 
 
-class PeerEndpointAddressFamilyUIViewSet(NautobotUIViewSet):
+class PeerEndpointAddressFamilyUIViewSet(InheritedFieldsViewMixin, NautobotUIViewSet):
     """UIViewset for PeerEndpointAddressFamily model."""
 
     bulk_update_form_class = forms.PeerEndpointAddressFamilyBulkEditForm
@@ -1057,8 +1057,14 @@ def validate_app_config(context):
     )
 
 
-@task
-def generate_test_data(context, flush=False, database=None):
+@task(
+    help={
+        "flush": "Flush any existing data from the database before generating new data.",
+        "database": "The database to generate the test data in.",
+        "scale": "Generate a large dataset of BGP objects with the default scale mode options.",
+    }
+)
+def generate_test_data(context, flush=False, database=None, scale=False):
     """Generate test data in Nautobot for this app."""
     # Run the core generate_test_data command first to populate the core models
     command = "nautobot-server generate_test_data --seed 'nautobot'"
@@ -1068,9 +1074,26 @@ def generate_test_data(context, flush=False, database=None):
         command += " --flush"
     run_command(context, command)
 
-    command = "nautobot-server generate_bgp_test_data"
+    command = "nautobot-server generate_bgp_test_data --seed 'nautobot'"
+    if scale:
+        command += " --scale"
     if database:
         command += f" --database {database}"
     if flush:
         command += " --flush"
     run_command(context, command)
+
+
+@task(
+    help={
+        "scenario": "Scenario to run, can be provided multiple times. Defaults to all scenarios.",
+        "time_factor": "Multiplier applied to the wall time budgets (default: 1.0).",
+    },
+    iterable=["scenario"],
+)
+def benchmark(context, scenario=None, time_factor=1.0):
+    """Run the BGP Models benchmarks against the data in the database and enforce their budgets."""
+    command = f"nautobot-server benchmark_bgp_models --time-factor {time_factor}"
+    for name in scenario or []:
+        command += f" --scenario {name}"
+    run_command(context, command)